@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Resource benchmark for the Chrome launch profiles (web_agent.browser,
+BrowserProfile in src/utils/scraping.py).
+
+For each profile, BrowserManager launches Chrome + selenium-wire, logs in and
+opens Win Go 1Min, then the session idles on the live game page for
+--seconds while RSS and CPU time of chromedriver and every Chrome child
+process are sampled (psutil). Reports startup time, process count, mean and
+peak RSS, CPU utilisation (CPU seconds per wall second) and the number of
+captured API responses, so "full" and "lean" can be compared per session.
+
+By default it runs against the local mock game API with live periods
+enabled; --production uses the configured login_url with PHONE_NUMBER /
+PASSWORD from the environment (the production page is where image, font and
+media blocking makes the largest difference).
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+
+import numpy as np
+import yaml
+
+# --- Path Setup ---
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.rl_agent.browser_manager import BrowserManager
+from benchmarks.mock_api_server import MockGameApiServer, apply_mock_api
+from src.rl_agent.records import synthetic_history
+from src.utils.scraping import BROWSER_PROFILES, psutil
+
+
+def bench_profile(config, profile, seconds, interval):
+    """Satu sesi browser dengan `profile`; mengembalikan ringkasan sumber daya."""
+    config = dict(config, web_agent=dict(config['web_agent']))
+    config['web_agent']['browser'] = dict(config['web_agent'].get('browser') or {}, profile=profile)
+    manager = BrowserManager(config)
+    started = time.perf_counter()
+    try:
+        manager.initialize_driver()
+        if not manager.login() or not manager.navigate_to_game():
+            raise RuntimeError(f"Login/navigasi gagal dengan profil '{profile}'.")
+        startup_seconds = time.perf_counter() - started
+
+        samples = []
+        window_started = time.perf_counter()
+        first = manager.resource_usage()
+        while time.perf_counter() - window_started < seconds:
+            time.sleep(interval)
+            samples.append(manager.resource_usage())
+        wall = time.perf_counter() - window_started
+        api_endpoint = config['web_agent'].get('api_endpoint', '')
+        captured = sum(1 for request in manager.driver.requests if api_endpoint in request.url)
+    finally:
+        manager.close()
+
+    rss = np.array([sample['rss_mb'] for sample in samples])
+    return {
+        'profile': profile,
+        'startup_s': startup_seconds,
+        'processes': max(sample['processes'] for sample in samples),
+        'rss_mb_mean': float(rss.mean()),
+        'rss_mb_peak': float(rss.max()),
+        'cpu_pct': 100.0 * (samples[-1]['cpu_seconds'] - first['cpu_seconds']) / wall,
+        'api_responses': captured,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark RSS/CPU per profil browser.")
+    parser.add_argument('--profiles', nargs='+', choices=sorted(BROWSER_PROFILES), default=sorted(BROWSER_PROFILES))
+    parser.add_argument('--seconds', type=float, default=60.0, help="Lama sesi idle di halaman game per profil.")
+    parser.add_argument('--interval', type=float, default=1.0, help="Interval sampling RSS/CPU (detik).")
+    parser.add_argument('--periods-per-second', type=float, default=1.0, help="Laju periode baru server tiruan.")
+    parser.add_argument('--production', action='store_true', help="Pakai situs produksi dari config.yaml.")
+    parser.add_argument('--verbose', action='store_true')
+    args = parser.parse_args()
+
+    if psutil is None:
+        parser.error("psutil diperlukan untuk mengukur RSS/CPU browser (pip install psutil).")
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING,
+                        format='%(asctime)s - %(levelname)s - %(message)s')
+    with open(os.path.join(project_root, 'config.yaml'), 'r', encoding='utf-8') as f:
+        config = yaml.safe_load(f)
+
+    server = None
+    if not args.production:
+        server = MockGameApiServer(synthetic_history(20000), periods_per_second=args.periods_per_second,
+                                   poll_ms=1000, seed=0).start()
+        config = apply_mock_api(config, server)
+        # Halaman login tiruan menerima kredensial apa pun.
+        os.environ.setdefault('PHONE_NUMBER', 'mock')
+        os.environ.setdefault('PASSWORD', 'mock')
+    try:
+        print(f"Target: {'produksi ' + config['web_agent']['login_url'] if args.production else 'server tiruan ' + server.url}, "
+              f"{args.seconds:g}s per profil")
+        print(f"{'profil':<8} {'startup':>8} {'proses':>7} {'RSS mean':>10} {'RSS peak':>10} {'CPU':>7} {'respons API':>12}")
+        for profile in args.profiles:
+            result = bench_profile(config, profile, args.seconds, args.interval)
+            print(f"{result['profile']:<8} {result['startup_s']:>7.1f}s {result['processes']:>7d} "
+                  f"{result['rss_mb_mean']:>7.0f} MB {result['rss_mb_peak']:>7.0f} MB {result['cpu_pct']:>6.1f}% "
+                  f"{result['api_responses']:>12d}")
+    finally:
+        if server:
+            server.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for API response decoding (src/utils/scraping.py).
+
+Compares the legacy decode path (new ZstdDecompressor per call, stream reader,
+UTF-8 str, json.loads, DataFrame from dicts) with the path the scraper uses
+now: decode_api_body (reused decompressor context, bytes parsed by orjson when
+available) followed by records_to_batch, as in the live and bulk loops.
+records_to_batch builds the period/number/colour/premium arrays straight
+from the parsed JSON list (records.records_to_columns). The previous
+row-wise builder (one generator per column over the dicts plus a pandas
+factorize for colours) is kept here as a reference. The decode step alone
+(records list, no table) is reported separately.
+
+Payloads are read from --payload-dir (raw zstd response bodies, *.zst) when
+given, otherwise synthesized from the history file as GetNoaverageEmerdList
+pages of --page-size records.
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+
+import pandas as pd
+import zstandard
+
+# --- Path Setup ---
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+import numpy as np
+
+from src.rl_agent.data_store import records_to_batch
+from src.rl_agent.records import MISSING_PREMIUM, ResultBatch, encode_colors
+from src.utils import scraping
+
+
+def synthesize_payloads(csv_path, page_size, max_pages):
+    """Membangun body respons zstd yang meniru API dari riwayat CSV (terbaru lebih dulu)."""
+    df = pd.read_csv(csv_path).iloc[::-1]
+    cctx = zstandard.ZstdCompressor(level=3)
+    payloads = []
+    for start in range(0, min(len(df), page_size * max_pages), page_size):
+        page = df.iloc[start:start + page_size]
+        records = [
+            {'issueNumber': str(row.Period), 'number': str(row.Number), 'colour': row.Color, 'premium': str(row.Premium)}
+            for row in page.itertuples(index=False)
+        ]
+        body = json.dumps({'data': {'list': records, 'pageNo': start // page_size + 1, 'totalPage': 1000},
+                           'code': 0, 'msg': 'Succeed', 'msgCode': 0}).encode('utf-8')
+        payloads.append(cctx.compress(body))
+    return payloads
+
+
+def load_recorded_payloads(payload_dir):
+    payloads = []
+    for path in sorted(glob.glob(os.path.join(payload_dir, '*.zst'))):
+        with open(path, 'rb') as f:
+            payloads.append(f.read())
+    return payloads
+
+
+def legacy_records(body):
+    """Jalur dekode lama, direproduksi apa adanya sebagai pembanding."""
+    dctx = zstandard.ZstdDecompressor()
+    with dctx.stream_reader(body) as reader:
+        body = reader.read()
+    data = json.loads(body.decode('utf-8'))
+    return data.get('data', {}).get('list', [])
+
+
+def legacy_decode(body):
+    return pd.DataFrame(legacy_records(body))
+
+
+def rowwise_batch(records):
+    """ResultBatch.from_records sebelum dekode kolumnar, sebagai pembanding."""
+    n = len(records)
+    if not n:
+        return ResultBatch.empty()
+    return ResultBatch(
+        np.fromiter((int(r['issueNumber']) for r in records), dtype=np.int64, count=n),
+        np.fromiter((int(r['number']) for r in records), dtype=np.uint8, count=n),
+        encode_colors([r.get('colour') for r in records]),
+        np.fromiter((int(r['premium']) if r.get('premium') not in (None, '') else MISSING_PREMIUM
+                     for r in records), dtype=np.int32, count=n),
+    ).filter_game()
+
+
+def current_decode(body, headers):
+    """Jalur produksi: respons -> rekaman -> ResultBatch game 10001."""
+    return records_to_batch(scraping.decode_api_body(body, headers))
+
+
+def time_per_call(fn, payloads, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for body in payloads:
+            fn(body)
+        best = min(best, time.perf_counter() - start)
+    return best / len(payloads)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark process_api_response decoding.')
+    parser.add_argument('--payload-dir', help='Directory of recorded zstd response bodies (*.zst)')
+    parser.add_argument('--data', default=os.path.join(project_root, 'data', 'databaru_from_api.csv'))
+    parser.add_argument('--page-size', type=int, default=10)
+    parser.add_argument('--pages', type=int, default=500)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    if args.payload_dir:
+        payloads = load_recorded_payloads(args.payload_dir)
+        source = args.payload_dir
+    else:
+        payloads = synthesize_payloads(args.data, args.page_size, args.pages)
+        source = f"synthesized from {args.data}"
+    if not payloads:
+        print("[X] No payloads to benchmark.")
+        return 1
+
+    headers = {'Content-Encoding': 'zstd'}
+    for body in payloads[:20]:
+        expected = rowwise_batch(scraping.decode_api_body(body, headers))
+        actual = current_decode(body, headers)
+        assert all(np.array_equal(getattr(expected, name), getattr(actual, name)) for name in ResultBatch.__slots__)
+
+    legacy = time_per_call(legacy_decode, payloads, args.repeat)
+    current = time_per_call(lambda body: current_decode(body, headers), payloads, args.repeat)
+    rowwise = time_per_call(lambda body: rowwise_batch(scraping.decode_api_body(body, headers)), payloads, args.repeat)
+    legacy_only = time_per_call(legacy_records, payloads, args.repeat)
+    current_only = time_per_call(lambda body: scraping.decode_api_body(body, headers), payloads, args.repeat)
+
+    print(f"Payloads: {len(payloads)} ({source})")
+    print(f"JSON parser: {'orjson' if scraping.orjson is not None else 'json (stdlib)'}")
+    print(f"decode only   legacy : {legacy_only * 1e6:9.1f} us/response")
+    print(f"decode only   current: {current_only * 1e6:9.1f} us/response ({legacy_only / current_only:.1f}x)")
+    print(f"decode+table  legacy : {legacy * 1e6:9.1f} us/response (DataFrame)")
+    print(f"decode+table  rowwise: {rowwise * 1e6:9.1f} us/response (per-record builder, {legacy / rowwise:.1f}x)")
+    print(f"decode+table  current: {current * 1e6:9.1f} us/response (records_to_batch, {legacy / current:.1f}x)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
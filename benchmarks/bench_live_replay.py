@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+End-to-end benchmark for the live pipeline (DataScraper.start_live_scraping)
+without Chrome or network access.
+
+A ReplayWebDriver (benchmarks/replay_driver.py) replays the history file as
+zstd GetNoaverageEmerdList responses at --rate periods per second. The store
+in a temporary directory is seeded with all rows before the replay window,
+so the run exercises decode -> ingest -> storage append -> feature update (with
+--model lgbm, the only predictor that reads the FeatureStore) ->
+prediction hand-off exactly as in production. Reports throughput, result
+available -> stored latency (from the moment the replay makes a period
+available), missed periods, and prediction worker statistics.
+--capture-mode selects push (response interceptor + queue) or the legacy
+poll loop (del driver.requests + wait_for_request). --schedule period runs the
+period-boundary scheduler with period_seconds = 1/--rate (use a low rate,
+e.g. --rate 0.5 --periods 20) and reports the estimated clock offset, capture
+lag after each period close, and process CPU use. --page-poll-delay delays the
+page's own history responses to model the game page's polling cadence, and
+--fetch inpage adds the in-page fetch executor (scraping.latest_fetch) that
+requests page 1 right after each period boundary. Its responses also reach the
+response interceptor, as under selenium-wire, and are ignored there (feed
+'ignored'), so each result is ingested once. --fetch both replays the same
+window with passive capture and then with in-page fetch, and prints their
+latencies side by side. The replayed countdown timer has whole-second
+resolution like the game page, so the poll delay must exceed about one second
+plus the fetch delay for in-page fetch to win:
+
+    python benchmarks/bench_live_replay.py --schedule period --rate 0.25 --periods 10 \
+        --page-poll-delay 2.5 --fetch both
+"""
+import argparse
+import contextlib
+import copy
+import io
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+import yaml
+
+# --- Path Setup ---
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.rl_agent.data_scraper import DataScraper
+from src.rl_agent.predictors import PREDICTOR_CHOICES, create_predictor
+from benchmarks.replay_driver import ReplayWebDriver
+from src.rl_agent.data_store import HistoryStore
+from src.utils.storage import open_storage
+
+
+def run_replay(args, base_config, history, fetch):
+    """Satu replay dengan mode `fetch`; mencetak detail dan mengembalikan ringkasan latensi."""
+    start = max(len(history) - args.periods, 0)
+    workdir = tempfile.mkdtemp(prefix='live_replay_')
+    try:
+        store_path = os.path.join(workdir, f'history.{args.format}')
+        open_storage(store_path).write(history[:start].to_frame())
+
+        config = copy.deepcopy(base_config)
+        config['project_setup']['data_path'] = store_path
+        config['project_setup'].pop('data_format', None)
+        config['feature_store'] = dict(config.get('feature_store', {}), path=os.path.join(workdir, 'features'))
+        scraping = config['web_agent'].setdefault('scraping', {})
+        scraping['max_live_iterations'] = 10 ** 9
+        scraping['live_timeout_minutes'] = 10 ** 6
+        scraping['capture_mode'] = args.capture_mode
+        scraping['live_schedule'] = args.schedule
+        if args.schedule == 'period':
+            period_seconds = 1.0 / args.rate
+            scraping['period_seconds'] = period_seconds
+            scraping['schedule_lead_seconds'] = min(2.0, 0.2 * period_seconds)
+            scraping['capture_deadline_seconds'] = min(10.0, 0.5 * period_seconds)
+            scraping['inpage_min_interval_seconds'] = min(5.0, 0.2 * period_seconds)
+        scraping['latest_fetch'] = fetch
+
+        driver = ReplayWebDriver(history, start=start, periods_per_second=args.rate,
+                                 api_url='https://' + config['web_agent']['api_endpoint'],
+                                 poll_delay=args.page_poll_delay)
+        predictor = create_predictor(args.model, config) if args.model else None
+        scraper = DataScraper(driver, config, predictor)
+        # Simpan referensi feed: DataScraper melepasnya saat loop live berhenti.
+        feed = scraper._ensure_response_feed()
+
+        latencies = []
+        scraper.on_ingest = lambda request, new_rows: latencies.append(
+            time.monotonic() - driver.available_at[int(new_rows['Period'].max())])
+
+        stop_event = threading.Event()
+        output = io.StringIO()
+
+        def run():
+            # Prediksi dicetak ke stdout oleh DataScraper; tampung agar keluaran benchmark tetap bersih.
+            with contextlib.redirect_stdout(output):
+                scraper.start_live_scraping(stop_event)
+
+        live_thread = threading.Thread(target=run, name='live-scraping')
+        live_thread.start()
+        time.sleep(0.5)  # Beri waktu load store + feature backfill sebelum replay dimulai
+        started = time.perf_counter()
+        cpu_started = time.process_time()
+        driver.start()
+        driver.finished.wait()
+        replay_seconds = time.perf_counter() - started
+        cpu_seconds = time.process_time() - cpu_started
+        time.sleep(0.2)
+        stop_event.set()
+        live_thread.join()
+        driver.quit()
+
+        store = HistoryStore(open_storage(store_path))
+        store.load()
+        replayed = history.period[start:]
+        missed = int(np.count_nonzero(~store.index.contains(replayed)))
+        latency_ms = np.array(latencies) * 1000
+
+        print(f"Replay {len(replayed)} periode pada {args.rate:g}/s ke store {args.format}, "
+              f"capture {args.capture_mode}, fetch {fetch} ({replay_seconds:.2f}s)")
+        print(f"Request diproses: {len(latencies)}, periode tersimpan: {len(replayed) - missed}, terlewat: {missed}")
+        print(f"Throughput: {(len(replayed) - missed) / replay_seconds:.1f} periode/s, "
+              f"CPU proses {cpu_seconds:.2f}s ({100 * cpu_seconds / replay_seconds:.1f}%)")
+        if len(latency_ms):
+            print(f"Latensi hasil tersedia->tersimpan: mean {latency_ms.mean():.3f} ms, p50 {np.percentile(latency_ms, 50):.3f} ms, "
+                  f"p95 {np.percentile(latency_ms, 95):.3f} ms, max {latency_ms.max():.3f} ms")
+        if feed:
+            print(f"Feed interceptor: {feed.stats()}")
+        if scraper.page_fetcher:
+            print(f"Fetch dalam halaman: {scraper.page_fetcher.stats()}")
+        if scraper.scheduler:
+            print(f"Penjadwal periode: {scraper.scheduler.stats()}")
+        if scraper.prediction_worker:
+            print(f"Worker prediksi ({predictor.name}): {scraper.prediction_worker.stats()}")
+        summary = {'stored': len(replayed) - missed, 'missed': missed, 'ingests': len(latencies),
+                   'ignored': feed.ignored if feed else 0}
+        if len(latency_ms):
+            summary.update(mean=latency_ms.mean(), p50=np.percentile(latency_ms, 50),
+                           p95=np.percentile(latency_ms, 95), max=latency_ms.max())
+        return summary
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark pipeline live dengan replay offline.")
+    parser.add_argument('--data', default=os.path.join(project_root, 'data', 'databaru_from_api.csv'))
+    parser.add_argument('--format', choices=['csv', 'arrow', 'parquet'], default='csv',
+                        help="Format store sementara yang diisi dan ditambahkan selama replay.")
+    parser.add_argument('--periods', type=int, default=2000, help="Jumlah periode terakhir yang di-replay.")
+    parser.add_argument('--rate', type=float, default=1000.0, help="Periode per detik.")
+    parser.add_argument('--model', choices=PREDICTOR_CHOICES, default=None, help="Predictor opsional.")
+    parser.add_argument('--capture-mode', choices=['interceptor', 'poll'], default='interceptor',
+                        help="Mode capture respons API (scraping.capture_mode).")
+    parser.add_argument('--schedule', choices=['continuous', 'period'], default='continuous',
+                        help="Jadwal live (scraping.live_schedule); 'period' memakai period_seconds = 1/rate.")
+    parser.add_argument('--fetch', choices=['passive', 'inpage', 'both'], default='passive',
+                        help="Pengambilan hasil terbaru (scraping.latest_fetch); 'inpage' butuh --schedule period. "
+                             "'both' menjalankan keduanya dan membandingkan latensinya.")
+    parser.add_argument('--page-poll-delay', type=float, default=0.0,
+                        help="Detik antara periode tersedia dan respons polling halaman game.")
+    parser.add_argument('--verbose', action='store_true', help="Tampilkan log INFO pipeline.")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING,
+                        format='%(asctime)s - %(levelname)s - %(message)s')
+    with open(os.path.join(project_root, 'config.yaml'), 'r', encoding='utf-8') as f:
+        base_config = yaml.safe_load(f)
+
+    history = open_storage(args.data).read_batch().sorted_unique()
+    modes = ['passive', 'inpage'] if args.fetch == 'both' else [args.fetch]
+    summaries = {}
+    for fetch in modes:
+        summaries[fetch] = run_replay(args, base_config, history, fetch)
+        print()
+
+    if len(modes) > 1:
+        print(f"{'fetch':<9}{'stored':>8}{'missed':>8}{'ingests':>9}{'ignored':>9}"
+              f"{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}")
+        for fetch, summary in summaries.items():
+            latency = ''.join(f"{summary[key]:>10.1f}" if key in summary else f"{'-':>10}"
+                              for key in ('mean', 'p50', 'p95', 'max'))
+            print(f"{fetch:<9}{summary['stored']:>8}{summary['missed']:>8}{summary['ingests']:>9}"
+                  f"{summary['ignored']:>9}{latency}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Offline network-path benchmark against the local mock game API
+(benchmarks/mock_api_server.py).
+
+Default mode drives HistoryApiClient (the bulk_mode "api" path) directly at
+the mock server: pooled HTTP/1.1, concurrency and rate limit from
+web_agent.scraping, zstd decode via process_api_response. With --chrome, a
+real Chrome + selenium-wire driver (setup_driver with loopback capture) runs
+DataScraper.execute_bulk_scrape end to end into a temporary store, so proxy
+overhead and UI/API pagination can be measured without the production site.
+Latency, jitter and error injection are set per run.
+
+--proxy routes the client through a selenium-wire proxy backend (no browser)
+with either the configured capture policy (web_agent.capture) or the legacy
+capture-everything disk storage, and reports proxy overhead, the number of
+stored requests and process RSS growth.
+"""
+import argparse
+import json
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import yaml
+from seleniumwire import backend as seleniumwire_backend
+from seleniumwire.inspect import InspectRequestsMixin
+
+# --- Path Setup ---
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.rl_agent.api_client import HistoryApiClient
+from benchmarks.mock_api_server import MockGameApiServer, apply_mock_api
+from src.rl_agent.records import synthetic_history
+from benchmarks.replay_driver import FakeRequest
+from src.utils.scraping import CapturePolicy
+from src.utils.storage import open_storage
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+
+class _ProxyDriver(InspectRequestsMixin):
+    """Backend proxy selenium-wire tanpa browser, dengan antarmuka `requests`/`scopes` seperti driver."""
+    def __init__(self, policy):
+        self.backend = seleniumwire_backend.create(options=policy.seleniumwire_options())
+        policy.apply(self)
+
+    @property
+    def proxies(self):
+        addr, port = self.backend.address()[:2]
+        return {'http': f'http://{addr}:{port}', 'https': f'http://{addr}:{port}'}
+
+    def close(self):
+        self.backend.shutdown()
+
+
+def _rss_mb():
+    return psutil.Process().memory_info().rss / 2 ** 20 if psutil else float('nan')
+
+
+def bench_client(server, scraping_config, pages, proxy=None):
+    """Mengambil `pages` halaman lewat HistoryApiClient dan mengukur throughput."""
+    body = json.dumps({'pageSize': server.page_size, 'pageNo': 1, 'typeId': 1, 'language': 0}).encode('utf-8')
+    client = HistoryApiClient(FakeRequest(server.api_url, body, None), scraping_config)
+    if proxy:
+        client.session.proxies = proxy.proxies
+    try:
+        started = time.perf_counter()
+        results = client.fetch_pages(range(1, pages + 1))
+        elapsed = time.perf_counter() - started
+    finally:
+        client.close()
+    failed = sum(1 for records in results.values() if not records)
+    records = sum(len(records) for records in results.values())
+    print(f"HistoryApiClient: {pages} halaman dalam {elapsed:.2f}s ({pages / elapsed:.1f} halaman/s, "
+          f"{records / elapsed:.0f} rekaman/s), gagal: {failed}, "
+          f"konkurensi {client.concurrency}, rate limit {scraping_config.get('api_requests_per_second')}/s")
+
+
+def bench_chrome(config, server, workdir):
+    """Bulk scrape penuh dengan Chrome + selenium-wire sungguhan ke store sementara."""
+    from src.rl_agent.data_scraper import DataScraper
+    from src.utils.scraping import CapturePolicy, setup_driver
+
+    config = apply_mock_api(config, server)
+    config['project_setup']['data_path'] = os.path.join(workdir, 'history.csv')
+    config['project_setup'].pop('data_format', None)
+    config['web_agent']['scraping']['checkpoint_path'] = os.path.join(workdir, 'checkpoint.json')
+    # Halaman login tiruan menerima kredensial apa pun.
+    os.environ.setdefault('PHONE_NUMBER', 'mock')
+    os.environ.setdefault('PASSWORD', 'mock')
+
+    driver = setup_driver(is_realtime=False, capture_loopback=True,
+                          capture_policy=CapturePolicy.from_config(config['web_agent']))
+    try:
+        started = time.perf_counter()
+        frame = DataScraper(driver, config).execute_bulk_scrape()
+        elapsed = time.perf_counter() - started
+    finally:
+        driver.quit()
+    rows = 0 if frame is None else len(frame)
+    print(f"Chrome bulk scrape ({config['web_agent']['scraping'].get('bulk_mode', 'ui')}): "
+          f"{rows} baris dalam {elapsed:.2f}s ({rows / elapsed:.0f} baris/s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark jalur jaringan terhadap server API tiruan.")
+    parser.add_argument('--data', help="Riwayat yang disajikan (default: riwayat sintetis).")
+    parser.add_argument('--synthetic-rows', type=int, default=50000)
+    parser.add_argument('--pages', type=int, default=200, help="Jumlah halaman yang diambil (mode klien).")
+    parser.add_argument('--latency-ms', type=float, default=40.0)
+    parser.add_argument('--jitter-ms', type=float, default=20.0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--concurrency', type=int, help="Override scraping.api_concurrency.")
+    parser.add_argument('--rps', type=float, help="Override scraping.api_requests_per_second (0 = tanpa batas).")
+    parser.add_argument('--max-pages', type=int, default=50, help="scraping.max_pages untuk mode --chrome.")
+    parser.add_argument('--chrome', action='store_true', help="Jalankan bulk scrape dengan Chrome sungguhan.")
+    parser.add_argument('--proxy', choices=['none', 'policy', 'legacy'], default='none',
+                        help="Lewatkan klien melalui proxy selenium-wire dengan capture policy atau capture penuh lama.")
+    parser.add_argument('--verbose', action='store_true')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING,
+                        format='%(asctime)s - %(levelname)s - %(message)s')
+    with open(os.path.join(project_root, 'config.yaml'), 'r', encoding='utf-8') as f:
+        config = yaml.safe_load(f)
+    scraping = config['web_agent'].setdefault('scraping', {})
+    if args.concurrency is not None:
+        scraping['api_concurrency'] = args.concurrency
+    if args.rps is not None:
+        scraping['api_requests_per_second'] = args.rps
+    scraping['max_pages'] = args.max_pages
+
+    batch = open_storage(args.data).read_batch().sorted_unique() if args.data else synthetic_history(args.synthetic_rows)
+    server = MockGameApiServer(batch, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                               error_rate=args.error_rate, seed=0).start()
+    workdir = tempfile.mkdtemp(prefix='mock_api_')
+    try:
+        print(f"Server tiruan {server.url}: {len(batch)} baris, latensi {args.latency_ms:g}±{args.jitter_ms:g} ms, "
+              f"error {args.error_rate:.1%}")
+        if args.chrome:
+            bench_chrome(config, server, workdir)
+        else:
+            proxy = None
+            if args.proxy != 'none':
+                if args.proxy == 'policy':
+                    policy = CapturePolicy.from_config(apply_mock_api(config, server)['web_agent'])
+                else:
+                    policy = CapturePolicy(request_storage='disk', max_requests=None, max_body_bytes=None)
+                proxy = _ProxyDriver(policy)
+            rss_before = _rss_mb()
+            try:
+                bench_client(server, scraping, args.pages, proxy)
+                if proxy:
+                    print(f"Proxy '{args.proxy}': {len(proxy.requests)} request tersimpan, "
+                          f"body dibuang {policy.dropped_bodies}, RSS {rss_before:.0f} -> {_rss_mb():.0f} MB")
+            finally:
+                if proxy:
+                    proxy.close()
+        print(f"Statistik server: {server.stats()}")
+    finally:
+        server.stop()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Benchmark for prompt encodings used by GeminiPredictor.predict_next_period
+(src/rl_agent/prompt_encoding.py).
+
+Reports size (characters and estimated tokens) and build time for each
+encoding over a --window-row history window, then replays --steps periods
+one row at a time to compare a from-scratch rebuild with the incremental
+CompactPromptEncoder update.
+
+Time to first token (TTFT) per encoding is reported with --ttft:
+  mock    (default) no network; TTFT = --mock-base-ms + prompt tokens /
+          --mock-prefill-tps. The constants are assumptions, so only the
+          difference between encodings is meaningful.
+  gemini  streams each prompt to --model with google-genai
+          (generate_content_stream, system instruction sent inline) and times
+          the first chunk; median of --ttft-repeat calls. Needs GEMINI_API_KEY.
+  off     skip TTFT.
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+# --- Path Setup ---
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.rl_agent.prompt_encoding import CompactPromptEncoder, encoding_report, encode_table, estimate_tokens
+from src.utils.storage import open_storage
+
+
+def prediction_prompt(text):
+    """Bentuk prompt yang sama dengan GeminiPredictor.build_prediction_prompt."""
+    return f"Berdasarkan data terbaru ini:\n{text}\n\nLakukan analisis dan berikan prediksi untuk periode berikutnya."
+
+
+def mock_ttft(base_ms, prefill_tps):
+    def measure(text):
+        return base_ms / 1000 + estimate_tokens(prediction_prompt(text)) / prefill_tps
+    return measure
+
+
+def gemini_ttft(model_name, repeat):
+    from src.rl_agent import gemini_predictor
+
+    if gemini_predictor.PACKAGE_TYPE != "google-genai":
+        raise SystemExit("--ttft gemini membutuhkan paket google-genai.")
+    predictor = gemini_predictor.GeminiPredictor(
+        model_name, {'gemini': {'context_cache': False, 'response_cache': {'enabled': False}}})
+    config = gemini_predictor.types.GenerateContentConfig(system_instruction=predictor.system_instruction)
+
+    def measure(text):
+        samples = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            stream = predictor.client.models.generate_content_stream(
+                model=model_name, contents=prediction_prompt(text), config=config)
+            next(iter(stream))
+            samples.append(time.perf_counter() - started)
+        return statistics.median(samples)
+    return measure
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark encoding prompt prediksi.")
+    parser.add_argument('--data', default=os.path.join(project_root, 'data', 'databaru_from_api.csv'))
+    parser.add_argument('--window', type=int, default=200)
+    parser.add_argument('--steps', type=int, default=500)
+    parser.add_argument('--ttft', choices=['mock', 'gemini', 'off'], default='mock',
+                        help="Sumber waktu hingga token pertama (lihat docstring modul).")
+    parser.add_argument('--mock-base-ms', type=float, default=300.0, help="TTFT tiruan: latensi tetap (ms).")
+    parser.add_argument('--mock-prefill-tps', type=float, default=5000.0, help="TTFT tiruan: token prompt per detik.")
+    parser.add_argument('--model', default='gemini-2.5-flash', help="Model untuk --ttft gemini.")
+    parser.add_argument('--ttft-repeat', type=int, default=3, help="Jumlah panggilan per encoding untuk --ttft gemini.")
+    args = parser.parse_args()
+
+    if args.ttft == 'mock':
+        ttft = mock_ttft(args.mock_base_ms, args.mock_prefill_tps)
+    elif args.ttft == 'gemini':
+        ttft = gemini_ttft(args.model, args.ttft_repeat)
+    else:
+        ttft = None
+
+    history = open_storage(args.data).read_batch()
+    window = history[-args.window:]
+
+    print(f"Jendela {len(window)} baris dari {args.data}")
+    print(f"{'encoding':<10}{'chars':>10}{'tokens~':>10}{'build ms':>12}"
+          + (f"{'ttft ms':>12}  ({args.ttft})" if ttft else ""))
+    report = encoding_report(window, ttft=ttft)
+    for name, row in report.items():
+        print(f"{name:<10}{row['chars']:>10}{row['tokens_est']:>10}{row['build_ms']:>12.3f}"
+              + (f"{row['ttft_ms']:>12.1f}" if ttft else ""))
+    baseline = report['table']['tokens_est']
+    print(f"Pengurangan token compact vs table: {1 - report['compact']['tokens_est'] / baseline:.1%}")
+
+    steps = min(args.steps, len(history) - args.window)
+    start = len(history) - args.window - steps
+    windows = [history[start + i:start + i + args.window] for i in range(1, steps + 1)]
+
+    t0 = time.perf_counter()
+    for w in windows:
+        encode_table(w)
+    table_ms = (time.perf_counter() - t0) * 1000 / steps
+
+    t0 = time.perf_counter()
+    for w in windows:
+        CompactPromptEncoder(window=args.window).sync(w).render()
+    rebuild_ms = (time.perf_counter() - t0) * 1000 / steps
+
+    encoder = CompactPromptEncoder(window=args.window).sync(history[start:start + args.window])
+    t0 = time.perf_counter()
+    for w in windows:
+        encoder.sync(w).render()
+    incremental_ms = (time.perf_counter() - t0) * 1000 / steps
+
+    print(f"\nPer periode ({steps} langkah): table {table_ms:.3f} ms, compact rebuild {rebuild_ms:.3f} ms, "
+          f"compact inkremental {incremental_ms:.3f} ms (rebuild: {encoder.rebuilds})")
+
+
+if __name__ == '__main__':
+    main()
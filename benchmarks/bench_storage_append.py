@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Benchmark for live appends on the columnar storage backends (src/utils/storage.py).
+
+A base file of N synthetic rows (records.synthetic_history) is written once,
+then --appends single-row appends are made, one per period as in
+DataScraper.start_live_scraping. Each append is timed individually, including
+any tiered segment merge or base rewrite it triggers, so the mean is the
+amortized cost per period and p99/max show the merge spikes. With tiered
+compaction the amortized cost should not grow with N (compare 1m and 10m).
+
+--legacy adds the previous policy (compact every 64 segments into the base
+file) for comparison; at 10M rows each of its compactions rewrites the whole
+history.
+
+    python benchmarks/bench_storage_append.py                    # 1m,10m; arrow and parquet
+    python benchmarks/bench_storage_append.py --sizes 1m --legacy
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pyarrow as pa
+
+# --- Path Setup ---
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.rl_agent.records import COLOR_LABELS, synthetic_history
+from src.utils.storage import ArrowStorage, ParquetStorage
+
+SIZES = {'44k': 44_000, '1m': 1_000_000, '10m': 10_000_000}
+
+
+class LegacyCompactionMixin:
+    """Kebijakan lama: setiap append menulis segmen, dan 64 segmen dipadatkan ke file utama."""
+    legacy_segments = 64
+
+    def append(self, df):
+        os.makedirs(self.segment_dir, exist_ok=True)
+        segments = self._segments()
+        next_id = max([self._base_info()[0]] + [entry[1] for entry in segments]) + 1
+        self._write_segment(self._to_table(df), next_id, next_id)
+        if len(segments) + 1 >= self.legacy_segments:
+            self.compact()
+
+
+class LegacyArrowStorage(LegacyCompactionMixin, ArrowStorage):
+    pass
+
+
+class LegacyParquetStorage(LegacyCompactionMixin, ParquetStorage):
+    pass
+
+
+def batch_table(storage, batch):
+    """Tabel Arrow dengan skema storage langsung dari kolom ResultBatch (tanpa DataFrame 10M baris)."""
+    color_labels = [label or '' for label in COLOR_LABELS]
+    columns = [
+        pa.array(batch.period),
+        pa.array(batch.number),
+        pa.DictionaryArray.from_arrays(pa.array(batch.is_big.astype(np.int8)), pa.array(['Small', 'Big'])),
+        pa.DictionaryArray.from_arrays(pa.array((batch.color & 7).astype(np.int8)), pa.array(color_labels)),
+        pa.array(batch.premium.astype(np.int64)),
+    ]
+    table = pa.Table.from_arrays(columns, schema=storage.schema)
+    # Metadata pandas disalin dari tabel kecil agar pembacaan kembali ke DataFrame sama seperti hasil append.
+    return table.replace_schema_metadata(storage._to_table(batch[:1].to_frame()).schema.metadata)
+
+
+def bench_appends(storage_class, history, n_base, n_appends):
+    workdir = tempfile.mkdtemp(prefix='bench_append_')
+    try:
+        storage = storage_class(os.path.join(workdir, f'history.{storage_class.format_name}'))
+        storage._write_base(batch_table(storage, history[:n_base]), -1)
+        rows = history[n_base:n_base + n_appends].to_frame()
+        frames = [rows.iloc[i:i + 1] for i in range(len(rows))]
+
+        base_writes = []
+        write_base_file = storage._write_base_file
+        storage._write_base_file = lambda table: (base_writes.append(table.num_rows), write_base_file(table))
+
+        latencies = np.empty(len(frames))
+        for i, df in enumerate(frames):
+            started = time.perf_counter()
+            storage.append(df)
+            latencies[i] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        total = storage.count()
+        count_ms = (time.perf_counter() - started) * 1e3
+        assert total == n_base + n_appends, (total, n_base + n_appends)
+        started = time.perf_counter()
+        tail = storage.read_tail(200)
+        tail_ms = (time.perf_counter() - started) * 1e3
+        assert tail['Period'].iloc[-1] == history.period[n_base + n_appends - 1]
+        latency_ms = latencies * 1e3
+        return {
+            'mean_ms': float(latency_ms.mean()),
+            'p50_ms': float(np.percentile(latency_ms, 50)),
+            'p99_ms': float(np.percentile(latency_ms, 99)),
+            'max_ms': float(latency_ms.max()),
+            'base_rewrites': len(base_writes),
+            'segments': len(storage._segments()),
+            'count_ms': count_ms,
+            'tail_ms': tail_ms,
+        }
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark biaya append per periode pada backend kolumnar.")
+    parser.add_argument('--sizes', default='1m,10m', help=f"Ukuran file utama, dipisah koma ({', '.join(SIZES)}).")
+    parser.add_argument('--appends', type=int, default=2000, help="Jumlah append satu baris per ukuran.")
+    parser.add_argument('--formats', default='arrow,parquet', help="Backend yang diukur (arrow, parquet).")
+    parser.add_argument('--legacy', action='store_true', help="Ukur juga kebijakan lama (padatkan setiap 64 segmen).")
+    args = parser.parse_args()
+
+    labels = [label.strip().lower() for label in args.sizes.split(',') if label.strip()]
+    unknown = [label for label in labels if label not in SIZES]
+    if unknown:
+        parser.error(f"Ukuran tidak dikenal: {', '.join(unknown)}")
+    classes = {'arrow': [('tiered', ArrowStorage)], 'parquet': [('tiered', ParquetStorage)]}
+    if args.legacy:
+        classes['arrow'].append(('legacy64', LegacyArrowStorage))
+        classes['parquet'].append(('legacy64', LegacyParquetStorage))
+
+    print(f"{'rows':>6} {'format':<8} {'policy':<9}{'mean ms':>9}{'p50 ms':>9}{'p99 ms':>9}{'max ms':>10}"
+          f"{'base rw':>8}{'segs':>6}{'count ms':>10}{'tail ms':>9}")
+    for label in labels:
+        n_base = SIZES[label]
+        history = synthetic_history(n_base + args.appends)
+        for format_name in [name.strip() for name in args.formats.split(',') if name.strip()]:
+            for policy, storage_class in classes[format_name]:
+                r = bench_appends(storage_class, history, n_base, args.appends)
+                print(f"{label:>6} {format_name:<8} {policy:<9}{r['mean_ms']:>9.3f}{r['p50_ms']:>9.3f}{r['p99_ms']:>9.3f}"
+                      f"{r['max_ms']:>10.1f}{r['base_rewrites']:>8}{r['segments']:>6}{r['count_ms']:>10.3f}{r['tail_ms']:>9.3f}")
+        del history
+
+
+if __name__ == '__main__':
+    main()
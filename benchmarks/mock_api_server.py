@@ -0,0 +1,387 @@
+#!/usr/bin/env python3
+"""
+Server HTTP tiruan untuk API riwayat game, untuk benchmark scraper end-to-end
+tanpa situs produksi.
+
+Server menyajikan `POST /api/webapi/GetNoaverageEmerdList` dengan bentuk JSON
+dan paginasi yang sama seperti produksi (terbaru lebih dulu, zstd jika klien
+mengirim `Accept-Encoding: zstd`) dari riwayat rekaman atau sintetis, dengan
+latensi, jitter, dan injeksi error yang dapat diatur. `GET /` menyajikan
+halaman game minimal (login dengan token localStorage, menu Win Go, riwayat
+dengan tombol next) yang memakai selector di config.yaml, sehingga Chrome +
+selenium-wire sungguhan dapat menjalankan `BrowserManager` dan `DataScraper`
+terhadapnya. Jika
+`periods_per_second` > 0, riwayat yang terlihat bertambah seiring waktu dan
+halaman game mem-poll halaman 1 seperti saat live.
+
+Blok konfigurasi: `web_agent.mock_api`. Contoh:
+    python benchmarks/mock_api_server.py --latency-ms 40 --jitter-ms 20 --error-rate 0.01
+    python benchmarks/mock_api_server.py --scrape bulk
+
+Modul pendukung benchmark; kode di src/ tidak mengimpornya.
+"""
+import argparse
+import copy
+import json
+import logging
+import os
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+import yaml
+import zstandard
+
+# --- Path Setup ---
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.rl_agent.records import synthetic_history
+from benchmarks.replay_driver import history_page_json
+from src.utils.storage import open_storage
+
+API_PATH = '/api/webapi/GetNoaverageEmerdList'
+
+_GAME_PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Win Go (mock)</title>
+<style>body{font-family:sans-serif}.row{display:flex;gap:1em}[hidden]{display:none!important}
+.GameRecord__C-foot div{display:inline-block;padding:0 1em;cursor:pointer}</style></head>
+<body>
+<div id="login" hidden>
+  <input name="userNumber" placeholder="Phone number"><input type="password" placeholder="Password">
+  <button onclick="logIn()">Log in</button>
+</div>
+<div id="home" hidden>
+  <div class="lottery" onclick="document.getElementById('games').hidden=false"><span>Win Go</span></div>
+  <div id="games" hidden><div class="GameList__C-item" onclick="location.hash='#/game'">Win Go 1Min</div></div>
+</div>
+<div id="game" hidden>
+  <div class="TimeLeft__C-id"></div><div class="TimeLeft__C-time">00:00</div>
+  <div id="records"></div>
+  <div class="GameRecord__C-foot">
+    <div class="GameRecord__C-foot-prev" onclick="load(Math.max(page - 1, 1))">&lt;</div>
+    <div class="GameRecord__C-foot-page">1/1</div>
+    <div class="GameRecord__C-foot-next" onclick="load(page + 1)">&gt;</div>
+  </div>
+</div>
+<script>
+const CONFIG = __CONFIG__;
+let page = 1, poller = null, nextPoll = 0;
+async function load(pageNo) {
+  const response = await fetch(CONFIG.apiPath, {method: 'POST',
+    headers: {'Content-Type': 'application/json;charset=UTF-8'},
+    body: JSON.stringify({pageSize: CONFIG.pageSize, pageNo: pageNo, typeId: 1, language: 0})});
+  if (!response.ok) return;
+  const data = (await response.json()).data;
+  page = data.pageNo;
+  document.querySelector('.GameRecord__C-foot-page').textContent = page + '/' + data.totalPage;
+  document.getElementById('records').innerHTML = data.list.map(r =>
+    '<div class="row"><span>' + r.issueNumber + '</span><span>' + r.number + '</span><span>' + r.colour + '</span></div>').join('');
+  if (page === 1 && data.list.length) {
+    document.querySelector('.TimeLeft__C-id').textContent = (BigInt(data.list[0].issueNumber) + 1n).toString();
+  }
+}
+function tick() {
+  const left = Math.max(Math.ceil((nextPoll - Date.now()) / 1000), 0);
+  document.querySelector('.TimeLeft__C-time').textContent = '00:' + String(left).padStart(2, '0');
+  if (Date.now() >= nextPoll) { nextPoll = Date.now() + CONFIG.pollMs; if (page === 1) load(1); }
+}
+function logIn() {
+  localStorage.setItem('token', 'mock-' + Date.now());
+  document.cookie = 'session=mock; path=/';
+  location.hash = '#/home';
+}
+function route() {
+  const view = (location.hash || '#/login').slice(2) || 'login';
+  if (view !== 'login' && !localStorage.getItem('token')) { location.hash = '#/login'; return; }
+  for (const id of ['login', 'home', 'game']) document.getElementById(id).hidden = id !== view;
+  clearInterval(poller);
+  if (view === 'game') { load(1); nextPoll = Date.now() + CONFIG.pollMs; if (CONFIG.live) poller = setInterval(tick, 100); }
+}
+window.addEventListener('hashchange', route);
+route();
+</script>
+</body></html>
+"""
+
+
+class _MockApiHandler(BaseHTTPRequestHandler):
+    # HTTP/1.1 agar klien dengan connection pool memakai ulang koneksi seperti ke produksi.
+    protocol_version = 'HTTP/1.1'
+    server_version = 'MockGameApi/1.0'
+
+    def log_message(self, format, *args):
+        logging.debug(f"mock-api {self.address_string()} - {format % args}")
+
+    def _send(self, status, body, content_type='application/json', encoding=None):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        if encoding:
+            self.send_header('Content-Encoding', encoding)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        path = urlsplit(self.path).path
+        if path in ('/', '/index.html'):
+            self._send(200, self.server.mock.game_page(), 'text/html; charset=utf-8')
+        else:
+            self._send(404, b'{"code":404,"msg":"Not Found"}')
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        if urlsplit(self.path).path != API_PATH:
+            self._send(404, b'{"code":404,"msg":"Not Found"}')
+            return
+        try:
+            payload = json.loads(body or b'{}')
+        except ValueError:
+            self._send(400, b'{"code":400,"msg":"Invalid JSON"}')
+            return
+        mock = self.server.mock
+        mock.delay()
+        if mock.inject_error():
+            self._send(mock.error_status, json.dumps({'code': mock.error_status, 'msg': 'Injected error'}).encode('utf-8'))
+            return
+        page_body = mock.render_page(int(payload.get('pageNo') or 1), int(payload.get('pageSize') or mock.page_size))
+        if 'zstd' in (self.headers.get('Accept-Encoding') or ''):
+            self._send(200, mock.compress(page_body), encoding='zstd')
+        else:
+            self._send(200, page_body)
+
+
+class MockGameApiServer:
+    """
+    Server API tiruan yang berjalan di thread latar belakang.
+
+    Args:
+        batch (ResultBatch): Riwayat yang disajikan (urut Period naik).
+        host, port: Alamat bind; port 0 memilih port bebas.
+        page_size (int): Ukuran halaman default jika body tidak mengirim `pageSize`.
+        latency_ms, jitter_ms (float): Latensi per permintaan API, seragam dalam latency ± jitter.
+        error_rate (float): Peluang permintaan API dijawab `error_status`.
+        periods_per_second (float): Laju munculnya periode baru; 0 = riwayat statis.
+        live_periods (int): Saat live, jumlah periode terakhir yang belum terlihat di awal.
+        poll_ms (int): Interval poll halaman 1 oleh halaman game.
+        seed (int, optional): Seed RNG latensi/error agar run dapat diulang.
+    """
+    def __init__(self, batch, host='127.0.0.1', port=0, page_size=10, latency_ms=0.0, jitter_ms=0.0,
+                 error_rate=0.0, error_status=503, periods_per_second=0.0, live_periods=1000, poll_ms=1000,
+                 seed=None):
+        self.batch = batch
+        self.page_size = max(int(page_size), 1)
+        self.latency_ms = float(latency_ms)
+        self.jitter_ms = float(jitter_ms)
+        self.error_rate = float(error_rate)
+        self.error_status = int(error_status)
+        self.periods_per_second = float(periods_per_second)
+        self.poll_ms = int(poll_ms)
+        self.initial_rows = len(batch) - min(int(live_periods), len(batch)) if self.periods_per_second > 0 else len(batch)
+        self.requests = 0
+        self.errors = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._started_at = None
+        self._thread = None
+        self.httpd = ThreadingHTTPServer((host, port), _MockApiHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.mock = self
+
+    @classmethod
+    def from_config(cls, config, batch=None, **overrides):
+        """Membuat server dari `web_agent.mock_api`; riwayat dari data_path atau sintetis."""
+        mock_config = dict(config.get('web_agent', {}).get('mock_api', {}), **overrides)
+        if batch is None:
+            batch = load_mock_history(config, mock_config)
+        return cls(
+            batch,
+            host=mock_config.get('host', '127.0.0.1'),
+            port=mock_config.get('port', 8765),
+            page_size=mock_config.get('page_size', 10),
+            latency_ms=mock_config.get('latency_ms', 0),
+            jitter_ms=mock_config.get('jitter_ms', 0),
+            error_rate=mock_config.get('error_rate', 0.0),
+            error_status=mock_config.get('error_status', 503),
+            periods_per_second=mock_config.get('periods_per_second', 0),
+            live_periods=mock_config.get('live_periods', 1000),
+            poll_ms=mock_config.get('poll_ms', 1000),
+            seed=mock_config.get('seed'),
+        )
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def api_url(self):
+        return self.url + API_PATH
+
+    @property
+    def api_endpoint(self):
+        """Pola `web_agent.api_endpoint` (tanpa skema) untuk server ini."""
+        return urlsplit(self.url).netloc + API_PATH
+
+    @property
+    def visible_rows(self):
+        """Jumlah riwayat yang sudah 'terjadi' saat ini."""
+        if self.periods_per_second <= 0 or self._started_at is None:
+            return self.initial_rows
+        elapsed = time.monotonic() - self._started_at
+        return min(self.initial_rows + int(elapsed * self.periods_per_second), len(self.batch))
+
+    def game_page(self):
+        page_config = {'apiPath': API_PATH, 'pageSize': self.page_size, 'pollMs': self.poll_ms,
+                       'live': self.periods_per_second > 0}
+        return _GAME_PAGE.replace('__CONFIG__', json.dumps(page_config)).encode('utf-8')
+
+    def render_page(self, page_no, page_size):
+        """Body JSON halaman `page_no` (1 = terbaru) dari riwayat yang terlihat."""
+        visible = self.visible_rows
+        end = visible - (max(page_no, 1) - 1) * page_size
+        return history_page_json(self.batch, end, page_size, page_no, total_count=visible)
+
+    def compress(self, body):
+        # ZstdCompressor tidak aman dipakai bersama antar thread; satu per thread handler.
+        compressor = getattr(self._local, 'compressor', None)
+        if compressor is None:
+            compressor = self._local.compressor = zstandard.ZstdCompressor(level=3)
+        return compressor.compress(body)
+
+    def delay(self):
+        if self.latency_ms <= 0 and self.jitter_ms <= 0:
+            return
+        with self._lock:
+            jitter = self._random.uniform(-self.jitter_ms, self.jitter_ms)
+        time.sleep(max(self.latency_ms + jitter, 0.0) / 1000)
+
+    def inject_error(self):
+        with self._lock:
+            self.requests += 1
+            failed = self.error_rate > 0 and self._random.random() < self.error_rate
+            if failed:
+                self.errors += 1
+        return failed
+
+    def stats(self):
+        return {'requests': self.requests, 'errors': self.errors, 'visible_rows': self.visible_rows}
+
+    def start(self):
+        if self._thread is None:
+            self._started_at = time.monotonic()
+            self._thread = threading.Thread(target=self.httpd.serve_forever, name='mock-api', daemon=True)
+            self._thread.start()
+            logging.info(f"Server API tiruan berjalan di {self.url} ({len(self.batch)} baris, "
+                         f"latensi {self.latency_ms:g}±{self.jitter_ms:g} ms, error {self.error_rate:.1%}).")
+        return self
+
+    def stop(self):
+        if self._thread is not None:
+            self.httpd.shutdown()
+            self._thread.join()
+            self._thread = None
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+
+def load_mock_history(config, mock_config=None):
+    """Riwayat untuk server tiruan: `mock_api.data_path`, lalu project_setup.data_path, lalu sintetis."""
+    mock_config = mock_config if mock_config is not None else config.get('web_agent', {}).get('mock_api', {})
+    data_path = mock_config.get('data_path') or config.get('project_setup', {}).get('data_path')
+    if data_path and not os.path.isabs(data_path):
+        data_path = os.path.join(project_root, data_path)
+    if data_path and os.path.exists(data_path):
+        return open_storage(data_path).read_batch().sorted_unique()
+    logging.info("Riwayat rekaman tidak ditemukan; server tiruan memakai riwayat sintetis.")
+    return synthetic_history(mock_config.get('synthetic_rows', 50000), seed=mock_config.get('seed') or 0)
+
+
+def apply_mock_api(config, server=None):
+    """
+    Salinan config yang mengarahkan login_url, game_url, dan api_endpoint ke
+    server tiruan (`server`, atau `web_agent.mock_api.host/port`) dan
+    menandai `mock_api.enabled` agar driver ikut menangkap lalu lintas loopback.
+    """
+    config = copy.deepcopy(config)
+    web_agent = config.setdefault('web_agent', {})
+    mock_config = web_agent.setdefault('mock_api', {})
+    if server is not None:
+        url = server.url
+    else:
+        url = f"http://{mock_config.get('host', '127.0.0.1')}:{mock_config.get('port', 8765)}"
+    mock_config['enabled'] = True
+    web_agent['login_url'] = url + '/#/login'
+    web_agent['game_url'] = url + '/#/game'
+    web_agent['api_endpoint'] = urlsplit(url).netloc + API_PATH
+    return config
+
+
+def run_scraper(config, server, mode, model=None):
+    """Menjalankan ShellScraper (Chrome + selenium-wire) terhadap `server`; halaman login tiruan menerima kredensial apa pun."""
+    from scraper_shell import ShellScraper
+
+    scraper = ShellScraper(config, gemini_model=model)
+    scraper.setup_logging()
+    try:
+        if mode == 'bulk':
+            success = scraper.run_bulk_scrape('mock', 'mock')
+        else:
+            success = scraper.run_live_scrape('mock', 'mock')
+    finally:
+        logging.info(f"Statistik server tiruan: {server.stats()}")
+        server.stop()
+    return 0 if success else 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Server API GetNoaverageEmerdList tiruan untuk benchmark offline.")
+    parser.add_argument('--data', help="Riwayat yang disajikan (default: mock_api.data_path / project_setup.data_path).")
+    parser.add_argument('--synthetic-rows', type=int, help="Pakai riwayat sintetis sepanjang N baris.")
+    parser.add_argument('--host')
+    parser.add_argument('--port', type=int)
+    parser.add_argument('--latency-ms', type=float)
+    parser.add_argument('--jitter-ms', type=float)
+    parser.add_argument('--error-rate', type=float)
+    parser.add_argument('--periods-per-second', type=float, help="Laju periode baru untuk live scraping (0 = statis).")
+    parser.add_argument('--scrape', choices=['bulk', 'live'],
+                        help="Jalankan scraper_shell dalam mode ini terhadap server tiruan, lalu berhenti.")
+    parser.add_argument('--model', help="Predictor untuk --scrape live (lihat scraper_shell.py --model).")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    with open(os.path.join(project_root, 'config.yaml'), 'r', encoding='utf-8') as f:
+        config = yaml.safe_load(f)
+
+    overrides = {key: value for key, value in (
+        ('host', args.host), ('port', args.port), ('latency_ms', args.latency_ms), ('jitter_ms', args.jitter_ms),
+        ('error_rate', args.error_rate), ('periods_per_second', args.periods_per_second), ('data_path', args.data),
+    ) if value is not None}
+    batch = synthetic_history(args.synthetic_rows) if args.synthetic_rows else None
+    server = MockGameApiServer.from_config(config, batch, **overrides).start()
+    print(f"Halaman game: {server.url}/#/login")
+    print(f"api_endpoint: {server.api_endpoint}")
+    if args.scrape:
+        return run_scraper(apply_mock_api(config, server), server, args.scrape, args.model)
+    try:
+        while True:
+            time.sleep(60)
+            logging.info(f"Statistik server tiruan: {server.stats()}")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
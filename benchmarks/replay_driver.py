@@ -0,0 +1,294 @@
+"""
+Offline stand-in for the selenium-wire Chrome driver, used by the live-pipeline
+benchmarks (bench_live_replay.py, run_benchmarks.py, bench_mock_api.py).
+
+Benchmark support only: nothing under src/ imports this module.
+"""
+import datetime
+import json
+import logging
+import math
+import re
+import threading
+import time
+
+import zstandard
+from selenium.common.exceptions import NoSuchElementException, TimeoutException
+
+from src.rl_agent.page_fetch import FETCH_SCRIPT
+from src.rl_agent.records import decode_colors
+from src.rl_agent.ui_state import SNAPSHOT_SCRIPT
+
+DEFAULT_API_URL = "https://api.55fiveapi.com/api/webapi/GetNoaverageEmerdList"
+
+
+def history_page_json(batch, end, page_size=10, page_no=1, total_count=None):
+    """
+    Body JSON GetNoaverageEmerdList (belum dikompresi) berisi `page_size` hasil
+    terbaru sebelum posisi `end` pada `batch`, terbaru lebih dulu. `total_count`
+    adalah jumlah seluruh riwayat yang terlihat (default `end`).
+    """
+    start = max(end - page_size, 0)
+    page = batch[start:max(end, 0)]
+    colors = decode_colors(page.color)
+    records = [
+        {'issueNumber': str(period), 'number': str(number), 'colour': color,
+         'premium': str(premium) if premium >= 0 else ''}
+        for period, number, color, premium in zip(page.period.tolist()[::-1], page.number.tolist()[::-1],
+                                                  colors.tolist()[::-1], page.premium.tolist()[::-1])
+    ]
+    total = end if total_count is None else total_count
+    return json.dumps({
+        'data': {'list': records, 'pageNo': page_no, 'totalPage': max(-(-total // page_size), 1), 'totalCount': total},
+        'code': 0, 'msg': 'Succeed', 'msgCode': 0,
+    }).encode('utf-8')
+
+
+def build_history_page(batch, end, page_size=10, page_no=1, compressor=None, total_count=None):
+    """Seperti `history_page_json`, dikompresi zstd seperti respons produksi."""
+    body = history_page_json(batch, end, page_size, page_no, total_count)
+    return (compressor or zstandard.ZstdCompressor(level=3)).compress(body)
+
+
+class FakeResponse:
+    def __init__(self, body, status_code=200, headers=None):
+        self.body = body
+        self.status_code = status_code
+        self.headers = headers or {}
+
+
+class FakeRequest:
+    """Meniru objek request selenium-wire (`url`, `method`, `body`, `response`, `date`)."""
+    def __init__(self, url, body, response, period=None):
+        self.url = url
+        self.method = 'POST'
+        self.headers = {'Content-Type': 'application/json;charset=UTF-8'}
+        self.body = body
+        self.response = response
+        self.date = datetime.datetime.now()
+        self.period = period
+        self.emitted_at = time.monotonic()
+
+
+class FakeElement:
+    def __init__(self, driver, text=''):
+        self._driver = driver
+        self._text = text
+
+    @property
+    def text(self):
+        return self._text() if callable(self._text) else self._text
+
+    def click(self):
+        self._driver.clicks.append(self)
+
+    def is_displayed(self):
+        return True
+
+    def is_enabled(self):
+        return True
+
+    def get_attribute(self, name):
+        return None
+
+    def find_element(self, by, value):
+        return self._driver.find_element(by, value)
+
+    def find_elements(self, by, value):
+        return self._driver.find_elements(by, value)
+
+
+class ReplayWebDriver:
+    """
+    WebDriver palsu untuk menjalankan `DataScraper` tanpa Chrome dan jaringan.
+
+    Thread replay memutar ulang riwayat (`ResultBatch`) satu periode setiap
+    1/`periods_per_second` detik. Setiap periode menghasilkan respons API zstd
+    berisi halaman pertama riwayat (seperti yang dipicu halaman game) dan
+    dimasukkan ke buffer `requests`, mengikuti semantik selenium-wire:
+    `del driver.requests` mengosongkan buffer dan `wait_for_request` menunggu
+    request yang URL-nya cocok dengan pola.
+
+    Elemen UI disediakan lewat `elements` ({nilai selector: teks atau callable});
+    `execute_script` hanya mencatat skrip (klik dijalankan pada elemen), kecuali
+    `SNAPSHOT_SCRIPT` yang dijawab dengan timer hitung mundur ke periode berikutnya.
+    Jika `response_interceptor` dipasang, ia dipanggil dengan (request, response)
+    di thread replay untuk setiap respons, seperti interceptor selenium-wire.
+
+    `poll_delay` menunda respons halaman sekian detik setelah periode tersedia,
+    meniru jeda polling halaman game; `available_at` mencatat kapan tiap period
+    tersedia (monotonic). `execute_async_script` menjawab `FETCH_SCRIPT` dengan
+    halaman riwayat terkini saat itu juga (fetch dalam halaman); responsnya juga
+    diteruskan ke `response_interceptor`, seperti proxy selenium-wire di Chrome.
+    """
+    def __init__(self, batch, start=0, periods_per_second=1000.0, api_url=DEFAULT_API_URL,
+                 page_size=10, elements=None, poll_delay=0.0):
+        self.batch = batch
+        self.position = start
+        self.periods_per_second = float(periods_per_second)
+        self.api_url = api_url
+        self.page_size = page_size
+        self.elements = dict(elements or {})
+        self.poll_delay = float(poll_delay)
+        self.available_at = {}
+        self.current_url = ''
+        self.emitted = 0
+        self.fetches = 0
+        self.scripts = []
+        self.clicks = []
+        self._response_interceptor = None
+        self.finished = threading.Event()
+        self._buffer = []
+        self._condition = threading.Condition()
+        self._stopped = threading.Event()
+        self._compressor = zstandard.ZstdCompressor(level=3)
+        self._thread = None
+        self._started = None
+        self._interval = 0.0
+
+    # --- Replay ---
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._replay, name='replay-driver', daemon=True)
+            self._thread.start()
+        return self
+
+    def _replay(self):
+        interval = 1.0 / self.periods_per_second if self.periods_per_second > 0 else 0.0
+        started = time.monotonic()
+        first = self.position
+        self._interval, self._started, self._first = interval, started, first
+        while not self._stopped.is_set() and self.position < len(self.batch):
+            # Pancarkan semua periode yang sudah jatuh tempo (mengejar bila sleep terlambat).
+            due = first + int((time.monotonic() - started) / interval) + 1 if interval else len(self.batch)
+            while self.position < min(due, len(self.batch)):
+                self.position += 1
+                self.available_at[int(self.batch.period[self.position - 1])] = time.monotonic()
+                if self.poll_delay > 0:
+                    timer = threading.Timer(self.poll_delay, self._emit, (self.position,))
+                    timer.daemon = True
+                    timer.start()
+                else:
+                    self._emit(self.position)
+            if interval:
+                next_due = started + (self.position - first) * interval
+                delay = next_due - time.monotonic()
+                if delay > 0:
+                    self._stopped.wait(delay)
+        self.finished.set()
+        with self._condition:
+            self._condition.notify_all()
+        logging.info(f"Replay selesai: {self.emitted} periode dipancarkan.")
+
+    def _emit(self, end):
+        body = build_history_page(self.batch, end, self.page_size, compressor=self._compressor)
+        response = FakeResponse(body, headers={'Content-Encoding': 'zstd', 'Content-Type': 'application/json'})
+        request_body = json.dumps({'pageSize': self.page_size, 'pageNo': 1, 'typeId': 1}).encode('utf-8')
+        request = FakeRequest(self.api_url, request_body, response, period=int(self.batch.period[end - 1]))
+        interceptor = self._response_interceptor
+        if interceptor:
+            interceptor(request, response)
+        with self._condition:
+            self._buffer.append(request)
+            self.emitted += 1
+            self._condition.notify_all()
+
+    @property
+    def current_period(self):
+        return int(self.batch.period[self.position - 1]) if self.position else None
+
+    # --- Subset selenium-wire ---
+    @property
+    def requests(self):
+        with self._condition:
+            return list(self._buffer)
+
+    @requests.deleter
+    def requests(self):
+        with self._condition:
+            self._buffer.clear()
+
+    @property
+    def response_interceptor(self):
+        return self._response_interceptor
+
+    @response_interceptor.setter
+    def response_interceptor(self, interceptor):
+        self._response_interceptor = interceptor
+
+    @response_interceptor.deleter
+    def response_interceptor(self):
+        self._response_interceptor = None
+
+    def wait_for_request(self, pat, timeout=10):
+        """Menunggu request yang URL-nya cocok dengan `pat`; TimeoutException jika tidak ada."""
+        pattern = re.compile(re.escape(pat) if '*' not in pat else pat)
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            while True:
+                for request in self._buffer:
+                    if pattern.search(request.url):
+                        return request
+                remaining = deadline - time.monotonic()
+                # Setelah replay habis tidak ada request baru; jangan menunggu sia-sia.
+                if remaining <= 0 or self.finished.is_set():
+                    raise TimeoutException(f"Timed out after {timeout}s waiting for request matching {pat}")
+                self._condition.wait(remaining)
+
+    # --- Subset WebDriver ---
+    def get(self, url):
+        self.current_url = url
+
+    def find_element(self, by, value):
+        if value not in self.elements:
+            raise NoSuchElementException(f"Elemen palsu tidak tersedia untuk selector: {value}")
+        return FakeElement(self, self.elements[value])
+
+    def find_elements(self, by, value):
+        return [FakeElement(self, self.elements[value])] if value in self.elements else []
+
+    def execute_script(self, script, *args):
+        self.scripts.append(script)
+        if script == SNAPSHOT_SCRIPT:
+            return self._ui_state()
+        if 'click' in script and args and isinstance(args[0], FakeElement):
+            args[0].click()
+        if 'readyState' in script:
+            return 'complete'
+        return None
+
+    def execute_async_script(self, script, *args):
+        self.scripts.append(script)
+        if script != FETCH_SCRIPT:
+            return None
+        # Argumen FETCH_SCRIPT: url, method, headers, body JSON, timeout (ms).
+        payload = json.loads(args[3]) if len(args) > 3 and args[3] else {}
+        self.fetches += 1
+        body = history_page_json(self.batch, self.position, payload.get('pageSize', self.page_size),
+                                 payload.get('pageNo', 1))
+        # Seperti selenium-wire di Chrome: respons fetch juga melewati response_interceptor.
+        interceptor = self._response_interceptor
+        if interceptor and args:
+            response = FakeResponse(zstandard.ZstdCompressor(level=3).compress(body),
+                                    headers={'Content-Encoding': 'zstd', 'Content-Type': 'application/json'})
+            interceptor(FakeRequest(args[0], args[3].encode('utf-8'), response), response)
+        return {'status': 200, 'body': body.decode('utf-8')}
+
+    def _ui_state(self):
+        """Timer dan period seperti `SNAPSHOT_SCRIPT`: sisa waktu hingga periode berikutnya dipancarkan."""
+        if self._started is None or not self._interval:
+            return {}
+        next_due = self._started + (self.position - self._first + 1) * self._interval
+        seconds_left = max(math.ceil(next_due - time.monotonic()), 0)
+        state = {'timer': [f"{seconds_left // 60:02d}:{seconds_left % 60:02d}", True]}
+        if self.position < len(self.batch):
+            state['period'] = [str(self.batch.period[self.position]), True]
+        return state
+
+    def get_cookies(self):
+        return []
+
+    def quit(self):
+        self._stopped.set()
+        with self._condition:
+            self._condition.notify_all()
@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the scraping pipeline hot paths, on synthetic histories
+(records.synthetic_history) of 44k, 1M and 10M rows:
+
+- decode:  process_api_response on zstd GetNoaverageEmerdList pages
+- bulk:    bulk-scrape merge (BulkScrapeProgress pages newest-first, checkpoints
+           to the pending side file, one HistoryStore merge at completion) on
+           top of a full CSV store
+- live:    live-loop merge per period (decode -> records_to_batch ->
+           HistoryStore.ingest -> tail_batch), as in DataScraper.start_live_scraping
+- csv:     full save, HistoryStore.load, tail read and append on the CSV backend
+- prompt:  GeminiPredictor.build_prediction_prompt for each prompt encoding
+
+Every metric is a time (lower is better). Counters such as the number of
+HistoryStore rewrites during the bulk merge are asserted against their expected
+value instead of being reported. Results are written as JSON and compared with
+a stored baseline; a metric slower than the baseline by more than --tolerance
+counts as a regression and makes the run exit with status 1.
+
+The stored baseline is machine-specific: benchmarks/baseline.json was captured
+on a single-CPU machine (cpu_count 1, see its "environment" block), where the
+10M-row CSV save alone takes over 20 s. Regenerate it with --update-baseline on
+the machine that runs the comparison before trusting any regression flag.
+
+    python benchmarks/run_benchmarks.py                       # 44k and 1m, compare with benchmarks/baseline.json
+    python benchmarks/run_benchmarks.py --sizes 44k,1m,10m --update-baseline
+"""
+import argparse
+import contextlib
+import copy
+import io
+import json
+import logging
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+import yaml
+
+# --- Path Setup ---
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.rl_agent.bulk_progress import BulkScrapeProgress
+from src.rl_agent.data_store import HistoryStore, records_to_batch
+from src.rl_agent.prompt_encoding import ENCODINGS
+from src.rl_agent.records import synthetic_history
+from benchmarks.replay_driver import FakeRequest, FakeResponse, build_history_page
+from src.utils.scraping import process_api_response
+from src.utils.storage import CsvStorage
+
+SIZES = {'44k': 44_000, '1m': 1_000_000, '10m': 10_000_000}
+DEFAULT_SIZES = '44k,1m'
+DEFAULT_BASELINE = os.path.join(project_root, 'benchmarks', 'baseline.json')
+DEFAULT_OUTPUT = os.path.join(project_root, 'benchmarks', 'results', 'latest.json')
+ZSTD_HEADERS = {'Content-Encoding': 'zstd', 'Content-Type': 'application/json'}
+
+
+def _page_request(batch, end, page_size=10, page_no=1):
+    body = build_history_page(batch, end, page_size, page_no, total_count=len(batch))
+    return FakeRequest('https://api.local/api/webapi/GetNoaverageEmerdList', b'{}', FakeResponse(body, headers=ZSTD_HEADERS))
+
+
+def _timed(func, repeat):
+    """Median waktu (detik) dari `repeat` kali pemanggilan dan hasil pemanggilan terakhir."""
+    times = []
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - started)
+    return statistics.median(times), result
+
+
+def bench_decode(batch, repeat, pages=500):
+    requests = [_page_request(batch, len(batch) - i * 10, page_no=i + 1) for i in range(min(pages, len(batch) // 10))]
+    seconds, _ = _timed(lambda: [process_api_response(request) for request in requests], repeat)
+    return {'decode.us_per_page': seconds / len(requests) * 1e6}
+
+
+def bench_csv(batch, workdir, repeat):
+    storage = CsvStorage(os.path.join(workdir, 'history.csv'))
+    frame = batch.to_frame()
+    save_seconds, _ = _timed(lambda: storage.write(frame), 1)
+    del frame
+
+    def load():
+        store = HistoryStore(storage)
+        store.load()
+        return store
+
+    load_seconds, store = _timed(load, repeat)
+    assert store.row_count == len(batch)
+    tail_seconds, _ = _timed(lambda: storage.read_tail(200), max(repeat, 5))
+
+    # Append dilakukan ke salinan agar file utama tetap utuh untuk kasus berikutnya.
+    append_storage = CsvStorage(os.path.join(workdir, 'append.csv'))
+    shutil.copyfile(storage.path, append_storage.path)
+    rows = synthetic_history(10, seed=1, start_date='2100-01-01').to_frame()
+    append_seconds, _ = _timed(lambda: append_storage.append(rows), max(repeat, 5))
+    os.remove(append_storage.path)
+    return {
+        'csv.save_s': save_seconds,
+        'csv.load_s': load_seconds,
+        'csv.tail_ms': tail_seconds * 1e3,
+        'csv.append_ms': append_seconds * 1e3,
+    }
+
+
+def _seed_store(batch, rows_kept, workdir, name):
+    """Store CSV berisi `rows_kept` baris pertama riwayat, disalin dari file penuh."""
+    source = os.path.join(workdir, 'history.csv')
+    path = os.path.join(workdir, name)
+    # Potong `len(batch) - rows_kept` baris terakhir dengan mencari offset dari akhir file;
+    # salinan byte jauh lebih cepat daripada menulis ulang via pandas.
+    dropped = len(batch) - rows_kept
+    with open(source, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        offset = f.tell()
+        newlines = 0
+        while newlines <= dropped and offset > 0:
+            step = min(1 << 16, offset)
+            offset -= step
+            f.seek(offset)
+            chunk = f.read(step)
+            newlines += chunk.count(b'\n')
+        excess = newlines - dropped - 1  # Newline di dalam chunk sebelum baris pertama yang dibuang
+        cut = offset + _nth_newline(chunk, excess) + 1 if excess >= 0 else 0
+        f.seek(0)
+        with open(path, 'wb') as dst:
+            remaining = cut
+            while remaining:
+                data = f.read(min(1 << 20, remaining))
+                dst.write(data)
+                remaining -= len(data)
+    store = HistoryStore(CsvStorage(path))
+    store.load()
+    return store
+
+
+def _nth_newline(chunk, n):
+    """Posisi newline ke-n (mulai 0) di `chunk`."""
+    position = -1
+    for _ in range(n + 1):
+        position = chunk.index(b'\n', position + 1)
+    return position
+
+
+def bench_bulk(batch, workdir, checkpoint_every, pages=20, page_size=10):
+    pages = min(pages, len(batch) // page_size - 1)
+    store = _seed_store(batch, len(batch) - pages * page_size, workdir, 'bulk.csv')
+    requests = [_page_request(batch, len(batch) - i * page_size, page_size, i + 1) for i in range(pages)]
+    progress = BulkScrapeProgress(store, os.path.join(workdir, 'bulk_checkpoint.json'), checkpoint_every=checkpoint_every)
+    started = time.perf_counter()
+    progress.begin(pages)
+    for page_no, request in enumerate(requests, start=1):
+        if not progress.accept(page_no, process_api_response(request)):
+            break
+    progress.complete()
+    seconds = time.perf_counter() - started
+    assert store.row_count == len(batch)
+    # Checkpoint hanya menambah file pending; seluruh halaman (semuanya lebih baru dari
+    # isi store) digabung sekali oleh complete() sebagai append, tanpa menulis ulang store.
+    assert store.rewrites == 0, f"rewrites {store.rewrites}, diharapkan 0"
+    return {
+        'bulk.merge_s': seconds,
+        'bulk.ms_per_page': seconds / pages * 1e3,
+    }
+
+
+def bench_live(batch, workdir, periods=300, context_rows=200):
+    periods = min(periods, len(batch) - 10)
+    store = _seed_store(batch, len(batch) - periods, workdir, 'live.csv')
+    requests = [_page_request(batch, end) for end in range(len(batch) - periods + 1, len(batch) + 1)]
+    latencies = np.empty(len(requests))
+    for i, request in enumerate(requests):
+        started = time.perf_counter()
+        new_rows = store.ingest(records_to_batch(process_api_response(request)))
+        if not new_rows.empty:
+            store.tail_batch(context_rows)
+        latencies[i] = time.perf_counter() - started
+    assert store.row_count == len(batch)
+    latency_ms = latencies * 1e3
+    return {
+        'live.ms_per_period_p50': float(np.percentile(latency_ms, 50)),
+        'live.ms_per_period_p95': float(np.percentile(latency_ms, 95)),
+    }
+
+
+def bench_prompt(batch, config, steps=300):
+    # Tanpa API key sungguhan: klien dibuat tetapi tidak pernah memanggil API.
+    os.environ.setdefault('GEMINI_API_KEY', 'benchmark')
+    from src.rl_agent.gemini_predictor import GeminiPredictor
+
+    results = {}
+    for encoding in ENCODINGS:
+        gemini_config = dict(config.get('gemini') or {}, prompt_encoding=encoding)
+        gemini_config['response_cache'] = {'enabled': False}
+        with contextlib.redirect_stdout(io.StringIO()):
+            predictor = GeminiPredictor(config=dict(config, gemini=gemini_config))
+        window = predictor.context_rows
+        ends = range(len(batch) - steps + 1, len(batch) + 1)
+        # Jendela bergeser satu periode setiap langkah seperti saat live.
+        started = time.perf_counter()
+        for end in ends:
+            predictor.build_prediction_prompt(batch[max(end - window, 0):end])
+        results[f'prompt.{encoding}_us'] = (time.perf_counter() - started) / len(ends) * 1e6
+    return results
+
+
+def run_size(label, n_rows, config, repeat):
+    logging.info(f"[{label}] Membuat riwayat sintetis {n_rows} baris...")
+    batch = synthetic_history(n_rows)
+    checkpoint_every = config.get('web_agent', {}).get('scraping', {}).get('checkpoint_every_pages', 10)
+    workdir = tempfile.mkdtemp(prefix=f'bench_{label}_')
+    results = {}
+    try:
+        for name, run in (
+            ('decode', lambda: bench_decode(batch, repeat)),
+            ('csv', lambda: bench_csv(batch, workdir, repeat)),
+            ('bulk', lambda: bench_bulk(batch, workdir, checkpoint_every)),
+            ('live', lambda: bench_live(batch, workdir)),
+            ('prompt', lambda: bench_prompt(batch, config)),
+        ):
+            started = time.perf_counter()
+            results.update(run())
+            logging.info(f"[{label}] {name} selesai ({time.perf_counter() - started:.1f}s)")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return {f'{label}/{key}': value for key, value in results.items()}
+
+
+def compare(results, baseline, tolerance):
+    """
+    Membandingkan hasil dengan baseline.
+
+    Returns:
+        list[dict]: Baris perbandingan per metrik yang ada di keduanya;
+                    `regression` True jika lebih lambat dari baseline * (1 + tolerance).
+    """
+    rows = []
+    for key, value in results.items():
+        base = baseline.get(key)
+        if base is None:
+            continue
+        ratio = value / base if base else float('inf')
+        rows.append({'metric': key, 'baseline': base, 'current': value, 'ratio': ratio,
+                     'regression': ratio > 1 + tolerance})
+    return rows
+
+
+def environment():
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Suite benchmark jalur scraping (JSON + perbandingan baseline).")
+    parser.add_argument('--sizes', default=DEFAULT_SIZES,
+                        help=f"Ukuran riwayat, dipisah koma ({', '.join(SIZES)}; default {DEFAULT_SIZES}).")
+    parser.add_argument('--repeat', type=int, default=3, help="Pengulangan untuk kasus cepat (median).")
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help="File JSON hasil.")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help="File JSON baseline pembanding.")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="Perlambatan relatif yang masih diterima.")
+    parser.add_argument('--update-baseline', action='store_true', help="Simpan hasil run ini sebagai baseline.")
+    parser.add_argument('--verbose', action='store_true')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING,
+                        format='%(asctime)s - %(levelname)s - %(message)s')
+    with open(os.path.join(project_root, 'config.yaml'), 'r', encoding='utf-8') as f:
+        config = yaml.safe_load(f)
+
+    labels = [label.strip().lower() for label in args.sizes.split(',') if label.strip()]
+    unknown = [label for label in labels if label not in SIZES]
+    if unknown:
+        parser.error(f"Ukuran tidak dikenal: {', '.join(unknown)}")
+
+    results = {}
+    for label in labels:
+        started = time.perf_counter()
+        results.update(run_size(label, SIZES[label], copy.deepcopy(config), args.repeat))
+        print(f"[{label}] {SIZES[label]} baris selesai dalam {time.perf_counter() - started:.1f}s")
+
+    report = {'environment': environment(), 'tolerance': args.tolerance, 'results': results}
+    baseline = None
+    if os.path.exists(args.baseline) and not args.update_baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        report['baseline_environment'] = baseline.get('environment')
+        report['comparison'] = compare(results, baseline.get('results', {}), args.tolerance)
+
+    print(f"\n{'metric':<34}{'current':>14}{'baseline':>14}{'ratio':>9}")
+    comparison = {row['metric']: row for row in report.get('comparison', [])}
+    for key, value in results.items():
+        row = comparison.get(key)
+        if row:
+            flag = '  REGRESI' if row['regression'] else ''
+            print(f"{key:<34}{value:>14.3f}{row['baseline']:>14.3f}{row['ratio']:>9.2f}{flag}")
+        else:
+            print(f"{key:<34}{value:>14.3f}{'-':>14}{'-':>9}")
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nHasil disimpan ke {args.output}")
+    if args.update_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump({'environment': report['environment'], 'results': results}, f, indent=2)
+        print(f"Baseline diperbarui: {args.baseline}")
+
+    regressions = [row for row in report.get('comparison', []) if row['regression']]
+    if regressions:
+        print(f"{len(regressions)} metrik melambat lebih dari {args.tolerance:.0%} dibanding baseline.")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
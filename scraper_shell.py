@@ -19,7 +19,8 @@ if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
 from src.rl_agent.realtime_agent import RealtimeAgent
-from src.rl_agent.gemini_predictor import GeminiPredictor
+from src.rl_agent.predictors import PREDICTOR_CHOICES, create_predictor
+from src.utils.scraping import BROWSER_PROFILES
 
 class ShellScraper:
     """Shell-based scraper that works without GUI."""
@@ -31,10 +32,10 @@ class ShellScraper:
         self.gemini_predictor = None
         if gemini_model:
             try:
-                self.gemini_predictor = GeminiPredictor(model_name=gemini_model)
-                logging.info(f"GeminiPredictor initialized with model: {gemini_model}")
+                self.gemini_predictor = create_predictor(gemini_model, config)
+                logging.info(f"Predictor initialized: {self.gemini_predictor.name} (requested: {gemini_model})")
             except Exception as e:
-                logging.error(f"Failed to initialize GeminiPredictor: {e}")
+                logging.error(f"Failed to initialize predictor '{gemini_model}': {e}")
                 self.gemini_predictor = None
 
     def setup_logging(self):
@@ -151,9 +152,9 @@ class ShellScraper:
                 logging.info(f"Queue update: {item}")
                 if isinstance(item, dict) and item.get('type') == 'new_data' and self.predictor:
                     data = item.get('data')
-                    logging.info(f"New data received: {data}. Requesting prediction from Gemini...")
+                    logging.info(f"New data received: {data}. Requesting report from predictor '{self.predictor.name}'...")
                     report = self.predictor.generate_holistic_report(str(data))
-                    print("\n--- GEMINI HOLISTIC REPORT ---")
+                    print("\n--- PREDICTOR HOLISTIC REPORT ---")
                     print(report)
                     print("----------------------------\n")
 
@@ -161,7 +162,8 @@ class ShellScraper:
         
         try:
             logging.info("Initializing RealtimeAgent...")
-            self.agent = RealtimeAgent(self.config, mock_queue, phone=phone, password=password)
+            self.agent = RealtimeAgent(self.config, mock_queue, phone=phone, password=password,
+                                       gemini_predictor=self.gemini_predictor)
             
             logging.info("Starting live scrape operation...")
             self.agent.run_live_scrape()
@@ -258,17 +260,21 @@ def main():
                        help='Scraping mode: bulk (one-time), live (continuous), or fetch (external data)')
     parser.add_argument('--phone', help='Phone number for login')
     parser.add_argument('--password', help='Password for login')
-    parser.add_argument('--model', choices=['gemini-2.5-flash', 'gemini-2.5-pro'], default=None,
-                       help='Enable Gemini AI prediction with the specified model.')
+    parser.add_argument('--model', choices=PREDICTOR_CHOICES, default=None,
+                       help="Enable prediction: 'stats' (local statistical engine) or a Gemini model.")
     parser.add_argument('--url', help='URL to fetch data from (for fetch mode)')
     parser.add_argument('--method', choices=['GET', 'POST'], default='GET',
                        help='HTTP method for fetch mode')
+    parser.add_argument('--browser-profile', choices=sorted(BROWSER_PROFILES),
+                       help='Override web_agent.browser.profile (lean = headless, no images/fonts/media)')
     
     args = parser.parse_args()
     
     # Load configuration
     print("Loading configuration...")
     config = load_config()
+    if args.browser_profile:
+        config['web_agent'].setdefault('browser', {})['profile'] = args.browser_profile
     
     # Initialize scraper
     print("Initializing scraper...")
@@ -0,0 +1,129 @@
+import json
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from src.utils.scraping import process_api_response
+
+# Header yang tidak boleh disalin apa adanya dari permintaan browser.
+_DROPPED_HEADERS = {'content-length', 'host', 'connection', 'accept-encoding'}
+
+
+class RateLimiter:
+    """Pembatas laju sederhana yang aman untuk thread: jarak minimum antar permintaan."""
+    def __init__(self, requests_per_second):
+        self.min_interval = 1.0 / requests_per_second if requests_per_second and requests_per_second > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def wait(self):
+        if not self.min_interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.min_interval
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+
+class _CapturedResponse:
+    """Adapter agar respons `requests` dapat didekode oleh `process_api_response`."""
+    def __init__(self, body, headers):
+        self.response = self
+        self.body = body
+        self.headers = headers
+
+
+class HistoryApiClient:
+    """
+    Mengambil halaman riwayat `GetNoaverageEmerdList` langsung dari Python.
+
+    Klien memakai permintaan API pertama yang ditangkap selenium-wire sebagai
+    templat: URL, header otorisasi, dan body JSON disalin, lalu hanya nomor
+    halaman yang diganti (nama field diatur oleh `scraping.api_page_field`).
+    Cookie sesi browser ikut disalin ke session HTTP yang memakai connection
+    pool, dengan konkurensi terbatas dan rate limit yang dapat diatur.
+    """
+    def __init__(self, template_request, scraping_config=None, cookies=None):
+        scraping_config = scraping_config or {}
+        self.url = template_request.url
+        self.method = template_request.method or 'POST'
+        self.headers = {k: v for k, v in template_request.headers.items() if k.lower() not in _DROPPED_HEADERS}
+        # Respons dibaca mentah dan didekode oleh process_api_response (zstd atau teks biasa).
+        self.headers['Accept-Encoding'] = 'zstd'
+        self.payload = json.loads(template_request.body.decode('utf-8')) if template_request.body else {}
+        self.page_field = scraping_config.get('api_page_field', 'pageNo')
+        self.concurrency = max(int(scraping_config.get('api_concurrency', 4)), 1)
+        self.timeout = scraping_config.get('api_request_timeout', 15)
+        self.rate_limiter = RateLimiter(scraping_config.get('api_requests_per_second', 10))
+
+        self.session = requests.Session()
+        # Permintaan halaman berupa POST: hanya kegagalan koneksi dan status di status_forcelist
+        # yang diulang. read=0 agar POST yang mungkin sudah diproses server tidak dikirim ulang.
+        retry = Retry(total=scraping_config.get('api_max_retries', 3), read=0, backoff_factor=0.5,
+                      status_forcelist=(429, 500, 502, 503, 504), allowed_methods=None)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.concurrency, max_retries=retry)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        for cookie in cookies or []:
+            self.session.cookies.set(cookie['name'], cookie['value'], domain=cookie.get('domain'), path=cookie.get('path', '/'))
+
+    @classmethod
+    def from_driver(cls, driver, api_endpoint, scraping_config=None):
+        """Membuat klien dari permintaan API terbaru yang ditangkap oleh driver, atau None."""
+        template = next((req for req in reversed(driver.requests) if api_endpoint in req.url and req.body), None)
+        if template is None:
+            return None
+        try:
+            cookies = driver.get_cookies()
+        except Exception:
+            cookies = []
+        return cls(template, scraping_config, cookies)
+
+    def fetch_page(self, page_no):
+        """Mengambil satu halaman riwayat. Mengembalikan daftar rekaman (kosong jika gagal)."""
+        payload = dict(self.payload)
+        payload[self.page_field] = page_no
+        self.rate_limiter.wait()
+        try:
+            response = self.session.request(self.method, self.url, json=payload, headers=self.headers,
+                                            timeout=self.timeout, stream=True)
+            with response:
+                response.raise_for_status()
+                body = response.raw.read(decode_content=False)
+        except requests.RequestException as e:
+            logging.error(f"Permintaan API langsung untuk halaman {page_no} gagal: {e}")
+            return []
+        return process_api_response(_CapturedResponse(body, response.headers))
+
+    def fetch_pages(self, page_numbers, on_page=None):
+        """
+        Mengambil banyak halaman secara konkuren.
+
+        Args:
+            page_numbers (iterable): Nomor halaman yang akan diambil.
+            on_page (callable, optional): Dipanggil dengan (page_no, records) setiap halaman selesai.
+
+        Returns:
+            dict: Pemetaan nomor halaman ke daftar rekaman.
+        """
+        results = {}
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            futures = {executor.submit(self.fetch_page, page_no): page_no for page_no in page_numbers}
+            for future in as_completed(futures):
+                page_no = futures[future]
+                records = future.result()
+                results[page_no] = records
+                if on_page:
+                    on_page(page_no, records)
+        return results
+
+    def close(self):
+        self.session.close()
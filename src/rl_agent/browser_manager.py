@@ -1,11 +1,12 @@
 import logging
 import time
 import os
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
-from src.utils.scraping import setup_driver, handle_popups
+from src.rl_agent.session_cache import SessionCache
+from src.rl_agent.ui_state import SelectorRegistry
+from src.utils.scraping import (BrowserProfile, CapturePolicy, WaitEngine, browser_resource_usage, setup_driver,
+                                handle_popups)
 
 class BrowserManager:
     """
@@ -18,28 +19,56 @@ class BrowserManager:
         self.timeouts = self.web_agent_config.get('timeouts', {})
         self.timers = self.web_agent_config.get('timers', {})
         self.xpaths = self.web_agent_config.get('xpaths', {})
+        self.selectors = SelectorRegistry.from_config(self.xpaths)
         self.login_url = self.web_agent_config.get('login_url')
+        self.session_cache = SessionCache.from_config(self.web_agent_config)
+        self.session_ready = False
         self.driver = None
+        self.waits = None
 
     def _get_selector(self, category, name):
-        """Helper untuk mendapatkan By dan Value selector dari config."""
-        try:
-            selector_config = self.xpaths[category][name]
-            by_str = selector_config.get('by', 'XPATH').upper()
-            by = getattr(By, by_str)
-            value = selector_config.get('value')
-            return by, value
-        except KeyError:
+        """Helper untuk mendapatkan By dan Value selector dari registry yang dikompilasi dari config."""
+        locator = self.selectors.get(category, name)
+        if locator is None:
             logging.error(f"Selector untuk '{category}.{name}' tidak ditemukan di config.yaml.")
             return None, None
+        return locator
 
     def initialize_driver(self):
         """Menginisialisasi instance webdriver Selenium."""
         logging.info("Initializing Selenium WebDriver...")
-        self.driver = setup_driver(is_realtime=True)
+        capture_loopback = self.web_agent_config.get('mock_api', {}).get('enabled', False)
+        self.driver = setup_driver(is_realtime=True, capture_loopback=capture_loopback,
+                                   capture_policy=CapturePolicy.from_config(self.web_agent_config),
+                                   browser_profile=BrowserProfile.from_config(self.web_agent_config),
+                                   user_data_dir=self.session_cache.user_data_dir if self.session_cache.enabled else None)
         self.driver.set_page_load_timeout(self.timeouts.get('page_load', 60))
+        self.waits = WaitEngine.from_config(self.driver, self.web_agent_config)
         return self.driver
 
+    def start_session(self, phone=None, password=None):
+        """
+        Membawa browser ke halaman game dalam keadaan login.
+
+        Sesi tersimpan (web_agent.session_cache) dicoba lebih dulu; login penuh,
+        penanganan pop-up, dan navigasi menu hanya dilakukan jika sesi tersebut
+        tidak ada atau ditolak. Setelah login penuh berhasil, state sesi disimpan.
+        """
+        started = time.monotonic()
+        login_by, login_val = self._get_selector('login', 'user_input')
+        game_by, game_val = self._get_selector('game_interface', 'period_display')
+        if self.session_cache.resume(self.driver, (game_by, game_val), (login_by, login_val)):
+            self.session_ready = True
+            return True
+        if not self.login(phone=phone, password=password) or not self.navigate_to_game():
+            self.waits.log_summary("Waktu tunggu start sesi (gagal)")
+            return False
+        self.session_ready = True
+        if self.session_cache.enabled:
+            self.session_cache.save(self.driver)
+        self.waits.log_summary(f"Start sesi {time.monotonic() - started:.1f}s, waktu tunggu")
+        return True
+
     def login(self, phone=None, password=None):
         """Menangani proses login ke situs web."""
         try:
@@ -58,15 +87,17 @@ class BrowserManager:
             pass_by, pass_val = self._get_selector('login', 'password_input')
             submit_by, submit_val = self._get_selector('login', 'submit_button')
 
-            WebDriverWait(self.driver, self.timeouts.get('element_wait', 30)).until(EC.presence_of_element_located((user_by, user_val)))
-            self.driver.find_element(user_by, user_val).send_keys(login_phone)
+            user_input = self.waits.until('login.form', EC.presence_of_element_located((user_by, user_val)))
+            user_input.send_keys(login_phone)
             self.driver.find_element(pass_by, pass_val).send_keys(login_password)
             self.driver.find_element(submit_by, submit_val).click()
             
             logging.info("Login terkirim. Menunggu navigasi...")
-            time.sleep(self.timers.get('post_login_sleep', 3))
-            handle_popups(self.driver, self.xpaths, self.timers)
-            time.sleep(self.timers.get('post_action_sleep', 1)) # Extra delay after login
+            # Login selesai saat SPA meninggalkan form login (URL berubah atau input hilang).
+            self.waits.until('login.submit', EC.any_of(EC.url_changes(self.driver.current_url),
+                                                       EC.invisibility_of_element(user_input)),
+                             timeout=self.timers.get('post_login_sleep', 3), required=False)
+            handle_popups(self.driver, self.xpaths, self.timers, waits=self.waits)
             return True
         except (TimeoutException, NoSuchElementException) as e:
             logging.error(f"Elemen login tidak ditemukan atau waktu tunggu habis: {e}", exc_info=True)
@@ -79,20 +110,19 @@ class BrowserManager:
         """Menavigasi dari halaman utama ke game Win Go 1Min."""
         try:
             logging.info("Menavigasi ke game 'Win Go 1Min'...")
-            handle_popups(self.driver, self.xpaths, self.timers)
+            handle_popups(self.driver, self.xpaths, self.timers, waits=self.waits)
             
             menu_by, menu_val = self._get_selector('navigation', 'win_go_menu')
             btn_by, btn_val = self._get_selector('navigation', 'win_go_1min_button')
+            period_by, period_val = self._get_selector('game_interface', 'period_display')
 
-            win_go_menu = WebDriverWait(self.driver, self.timeouts.get('element_wait', 20)).until(EC.element_to_be_clickable((menu_by, menu_val)))
+            win_go_menu = self.waits.until('navigate.menu', EC.element_to_be_clickable((menu_by, menu_val)))
             self.driver.execute_script("arguments[0].click();", win_go_menu)
-            time.sleep(self.timers.get('post_action_sleep', 1))
-            
-            # Extra delay before clicking the 1min button
-            time.sleep(self.timers.get('post_action_sleep', 1))
 
-            win_go_1min_button = WebDriverWait(self.driver, self.timeouts.get('element_wait', 20)).until(EC.element_to_be_clickable((btn_by, btn_val)))
+            # Tombol 1Min baru dapat diklik setelah daftar game terbuka.
+            win_go_1min_button = self.waits.until('navigate.game_button', EC.element_to_be_clickable((btn_by, btn_val)))
             self.driver.execute_script("arguments[0].click();", win_go_1min_button)
+            self.waits.until('navigate.game_page', EC.visibility_of_element_located((period_by, period_val)), required=False)
             
             logging.info("Berhasil menavigasi ke 'Win Go 1Min'.")
             return True
@@ -111,13 +141,15 @@ class BrowserManager:
             my_acc_by, my_acc_val = self._get_selector('navigation', 'my_account_button')
             logout_by, logout_val = self._get_selector('navigation', 'logout_button')
 
-            my_account_button = WebDriverWait(self.driver, 10).until(EC.element_to_be_clickable((my_acc_by, my_acc_val)))
+            user_by, user_val = self._get_selector('login', 'user_input')
+
+            my_account_button = self.waits.until('logout.account', EC.element_to_be_clickable((my_acc_by, my_acc_val)), timeout=10)
             my_account_button.click()
-            time.sleep(self.timers.get('post_action_sleep', 1))
 
-            logout_button = WebDriverWait(self.driver, 10).until(EC.element_to_be_clickable((logout_by, logout_val)))
+            logout_button = self.waits.until('logout.button', EC.element_to_be_clickable((logout_by, logout_val)), timeout=10)
             logout_button.click()
-            time.sleep(self.timers.get('api_retry_delay', 2))
+            self.waits.until('logout.done', EC.presence_of_element_located((user_by, user_val)),
+                             timeout=self.timers.get('api_retry_delay', 2), required=False)
             
             logging.info("Logout berhasil.")
             return True
@@ -128,6 +160,10 @@ class BrowserManager:
             logging.error(f"Tidak dapat melakukan logout bersih: {e}", exc_info=True)
             return False
 
+    def resource_usage(self):
+        """RSS dan waktu CPU proses browser (None jika driver tidak aktif atau psutil tidak tersedia)."""
+        return browser_resource_usage(self.driver) if self.driver else None
+
     def get_driver(self):
         """Mengembalikan instance driver yang aktif."""
         return self.driver
@@ -135,6 +171,17 @@ class BrowserManager:
     def close(self):
         """Menutup webdriver."""
         if self.driver:
-            logging.info("Menutup WebDriver.")
+            usage = self.resource_usage()
+            if usage:
+                logging.info(f"Menutup WebDriver ({usage['processes']} proses, RSS {usage['rss_mb']:.0f} MB, "
+                             f"CPU {usage['cpu_seconds']:.1f}s).")
+            else:
+                logging.info("Menutup WebDriver.")
+            # Simpan ulang agar token yang diperbarui selama sesi ikut tersimpan.
+            if self.session_ready and self.session_cache.enabled:
+                self.session_cache.save(self.driver)
+            self.session_ready = False
+            if self.waits:
+                self.waits.save_timings()
             self.driver.quit()
             self.driver = None
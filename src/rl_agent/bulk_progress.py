@@ -0,0 +1,183 @@
+import json
+import logging
+import os
+import time
+
+import numpy as np
+
+from src.rl_agent.data_store import records_to_batch
+from src.rl_agent.records import ResultBatch
+
+# Satu baris hasil di file pending checkpoint (14 byte, sama dengan ResultBatch).
+_PENDING_DTYPE = np.dtype([('period', '<i8'), ('number', 'u1'), ('color', 'u1'), ('premium', '<i4')])
+
+
+class BulkScrapeProgress:
+    """
+    Melacak progres bulk scrape halaman demi halaman.
+
+    - Watermark: Period terbesar di store saat run dimulai. Begitu satu halaman
+      seluruhnya lebih lama dari watermark, halaman berikutnya pasti sudah
+      tersimpan sehingga scraping dapat berhenti lebih awal.
+    - Checkpoint: setiap `checkpoint_every` halaman, baris yang terkumpul
+      ditambahkan ke file pending di samping checkpoint (`<checkpoint>.rows`,
+      array biner append-only) dan nomor halaman berikutnya serta jumlah baris
+      pending disimpan ke file JSON. Run yang terputus dapat dilanjutkan dari
+      halaman tersebut dengan watermark dan baris pending yang sama.
+    - Merge: halaman datang dari terbaru ke terlama, jadi setiap flush ke store
+      di tengah run akan menyisipkan baris lama dan menulis ulang seluruh
+      riwayat. Karena itu store hanya diubah sekali, oleh `complete`, dengan
+      seluruh baris pending sekaligus.
+    """
+    def __init__(self, history_store, checkpoint_path, checkpoint_every=10, stop_at_watermark=True):
+        self.history_store = history_store
+        self.checkpoint_path = checkpoint_path
+        self.pending_path = os.path.splitext(checkpoint_path)[0] + '.rows'
+        self.checkpoint_every = max(int(checkpoint_every), 1)
+        self.stop_at_watermark = stop_at_watermark
+        self.watermark = None
+        self.last_page = None
+        self.pages_done = 0
+        self.records_seen = 0
+        self.rows_changed = 0
+        self.reached_watermark = False
+        self._pending = []
+        self._pending_rows = 0  # baris yang sudah tercatat di file pending
+        self._pages_since_flush = 0
+
+    def begin(self, last_page):
+        """
+        Memulai atau melanjutkan run.
+
+        Returns:
+            int: Nomor halaman pertama yang harus diambil setelah halaman 1.
+        """
+        self.last_page = last_page
+        state = self._load_checkpoint()
+        if state and not self._pending_file_valid(int(state.get('pending_rows', 0))):
+            logging.warning(f"File pending '{self.pending_path}' hilang atau terpotong. Memulai bulk scrape dari awal.")
+            state = None
+        if state:
+            self._pending_rows = int(state.get('pending_rows', 0))
+            self.watermark = state.get('watermark')
+            start_page = int(state.get('next_page', 2))
+            logging.info(f"Checkpoint ditemukan. Melanjutkan bulk scrape dari halaman {start_page} (watermark {self.watermark}).")
+            return max(start_page, 2)
+        self.watermark = self.history_store.high_water_mark
+        logging.info(f"Memulai bulk scrape baru. Watermark store: {self.watermark}")
+        return 2
+
+    def accept(self, page_no, records):
+        """
+        Menerima rekaman satu halaman.
+
+        Returns:
+            bool: False jika scraping sebaiknya berhenti karena watermark telah tercapai.
+        """
+        # Halaman didekode ke kolom sekali; flush cukup menggabungkan array.
+        page = records_to_batch(records)
+        self._pending.append(page)
+        self.pages_done += 1
+        self.records_seen += len(records)
+        self._pages_since_flush += 1
+
+        if self.stop_at_watermark and self._page_below_watermark(page):
+            logging.info(f"Halaman {page_no} seluruhnya lebih lama dari watermark {self.watermark}. Menghentikan scraping lebih awal.")
+            self.reached_watermark = True
+            return False
+
+        if self._pages_since_flush >= self.checkpoint_every:
+            self.flush(next_page=page_no + 1)
+        return True
+
+    def flush(self, next_page=None):
+        """Menambahkan baris tertunda ke file pending (bukan ke store) dan memperbarui checkpoint."""
+        if self._pending:
+            rows = ResultBatch.concat(self._pending)
+            if len(rows):
+                self._append_pending(rows)
+            self._pending = []
+        self._pages_since_flush = 0
+        if next_page is not None:
+            self._save_checkpoint(next_page)
+
+    def complete(self):
+        """Menggabungkan seluruh baris pending ke store sekali, lalu menghapus checkpoint dan file pending."""
+        batches = [self._read_pending()] + self._pending
+        rows = ResultBatch.concat(batches)
+        if len(rows):
+            changed_df = self.history_store.ingest(rows)
+            self.rows_changed += len(changed_df)
+        self._pending = []
+        self._pending_rows = 0
+        self._pages_since_flush = 0
+        for path in (self.checkpoint_path, self.pending_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def abort(self, next_page):
+        """Menyimpan baris yang sudah didapat ke file pending dan checkpoint agar run dapat dilanjutkan."""
+        self.flush(next_page=next_page)
+        logging.warning(f"Bulk scrape terputus. Checkpoint disimpan: lanjutkan dari halaman {next_page} "
+                        f"({self._pending_rows} baris pending).")
+
+    def _append_pending(self, batch):
+        rows = np.empty(len(batch), dtype=_PENDING_DTYPE)
+        for name in _PENDING_DTYPE.names:
+            rows[name] = getattr(batch, name)
+        directory = os.path.dirname(self.pending_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Byte setelah jumlah baris di checkpoint (sisa penulisan terputus) ditimpa.
+        with open(self.pending_path, 'r+b' if self._pending_rows else 'wb') as f:
+            f.seek(self._pending_rows * _PENDING_DTYPE.itemsize)
+            f.truncate()
+            f.write(rows.tobytes())
+        self._pending_rows += len(rows)
+
+    def _read_pending(self):
+        if not self._pending_rows:
+            return ResultBatch.empty()
+        rows = np.fromfile(self.pending_path, dtype=_PENDING_DTYPE, count=self._pending_rows)
+        return ResultBatch(rows['period'], rows['number'], rows['color'], rows['premium'])
+
+    def _pending_file_valid(self, pending_rows):
+        if not pending_rows:
+            return True
+        try:
+            return os.path.getsize(self.pending_path) >= pending_rows * _PENDING_DTYPE.itemsize
+        except OSError:
+            return False
+
+    def _page_below_watermark(self, page):
+        if self.watermark is None:
+            return False
+        if len(page) == 0:
+            return False
+        return int(page.period.max()) <= self.watermark
+
+    def _load_checkpoint(self):
+        try:
+            with open(self.checkpoint_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (json.JSONDecodeError, OSError) as e:
+            logging.warning(f"Checkpoint '{self.checkpoint_path}' tidak dapat dibaca ({e}). Memulai dari awal.")
+            return None
+
+    def _save_checkpoint(self, next_page):
+        state = {
+            'next_page': next_page,
+            'last_page': self.last_page,
+            'pending_rows': self._pending_rows,
+            'watermark': self.watermark,
+            'updated_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+        }
+        directory = os.path.dirname(self.checkpoint_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = self.checkpoint_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.checkpoint_path)
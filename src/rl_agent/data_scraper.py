@@ -1,13 +1,23 @@
 import logging
 import time
-import pandas as pd
-import numpy as np
 import os
 from selenium.webdriver.common.by import By
+from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
-from src.utils.scraping import process_api_response
+from src.utils.scraping import handle_popups, process_api_response
+from src.utils.storage import storage_from_config
+from src.rl_agent.data_store import HistoryStore, records_to_batch
+from src.rl_agent.records import ResultBatch, WIN_GO_1MIN
+from src.rl_agent.api_client import HistoryApiClient
+from src.rl_agent.bulk_progress import BulkScrapeProgress
+from src.rl_agent.prediction_worker import PredictionWorker
+from src.rl_agent.feature_store import FeatureStore
+from src.rl_agent.page_fetch import InPageFetcher
+from src.rl_agent.period_scheduler import PeriodScheduler
+from src.rl_agent.response_feed import ResponseFeed
+from src.rl_agent.ui_state import SelectorRegistry, take_snapshot
 
 class DataScraper:
     """
@@ -15,6 +25,7 @@ class DataScraper:
     baik dari UI maupun dengan mencegat panggilan API.
     """
     def __init__(self, driver, config, gemini_predictor=None):
+        # `gemini_predictor` boleh berupa Predictor apa pun (lihat src/rl_agent/predictors.py).
         self.driver = driver
         self.config = config
         self.gemini_predictor = gemini_predictor
@@ -22,21 +33,53 @@ class DataScraper:
         self.timeouts = self.web_agent_config.get('timeouts', {})
         self.timers = self.web_agent_config.get('timers', {})
         self.xpaths = self.web_agent_config.get('xpaths', {})
+        self.selectors = SelectorRegistry.from_config(self.xpaths)
         self.api_endpoint = self.web_agent_config.get('api_endpoint')
+        # Hook opsional (request, new_rows) setelah data live tersimpan; dipakai harness replay/benchmark.
+        self.on_ingest = None
+        self.prediction_worker = None
+        self.response_feed = None
+        self.scheduler = None
+        self.page_fetcher = None
+
+    def _ensure_response_feed(self):
+        """
+        Memasang ResponseFeed (interceptor selenium-wire) jika
+        `scraping.capture_mode` adalah 'interceptor' dan driver mendukungnya.
+        Mengembalikan None untuk mode 'poll' (del requests + wait_for_request).
+        """
+        if self.response_feed is None:
+            scraping_config = self.web_agent_config.get('scraping', {})
+            if scraping_config.get('capture_mode', 'interceptor') == 'interceptor' and hasattr(self.driver, 'response_interceptor'):
+                self.response_feed = ResponseFeed.attach(self.driver, self.api_endpoint,
+                                                         scraping_config.get('interceptor_queue_size', 256))
+                logging.info("Capture respons API: mode interceptor (push).")
+        return self.response_feed
+
+    def _release_response_feed(self):
+        if self.response_feed is not None:
+            logging.info(f"Statistik capture interceptor: {self.response_feed.stats()}")
+            ResponseFeed.detach(self.driver)
+            self.response_feed = None
 
     def _get_selector(self, category, name):
-        """Helper untuk mendapatkan By dan Value selector dari config."""
-        try:
-            selector_config = self.xpaths[category][name]
-            by_str = selector_config.get('by', 'XPATH').upper()
-            by = getattr(By, by_str)
-            value = selector_config.get('value')
-            if by is None or value is None:
-                raise KeyError
-            return by, value
-        except KeyError:
+        """Helper untuk mendapatkan By dan Value selector dari registry yang dikompilasi dari config."""
+        locator = self.selectors.get(category, name)
+        if locator is None:
             logging.error(f"Selector untuk '{category}.{name}' tidak ditemukan di config.yaml.")
             return (By.XPATH, "//invalid-xpath")  # Return a safe default
+        return locator
+
+    def snapshot(self):
+        """
+        Timer, period, saldo, dan status pop-up dalam satu panggilan execute_script
+        (lihat src/rl_agent/ui_state.py). None jika terjadi error WebDriver.
+        """
+        try:
+            return take_snapshot(self.driver, self.selectors)
+        except WebDriverException as e:
+            logging.warning(f"Tidak dapat mengambil snapshot UI: {e}")
+            return None
 
     def scrape_latest_result(self):
         """
@@ -45,23 +88,29 @@ class DataScraper:
         """
         logging.info("Menunggu untuk menangkap hasil game terbaru dari API...")
         try:
-            del self.driver.requests
-            request = self.driver.wait_for_request(self.api_endpoint, timeout=self.timeouts.get('api_wait', 15))
-            response_records = process_api_response(request)
+            response_feed = self._ensure_response_feed()
+            if response_feed:
+                captured = response_feed.latest(timeout=self.timeouts.get('api_wait', 15))
+                if captured is None:
+                    raise TimeoutException(f"Tidak ada respons '{self.api_endpoint}' dari interceptor.")
+                response_feed.mark_ingested(captured)
+                response_records = captured.records
+            else:
+                del self.driver.requests
+                request = self.driver.wait_for_request(self.api_endpoint, timeout=self.timeouts.get('api_wait', 15))
+                response_records = process_api_response(request)
             if not response_records:
                 logging.warning("Panggilan API dicegat tetapi tidak ada catatan yang ditemukan.")
                 return None
             
-            latest_record = response_records[0]
-            df = pd.DataFrame([latest_record])
-            df.rename(columns={'issueNumber': 'Period', 'number': 'Number'}, inplace=True)
+            latest = ResultBatch.from_records(response_records[:1])
             
             # Filter untuk memastikan hanya game '10001' yang diproses
-            if '10001' not in str(df['Period'].iloc[0]):
-                logging.info(f"Mendapatkan hasil dari game yang tidak relevan (Periode: {df['Period'].iloc[0]}). Mengabaikan.")
+            if latest.game_code[0] != WIN_GO_1MIN:
+                logging.info(f"Mendapatkan hasil dari game yang tidak relevan (Periode: {latest.period[0]}). Mengabaikan.")
                 return None
 
-            df['Number'] = pd.to_numeric(df['Number'])
+            df = latest.to_frame()
             logging.info(f"Berhasil scrape hasil terbaru: Periode {df['Period'].iloc[0]}, Nomor {df['Number'].iloc[0]}")
             return df[['Period', 'Number']]
         except TimeoutException:
@@ -74,87 +123,44 @@ class DataScraper:
     def get_current_balance(self, refresh=False):
         """Scrape saldo akun saat ini dari UI, dengan opsi untuk me-refresh."""
         try:
-            cont_by, cont_val = self._get_selector('game_interface', 'balance_container')
-            if not cont_by or not cont_val:
-                raise NoSuchElementException("Selector for balance_container is invalid.")
-            balance_container = WebDriverWait(self.driver, 10).until(EC.presence_of_element_located((cont_by, cont_val)))
-
             if refresh:
                 logging.info("Me-refresh saldo...")
+                cont_by, cont_val = self._get_selector('game_interface', 'balance_container')
                 ref_by, ref_val = self._get_selector('game_interface', 'balance_refresh_button')
-                if not ref_by or not ref_val:
-                    raise NoSuchElementException("Selector for balance_refresh_button is invalid.")
+                balance_container = WebDriverWait(self.driver, 10).until(EC.presence_of_element_located((cont_by, cont_val)))
                 refresh_button = WebDriverWait(balance_container, 10).until(EC.element_to_be_clickable((ref_by, ref_val)))
                 self.driver.execute_script("arguments[0].click();", refresh_button)
                 time.sleep(self.timers.get('post_action_sleep', 1))
-
-            val_by, val_val = self._get_selector('game_interface', 'balance_value')
-            if not val_by or not val_val:
-                raise NoSuchElementException("Selector for balance_value is invalid.")
-            balance_element = balance_container.find_element(val_by, val_val)
-            balance_text = balance_element.text.replace('Rp', '').replace(',', '').strip()
-            return float(balance_text)
         except (TimeoutException, NoSuchElementException):
-            logging.warning("Tidak dapat menemukan elemen saldo atau waktu tunggu habis.")
-            return None
-        except (ValueError, TypeError) as e:
-            logging.error(f"Gagal mem-parsing nilai saldo. Teks yang ditemukan tidak valid. Error: {e}")
-            return None
+            logging.warning("Tidak dapat menemukan tombol refresh saldo atau waktu tunggu habis.")
         except WebDriverException as e:
-            logging.warning(f"Tidak dapat scrape saldo saat ini karena error WebDriver: {e}")
+            logging.warning(f"Tidak dapat me-refresh saldo karena error WebDriver: {e}")
+
+        snapshot = self.snapshot()
+        if snapshot is None or snapshot.balance is None:
+            logging.warning("Tidak dapat menemukan elemen saldo.")
             return None
+        return snapshot.balance
 
     def get_predicting_period(self):
         """Scrape nomor periode untuk game yang akan datang."""
-        try:
-            by, val = self._get_selector('game_interface', 'period_display')
-            if not by or not val:
-                raise NoSuchElementException("Selector for period_display is invalid.")
-            period_element = self.driver.find_element(by, val)
-            return period_element.text.strip()
-        except NoSuchElementException:
+        snapshot = self.snapshot()
+        if snapshot is None or snapshot.period is None:
             logging.warning("Tidak dapat menemukan elemen periode prediksi.")
             return "Predicting..."
-        except WebDriverException as e:
-            logging.warning(f"Tidak dapat scrape periode prediksi: {e}")
-            return "Predicting..."
+        return str(snapshot.period)
 
     def get_current_timer(self):
         """Scrape nilai timer saat ini dari UI."""
-        try:
-            by, val = self._get_selector('game_interface', 'timer_display')
-            if not by or not val:
-                raise NoSuchElementException("Selector for timer_display is invalid.")
-            timer_element = self.driver.find_element(by, val)
-            return timer_element.text.strip()
-        except NoSuchElementException:
+        snapshot = self.snapshot()
+        if snapshot is None or snapshot.seconds_left is None:
             logging.warning("Tidak dapat menemukan elemen timer.")
             return "00:00"
-        except WebDriverException as e:
-            logging.error(f"Terjadi kesalahan WebDriver saat scrape timer: {e}")
-            return "00:00"
+        return snapshot.timer
 
     def _handle_post_login_popups(self):
         """Secara berulang mencari dan menutup semua pop-up 'Confirm' setelah login."""
-        logging.info("Checking for post-login pop-ups...")
-        max_popups_to_close = 10
-        popups_closed = 0
-        while popups_closed < max_popups_to_close:
-            try:
-                confirm_button_xpath = "//div[@class='promptBtn' and text()='Confirm']"
-                confirm_button = WebDriverWait(self.driver, 3).until(
-                    EC.element_to_be_clickable((By.XPATH, confirm_button_xpath))
-                )
-                logging.info(f"Found a 'Confirm' pop-up. Closing it (popup #{popups_closed + 1})...")
-                self.driver.execute_script("arguments[0].click();", confirm_button)
-                popups_closed += 1
-                time.sleep(1)
-            except TimeoutException:
-                logging.info("No more 'Confirm' pop-ups found.")
-                break
-            except Exception as e:
-                logging.error(f"An error occurred while handling pop-ups: {e}")
-                break
+        handle_popups(self.driver, self.xpaths, self.timers)
 
     def _get_total_pages_from_ui(self, default_pages=1):
         """Membaca jumlah total halaman dari elemen UI."""
@@ -170,6 +176,139 @@ class DataScraper:
             logging.error(f"Could not parse total pages from UI. Error: {e}. Defaulting to {default_pages} page(s).")
             return default_pages
 
+    def _ui_page_number(self):
+        """Nomor halaman riwayat yang sedang ditampilkan pager ('3/200' -> 3), atau None."""
+        try:
+            elements = self.driver.find_elements(*self._get_selector('history_interface', 'page_info'))
+            text = elements[0].text if elements else ''
+        except WebDriverException:
+            return None
+        head = text.split('/')[0].strip()
+        return int(head) if head.isdigit() else None
+
+    def _wait_for_ui_page(self, page_num, timeout=30):
+        """Menunggu hingga pager menampilkan halaman `page_num`; False jika timeout."""
+        try:
+            WebDriverWait(self.driver, timeout).until(lambda driver: self._ui_page_number() == page_num)
+            return True
+        except TimeoutException:
+            return False
+
+    def _jump_to_ui_page(self, page_num):
+        """
+        Lompat langsung ke halaman `page_num` lewat input nomor halaman pager
+        (`history_interface.page_input`), jika situs menyediakannya.
+
+        Returns:
+            bool: True jika pager kini menampilkan `page_num`.
+        """
+        locator = self.selectors.get('history_interface', 'page_input')
+        if locator is None:
+            return False
+        try:
+            page_input = self.driver.find_element(*locator)
+            page_input.clear()
+            page_input.send_keys(str(page_num), Keys.ENTER)
+        except WebDriverException as e:
+            logging.warning(f"Input nomor halaman tidak dapat dipakai ({e}). Melewati halaman satu per satu.")
+            return False
+        return self._wait_for_ui_page(page_num)
+
+    def _scrape_pages_via_ui(self, page_numbers, last_page, progress, start_page=2):
+        """
+        Paginasi klasik: klik tombol 'next' dan tunggu permintaan API untuk setiap halaman.
+
+        Saat melanjutkan checkpoint, pager dilompatkan langsung ke halaman sebelum
+        `start_page` jika input nomor halaman tersedia. Jika tidak, halaman sebelum
+        `start_page` tetap diklik tetapi hanya ditunggu hingga nomor halaman pager
+        berganti, tanpa menunggu dan memproses respons API.
+
+        Returns:
+            bool: True jika run selesai (halaman terakhir atau watermark tercapai), False jika terputus.
+        """
+        page_numbers = list(page_numbers)
+        if page_numbers and start_page > page_numbers[0]:
+            logging.info(f"Melanjutkan checkpoint dari halaman {start_page}...")
+            if self._jump_to_ui_page(start_page - 1):
+                page_numbers = [page_num for page_num in page_numbers if page_num >= start_page]
+        for page_num in page_numbers:
+            logging.info(f"Navigating to page {page_num}/{last_page}...")
+            del self.driver.requests
+            try:
+                next_button = WebDriverWait(self.driver, 10).until(
+                    EC.element_to_be_clickable((By.XPATH, "//div[contains(@class, 'GameRecord__C-foot-next')]"))
+                )
+                self.driver.execute_script("arguments[0].click();", next_button)
+            except TimeoutException:
+                logging.warning("Could not find or click the 'next' button. Stopping pagination.")
+                progress.abort(max(page_num, start_page))
+                return False
+
+            if page_num < start_page:
+                if not self._wait_for_ui_page(page_num):
+                    logging.error(f"Timed out waiting for the pager to show page {page_num}. Stopping.")
+                    progress.abort(start_page)
+                    return False
+                continue
+            try:
+                request = self.driver.wait_for_request(self.api_endpoint, timeout=30)
+                records_on_page = process_api_response(request)
+                if not records_on_page:
+                    logging.warning(f"No records processed from API response for page {page_num}.")
+                    continue
+                if not progress.accept(page_num, records_on_page):
+                    return True
+            except TimeoutException:
+                logging.error(f"Timed out waiting for API request on page {page_num}. Stopping.")
+                progress.abort(page_num)
+                return False
+        return True
+
+    def _scrape_pages_via_api(self, page_numbers, progress):
+        """
+        Mengambil halaman riwayat langsung dari API memakai sesi browser yang sudah login.
+        Halaman diambil per potongan secara konkuren lalu diproses berurutan, sehingga
+        watermark dan checkpoint tetap konsisten.
+
+        Returns:
+            bool | None: None jika permintaan langsung tidak tersedia (gunakan paginasi UI),
+                         True jika run selesai, False jika terputus.
+        """
+        scraping_config = self.web_agent_config.get('scraping', {})
+        client = HistoryApiClient.from_driver(self.driver, self.api_endpoint, scraping_config)
+        if client is None:
+            logging.warning("Templat permintaan API tidak ditemukan. Kembali ke paginasi UI.")
+            return None
+
+        try:
+            # Probe satu halaman terlebih dahulu untuk memastikan server menerima permintaan langsung.
+            first_page = page_numbers[0]
+            probe_records = client.fetch_page(first_page)
+            if not probe_records:
+                logging.warning("Server tidak menerima permintaan API langsung. Kembali ke paginasi UI.")
+                return None
+            if not progress.accept(first_page, probe_records):
+                return True
+
+            start = time.time()
+            rest = page_numbers[1:]
+            chunk_size = max(progress.checkpoint_every, client.concurrency)
+            for i in range(0, len(rest), chunk_size):
+                chunk = rest[i:i + chunk_size]
+                results = client.fetch_pages(chunk)
+                for page_no in chunk:
+                    records = results.get(page_no)
+                    if not records:
+                        logging.error(f"Halaman {page_no} gagal diambil via API. Stopping.")
+                        progress.abort(page_no)
+                        return False
+                    if not progress.accept(page_no, records):
+                        return True
+                logging.info(f"API pages {chunk[0]}-{chunk[-1]} diterima ({time.time() - start:.1f} detik).")
+            return True
+        finally:
+            client.close()
+
     def execute_bulk_scrape(self):
         """
         Menjalankan proses scraping data riwayat permainan secara lengkap dengan
@@ -249,91 +388,48 @@ class DataScraper:
 
             # TAHAP 3: SCRAPING DATA
             total_pages = self._get_total_pages_from_ui()
-            max_pages_to_scrape = self.web_agent_config.get('scraping', {}).get('max_pages', 300)
-            all_records = []
+            scraping_config = self.web_agent_config.get('scraping', {})
+            max_pages_to_scrape = scraping_config.get('max_pages', 300)
+            last_page = min(total_pages, max_pages_to_scrape)
+
+            output_csv_path = self.config['project_setup']['data_path']
+            history_store = HistoryStore(storage_from_config(self.config))
+            history_store.load()
+            progress = BulkScrapeProgress(
+                history_store,
+                scraping_config.get('checkpoint_path', 'data/bulk_scrape_checkpoint.json'),
+                checkpoint_every=scraping_config.get('checkpoint_every_pages', 10),
+                stop_at_watermark=scraping_config.get('stop_at_watermark', True),
+            )
+            start_page = progress.begin(last_page)
 
             logging.info("Processing data for the initial page (Page 1)...")
             try:
                 initial_request = next(req for req in reversed(self.driver.requests) if self.api_endpoint in req.url)
                 records_on_page = process_api_response(initial_request)
-                if records_on_page:
-                    all_records.extend(records_on_page)
             except StopIteration:
                 logging.critical("Could not find the initial API request for page 1. Aborting.")
                 return None
 
-            for page_num in range(2, min(total_pages, max_pages_to_scrape) + 1):
-                logging.info(f"Navigating to page {page_num}/{min(total_pages, max_pages_to_scrape)}...")
-                del self.driver.requests
-                try:
-                    next_button = WebDriverWait(self.driver, 10).until(
-                        EC.element_to_be_clickable((By.XPATH, "//div[contains(@class, 'GameRecord__C-foot-next')]"))
-                    )
-                    self.driver.execute_script("arguments[0].click();", next_button)
-                except TimeoutException:
-                    logging.warning("Could not find or click the 'next' button. Stopping pagination.")
-                    break
-
-                try:
-                    request = self.driver.wait_for_request(self.api_endpoint, timeout=30)
-                    records_on_page = process_api_response(request)
-                    if records_on_page:
-                        all_records.extend(records_on_page)
-                    else:
-                        logging.warning(f"No records processed from API response for page {page_num}.")
-                except TimeoutException:
-                    logging.error(f"Timed out waiting for API request on page {page_num}. Stopping.")
-                    break
-            
-            # TAHAP 4: PROSES DAN SIMPAN DATA
-            logging.info(f"Total records scraped via API: {len(all_records)}. Processing...")
-            if not all_records:
-                logging.warning("No records were scraped. Exiting.")
-                return None
-
-            df = pd.DataFrame(all_records)
-            df.rename(columns={'issueNumber': 'Period', 'number': 'Number', 'colour': 'Color', 'premium': 'Premium'}, inplace=True)
-            
-            # Filter utama untuk memastikan hanya data dari game '10001' yang diproses
-            df['Period'] = df['Period'].astype(str)
-            initial_count = len(df)
-            df = df[df['Period'].str.contains('10001', na=False)]
-            filtered_count = len(df)
-            logging.info(f"Memfilter data untuk game '10001'. {initial_count - filtered_count} dari {initial_count} record dihapus.")
-
-            if df.empty:
-                logging.warning("Tidak ada data untuk game '10001' yang ditemukan setelah pemfilteran.")
-                return None
-
-            df['Number'] = pd.to_numeric(df['Number'])
-            df['Big/Small'] = np.where(df['Number'] >= 5, 'Big', 'Small')
-            final_df = df[['Period', 'Number', 'Big/Small', 'Color', 'Premium']].copy()
-            final_df['Period'] = final_df['Period'].astype(str)
-            if isinstance(final_df, pd.DataFrame):
-                final_df = final_df.sort_values(by='Period', ascending=True).drop_duplicates(subset='Period', keep='last')
-
-            output_csv_path = self.config['project_setup']['data_path']
-            try:
-                existing_df = pd.read_csv(output_csv_path)
-                existing_df['Period'] = existing_df['Period'].astype(str)
-                if not isinstance(existing_df, pd.DataFrame):
-                    existing_df = pd.DataFrame(existing_df)
-                if not isinstance(final_df, pd.DataFrame):
-                    final_df = pd.DataFrame(final_df)
-                combined_df = pd.concat([existing_df, final_df], ignore_index=True)
-            except FileNotFoundError:
-                logging.info(f"'{output_csv_path}' not found. A new file will be created.")
-                if not isinstance(final_df, pd.DataFrame):
-                    combined_df = pd.DataFrame(final_df)
-                else:
-                    combined_df = final_df
-            
-            if isinstance(combined_df, pd.DataFrame):
-                combined_df = combined_df.drop_duplicates(subset='Period', keep='last')
-                combined_df = combined_df.sort_values(by='Period', ascending=True)
-                combined_df.to_csv(output_csv_path, index=False)
-            logging.info(f"SUCCESS: All {len(combined_df)} unique records have been saved to '{output_csv_path}'")
-            return combined_df
+            completed = True
+            reached_watermark = bool(records_on_page) and not progress.accept(1, records_on_page)
+            if not reached_watermark and start_page <= last_page:
+                completed = None
+                if scraping_config.get('bulk_mode', 'ui') == 'api':
+                    completed = self._scrape_pages_via_api(list(range(start_page, last_page + 1)), progress)
+                if completed is None:
+                    completed = self._scrape_pages_via_ui(list(range(2, last_page + 1)), last_page, progress, start_page)
+
+            # TAHAP 4: SIMPAN DATA TERSISA
+            if completed:
+                progress.complete()
+            logging.info(
+                f"Bulk scrape: {progress.pages_done} halaman, {progress.records_seen} records diterima, "
+                f"{progress.rows_changed} baris baru atau terkoreksi"
+                f"{' (berhenti di watermark)' if progress.reached_watermark else ''}."
+            )
+            logging.info(f"SUCCESS: All {history_store.row_count} unique records have been saved to '{output_csv_path}'")
+            return history_store.frame()
 
         except Exception as e:
             logging.critical(f"An unrecoverable error occurred during the scraping process: {e}", exc_info=True)
@@ -348,6 +444,22 @@ class DataScraper:
             except Exception as nav_e:
                 logging.warning(f"Could not navigate back to the main game page: {nav_e}")
 
+    def _save_prediction(self, prediction_path, period, prediction_result):
+        """Callback worker prediksi: menyimpan dan menampilkan hasil prediksi."""
+        with open(prediction_path, "w") as f:
+            f.write(prediction_result)
+        logging.info(f"Prediksi (data hingga periode {period}) disimpan ke {prediction_path}")
+        # Tampilkan prediksi di konsol
+        print("\n--- PREDIKSI PERIODE BERIKUTNYA ---")
+        print(prediction_result)
+        print("-------------------------------------\n")
+
+    def _observe_timer(self, scheduler):
+        """Sampel timer UI untuk estimasi offset jam server (diabaikan jika timer tidak terbaca)."""
+        snapshot = self.snapshot()
+        if snapshot is not None and snapshot.seconds_left is not None:
+            scheduler.observe_timer(snapshot.seconds_left, snapshot.taken_at)
+
     def start_live_scraping(self, stop_event):
         """
         Memulai proses scraping data secara live, dipicu oleh pembaruan API,
@@ -357,6 +469,14 @@ class DataScraper:
         logging.info("--- Memulai Live Scraping Berbasis API Event ---")
         logging.info("Live scraping akan berjalan terus menerus. Tekan Ctrl+C untuk berhenti.")
         output_csv_path = self.config['project_setup']['data_path']
+        history_store = HistoryStore(storage_from_config(self.config))
+        history_store.load()
+        # FeatureStore hanya dipelihara jika predictor membaca fiturnya (forecaster LightGBM).
+        feature_store = None
+        if getattr(self.gemini_predictor, 'uses_feature_store', False):
+            feature_store = FeatureStore.from_config(self.config).open(history_store)
+            self.gemini_predictor.attach_feature_store(feature_store)
+            logging.info(f"FeatureStore siap: {len(feature_store)} baris, {len(feature_store.names)} fitur.")
         
         # Get configuration values
         scraping_config = self.web_agent_config.get('scraping', {})
@@ -370,33 +490,100 @@ class DataScraper:
         max_time_seconds = max_time_minutes * 60
         
         logging.info(f"Live scraping auto-stop: {max_iterations} iterations or {max_time_minutes} minutes")
+
+        # Prediksi berjalan di thread terpisah agar penangkapan API tidak menunggu LLM.
+        prediction_worker = None
+        if self.gemini_predictor:
+            prediction_path = os.path.join(os.path.dirname(output_csv_path), "next_prediction.txt")
+            prediction_worker = PredictionWorker(
+                self.gemini_predictor,
+                on_result=lambda period, result: self._save_prediction(prediction_path, period, result),
+            )
+        self.prediction_worker = prediction_worker
+        response_feed = self._ensure_response_feed()
+        # Penjadwal periode butuh capture interceptor: respons tetap mengantre selama loop tidur.
+        scheduler = PeriodScheduler.from_config(scraping_config) if response_feed else None
+        self.scheduler = scheduler
+        current_window = None
+        if scheduler:
+            logging.info(f"Live scraping dijadwalkan per periode ({scheduler.period_seconds:g}s, bangun "
+                         f"{scheduler.lead_seconds:g}s sebelum batas, tenggat capture {scheduler.capture_deadline:g}s).")
+            self._observe_timer(scheduler)
+        # Fetch dalam halaman mengambil halaman 1 tepat setelah batas periode, tanpa menunggu polling halaman.
+        page_fetcher = InPageFetcher.from_config(scraping_config)
+        if page_fetcher and not scheduler:
+            logging.warning("latest_fetch 'inpage' butuh live_schedule 'period' dan capture interceptor; "
+                            "memakai capture pasif.")
+            page_fetcher = None
+        self.page_fetcher = page_fetcher
+        if page_fetcher:
+            logging.info(f"Hasil terbaru diambil dengan fetch dalam halaman {page_fetcher.fetch_delay:g}s setelah batas "
+                         f"(interval minimum {page_fetcher.min_interval:g}s).")
         
         while not stop_event.is_set():
-            iteration_count += 1
-            current_time = time.time()
-            elapsed_minutes = (current_time - start_time) / 60
-            
-            # Check time limit
-            if current_time - start_time > max_time_seconds:
-                logging.info(f"Auto-stopping: Time limit reached ({max_time_minutes} minutes)")
-                break
+            drain_timeout = 5
+            if scheduler:
+                # Tidur hingga menjelang penutupan periode; satu iterasi = satu periode.
+                drain_timeout = scheduler.wait_for_window(stop_event)
+                if drain_timeout is None:
+                    break
+                new_window = scheduler.pending_close is None or scheduler.pending_close != current_window
+                current_window = scheduler.pending_close
+            else:
+                new_window = True
+
+            if new_window:
+                iteration_count += 1
+                current_time = time.time()
+                elapsed_minutes = (current_time - start_time) / 60
                 
-            # Check iteration limit
-            if iteration_count > max_iterations:
-                logging.info(f"Auto-stopping: Iteration limit reached ({max_iterations} iterations)")
-                break
-            
-            logging.info(f"Live scraping iteration #{iteration_count}/{max_iterations} ({elapsed_minutes:.1f}/{max_time_minutes} min) - Menunggu pembaruan API...")
+                # Check time limit
+                if current_time - start_time > max_time_seconds:
+                    logging.info(f"Auto-stopping: Time limit reached ({max_time_minutes} minutes)")
+                    break
+                    
+                # Check iteration limit
+                if iteration_count > max_iterations:
+                    logging.info(f"Auto-stopping: Iteration limit reached ({max_iterations} iterations)")
+                    break
+                
+                logging.info(f"Live scraping iteration #{iteration_count}/{max_iterations} ({elapsed_minutes:.1f}/{max_time_minutes} min) - Menunggu pembaruan API...")
+                if scheduler and current_window is not None:
+                    self._observe_timer(scheduler)
             
             try:
-                # Hapus request sebelumnya untuk memastikan kita menangkap yang baru
-                del self.driver.requests
-                
-                # Tunggu permintaan dengan timeout untuk memungkinkan pemeriksaan stop_event
-                request = self.driver.wait_for_request(self.api_endpoint, timeout=5)
-                
-                logging.info(f"Permintaan API terdeteksi pada iterasi #{iteration_count}. Memproses data...")
-                response_records = process_api_response(request)
+                captured = []
+                if response_feed:
+                    # Respons sudah didekode oleh interceptor; timeout memungkinkan pemeriksaan stop_event.
+                    # Semua respons yang mengantre digabung menjadi satu ingest.
+                    fetch_wait = page_fetcher.seconds_until_due(scheduler.pending_close) if page_fetcher else None
+                    if fetch_wait == 0:
+                        # Hasil periode yang ditunggu belum tertangkap: ambil halaman 1 sekarang.
+                        fetched = page_fetcher.fetch_latest(self.driver)
+                        captured = response_feed.drain(timeout=0 if fetched else drain_timeout)
+                        if fetched:
+                            captured.append(fetched)
+                    else:
+                        captured = response_feed.drain(
+                            timeout=drain_timeout if fetch_wait is None else min(drain_timeout, fetch_wait))
+                    if not captured:
+                        logging.debug("Tidak ada respons API dari interceptor dalam interval waktu. Melanjutkan pengecekan...")
+                        continue
+                    # Respons hasil fetch dalam halaman tidak membawa request selenium-wire.
+                    request = next((item.request for item in reversed(captured) if item.request is not None), None)
+                    if page_fetcher:
+                        page_fetcher.update_template(request)
+                    response_records = [record for item in captured for record in item.records]
+                    logging.info(f"{len(captured)} respons API diterima pada iterasi #{iteration_count}. Memproses data...")
+                else:
+                    # Hapus request sebelumnya untuk memastikan kita menangkap yang baru
+                    del self.driver.requests
+                    
+                    # Tunggu permintaan dengan timeout untuk memungkinkan pemeriksaan stop_event
+                    request = self.driver.wait_for_request(self.api_endpoint, timeout=5)
+                    
+                    logging.info(f"Permintaan API terdeteksi pada iterasi #{iteration_count}. Memproses data...")
+                    response_records = process_api_response(request)
                 
                 if not response_records:
                     logging.warning("API terdeteksi tetapi tidak ada catatan yang ditemukan.")
@@ -408,68 +595,36 @@ class DataScraper:
                 else:
                     empty_iterations = 0  # Reset counter when we get data
 
-                latest_df = pd.DataFrame(response_records)
-                latest_df.rename(columns={'issueNumber': 'Period', 'number': 'Number', 'colour': 'Color', 'premium': 'Premium'}, inplace=True)
-                
                 # Filter untuk memastikan hanya game '10001' yang diproses secara live
-                latest_df['Period'] = latest_df['Period'].astype(str)
-                if not latest_df['Period'].str.contains('10001').any():
+                latest_batch = records_to_batch(response_records)
+                if len(latest_batch) == 0:
                     logging.info(f"Data live yang diterima bukan untuk game '10001'. Mengabaikan.")
                     continue
                 
-                # Proses dan simpan data
+                # Proses dan simpan data secara inkremental
                 try:
-                    # Baca data yang ada
-                    try:
-                        existing_df = pd.read_csv(output_csv_path)
-                        existing_df['Period'] = existing_df['Period'].astype(str)
-                    except FileNotFoundError:
-                        logging.info(f"File data '{output_csv_path}' tidak ditemukan. Membuat file baru.")
-                        existing_df = pd.DataFrame({col: pd.Series(dtype='object') for col in ["Period", "Number", "Big/Small", "Color", "Premium"]})
-
-                    latest_df['Period'] = latest_df['Period'].astype(str)
-                    latest_df['Number'] = pd.to_numeric(latest_df['Number'])
-                    latest_df['Big/Small'] = np.where(latest_df['Number'] >= 5, 'Big', 'Small')
-
-                    if not isinstance(existing_df, pd.DataFrame):
-                        existing_df = pd.DataFrame(existing_df)
-                    if not isinstance(latest_df, pd.DataFrame):
-                        latest_df = pd.DataFrame(latest_df)
-                    combined_df = pd.concat([existing_df, latest_df], ignore_index=True)
-                    
-                    final_cols = ['Period', 'Number', 'Big/Small', 'Color', 'Premium']
-                    for col in final_cols:
-                        if col not in combined_df.columns:
-                            combined_df[col] = pd.NA
-                    combined_df = combined_df[final_cols]
-
-                    if isinstance(combined_df, pd.DataFrame):
-                        combined_df = combined_df.drop_duplicates(subset='Period', keep='last')
-                        combined_df = combined_df.sort_values(by='Period', ascending=True)
-                        if not combined_df.equals(existing_df):
-                            combined_df.to_csv(output_csv_path, index=False)
-                            if self.gemini_predictor:
-                                logging.info("Memanggil Gemini untuk prediksi periode berikutnya...")
-                                try:
-                                    context_df = combined_df.tail(200)
-                                    prediction_result = self.gemini_predictor.predict_next_period(context_df)
-                                    prediction_path = os.path.join(os.path.dirname(output_csv_path), "next_prediction.txt")
-                                    with open(prediction_path, "w") as f:
-                                        f.write(prediction_result)
-                                    logging.info(f"Prediksi disimpan ke {prediction_path}")
-                                    # Tampilkan prediksi di konsol
-                                    print("\n--- PREDIKSI PERIODE BERIKUTNYA ---")
-                                    print(prediction_result)
-                                    print("-------------------------------------\n")
-                                except Exception as e:
-                                    logging.error(f"Gagal menghasilkan atau menyimpan prediksi: {e}", exc_info=True)
-                        else:
-                            logging.info("Tidak ada data baru yang terdeteksi. Melewati penyimpanan dan prediksi.")
+                    new_rows = history_store.ingest(latest_batch)
+                    if not new_rows.empty:
+                        logging.info(f"{len(new_rows)} baris baru disimpan. High-water-mark: {history_store.high_water_mark}")
+                        if scheduler:
+                            lag = scheduler.observe_result(captured[-1].received_at)
+                            logging.info(f"Lag capture {lag * 1000:.0f} ms setelah penutupan periode. Penjadwal: {scheduler.stats()}")
+                        if feature_store is not None:
+                            feature_store.sync(history_store)
+                        if self.on_ingest:
+                            self.on_ingest(request, new_rows)
+                        if prediction_worker:
+                            context_rows = getattr(self.gemini_predictor, 'context_rows', 200)
+                            prediction_worker.submit(history_store.high_water_mark, history_store.tail_batch(context_rows))
+                            logging.info(f"Prediksi periode berikutnya dijadwalkan. Worker: {prediction_worker.stats()}")
                     else:
-                        logging.warning("Combined DataFrame is not a DataFrame, skipping save.")
+                        logging.info("Tidak ada data baru yang terdeteksi. Melewati penyimpanan dan prediksi.")
 
                 except Exception as e:
                     logging.error(f"Gagal memproses atau menyimpan data live: {e}", exc_info=True)
+                for item in captured:
+                    if item.request is not None:
+                        response_feed.mark_ingested(item)
 
             except TimeoutException:
                 # Timeout diharapkan, ini memungkinkan loop untuk memeriksa stop_event
@@ -487,5 +642,19 @@ class DataScraper:
             logging.info("--- Live Scraping Dihentikan secara otomatis ---")
         
         logging.info(f"Total iterasi yang dijalankan: {iteration_count}")
+        if scheduler:
+            logging.info(f"Statistik penjadwal periode: {scheduler.stats()}")
+        if page_fetcher:
+            logging.info(f"Statistik fetch dalam halaman: {page_fetcher.stats()}")
+        self._release_response_feed()
+        if feature_store is not None:
+            feature_store.save()
+        if prediction_worker:
+            prediction_worker.stop(timeout=scraping_config.get('prediction_stop_timeout', 30))
+            logging.info(f"Statistik worker prediksi: {prediction_worker.stats()}")
+        if self.gemini_predictor and hasattr(self.gemini_predictor, 'cache_stats'):
+            logging.info(f"Statistik cache Gemini: {self.gemini_predictor.cache_stats()}")
+        if self.gemini_predictor and hasattr(self.gemini_predictor, 'fallback_stats'):
+            logging.info(f"Statistik fallback predictor: {self.gemini_predictor.fallback_stats()}")
         elapsed_total = (time.time() - start_time) / 60
         logging.info(f"Total waktu berjalan: {elapsed_total:.1f} menit")
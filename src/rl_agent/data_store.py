@@ -0,0 +1,115 @@
+import logging
+import pandas as pd
+from src.rl_agent.period_index import PeriodIndex
+from src.rl_agent.records import ResultBatch, WIN_GO_1MIN
+
+FINAL_COLUMNS = ['Period', 'Number', 'Big/Small', 'Color', 'Premium']
+
+
+def records_to_batch(records, game_code=WIN_GO_1MIN):
+    """
+    Mengubah daftar rekaman API menjadi `ResultBatch`, hanya untuk game '10001'.
+    Kolom dibangun langsung dari JSON hasil parse (`records_to_columns`);
+    jalur live, bulk, dan in-page fetch semuanya melewati fungsi ini.
+
+    Args:
+        records (list): Rekaman dari `process_api_response`.
+
+    Returns:
+        ResultBatch: Batch hasil (bisa kosong).
+    """
+    return ResultBatch.from_records(records).filter_game(game_code)
+
+
+class HistoryStore:
+    """
+    Penyimpanan riwayat hasil game yang mendukung penambahan inkremental.
+
+    Store memuat data satu kali melalui backend penyimpanan (lihat
+    `src.utils.storage`) ke dalam `PeriodIndex`, tabel in-memory yang terurut
+    berdasarkan Period int64. High-water-mark (Period terbesar) tersedia dari
+    indeks. Baris baru yang lebih besar dari high-water-mark cukup ditambahkan ke
+    akhir file, sehingga biaya per rekaman tetap konstan meskipun riwayat terus
+    bertambah. Penulisan ulang penuh hanya dilakukan untuk koreksi out-of-order,
+    yaitu Period lama yang belum ada di store atau Period yang nilainya berubah.
+    """
+    def __init__(self, storage):
+        self.storage = storage
+        self.path = storage.path
+        self.index = PeriodIndex()
+        self._loaded = False
+        # Bertambah setiap kali file ditulis ulang karena koreksi; dipakai konsumen
+        # turunan (mis. FeatureStore) untuk mendeteksi bahwa baris lama berubah.
+        self.rewrites = 0
+
+    @property
+    def high_water_mark(self):
+        return self.index.max_period
+
+    @property
+    def row_count(self):
+        return len(self.index)
+
+    def load(self):
+        """Memuat seluruh riwayat dari backend penyimpanan ke indeks Period."""
+        try:
+            self.index = PeriodIndex.from_batch(self.storage.read_batch())
+        except FileNotFoundError:
+            logging.info(f"File data '{self.path}' tidak ditemukan. File baru akan dibuat saat data pertama masuk.")
+            self.index = PeriodIndex()
+        self._loaded = True
+        logging.info(f"HistoryStore dimuat: {self.row_count} baris, high-water-mark {self.high_water_mark}.")
+
+    def ingest(self, new_df):
+        """
+        Memasukkan batch rekaman ke store.
+
+        Args:
+            new_df (ResultBatch | pd.DataFrame): Rekaman Period/Number/Color/Premium.
+
+        Returns:
+            pd.DataFrame: Baris yang benar-benar baru atau terkoreksi (urut berdasarkan Period),
+                          atau DataFrame kosong jika tidak ada perubahan.
+        """
+        if not self._loaded:
+            self.load()
+        if new_df is None or len(new_df) == 0:
+            return pd.DataFrame(columns=FINAL_COLUMNS)
+
+        result = self.index.upsert(new_df)
+        if not result.changed:
+            return pd.DataFrame(columns=FINAL_COLUMNS)
+
+        appended_df = self.index.tail(result.appended) if result.appended else None
+        if result.append_only:
+            self.storage.append(appended_df)
+            return appended_df
+
+        logging.info(
+            f"Koreksi out-of-order terdeteksi ({len(result.updated)} diperbarui, "
+            f"{len(result.inserted)} disisipkan). Menulis ulang file data secara penuh."
+        )
+        self.storage.write(self.index.to_frame())
+        self.rewrites += 1
+        corrected_df = self.index.rows(list(result.updated) + list(result.inserted))
+        if appended_df is None:
+            return corrected_df
+        return pd.concat([corrected_df, appended_df], ignore_index=True)
+
+    def tail(self, n=200):
+        """Mengembalikan n baris terakhir store tanpa membaca ulang file."""
+        if not self._loaded:
+            self.load()
+        return self.index.tail(n)
+
+    def tail_batch(self, n=200):
+        """Seperti `tail`, tetapi mengembalikan `ResultBatch` ringkas."""
+        if not self._loaded:
+            self.load()
+        return self.index.tail_batch(n)
+
+    def frame(self):
+        """Mengembalikan seluruh riwayat sebagai DataFrame terurut."""
+        if not self._loaded:
+            self.load()
+        return self.index.to_frame()
@@ -0,0 +1,351 @@
+import json
+import logging
+import os
+from collections import deque
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from src.rl_agent.records import COLOR_RED, COLOR_GREEN, COLOR_VIOLET
+
+# Indikator yang dijumlahkan dalam jendela bergulir: one-hot angka 0-9, Big, dan tiga warna.
+_INDICATOR_NAMES = [f'freq_{d}' for d in range(10)] + ['big_ratio', 'red_ratio', 'green_ratio', 'violet_ratio']
+
+
+def feature_names(window_size):
+    """Nama kolom matriks fitur untuk `window_size` tertentu."""
+    return ([f'lag_{k}' for k in range(window_size)]
+            + ['is_big', 'is_small', 'color_red', 'color_green', 'color_violet', 'streak_len']
+            + _INDICATOR_NAMES)
+
+
+def _indicators(numbers, colors):
+    """Matriks indikator (n, 14): one-hot angka, Big, merah, hijau, ungu."""
+    n = len(numbers)
+    indicators = np.zeros((n, len(_INDICATOR_NAMES)), dtype=np.int64)
+    indicators[np.arange(n), numbers % 10] = 1
+    indicators[:, 10] = numbers >= 5
+    indicators[:, 11] = (colors & COLOR_RED) > 0
+    indicators[:, 12] = (colors & COLOR_GREEN) > 0
+    indicators[:, 13] = (colors & COLOR_VIOLET) > 0
+    return indicators
+
+
+def compute_features(numbers, colors, window_size):
+    """
+    Menghitung fitur untuk seluruh baris sekaligus (backfill).
+
+    Baris i hanya memakai data hingga baris i (tanpa kebocoran masa depan):
+    lag angka 0..window_size-1 (NaN jika belum tersedia), one-hot Big/Small dan
+    warna, panjang streak Big/Small, serta frekuensi bergulir angka, Big, dan
+    warna dalam window_size baris terakhir.
+
+    Returns:
+        np.ndarray: Matriks float32 (n, len(feature_names(window_size))).
+    """
+    numbers = np.asarray(numbers, dtype=np.int64)
+    colors = np.asarray(colors, dtype=np.uint8)
+    n = len(numbers)
+    w = window_size
+    features = np.empty((n, len(feature_names(w))), dtype=np.float32)
+    if n == 0:
+        return features
+
+    padded = np.concatenate([np.full(w - 1, np.nan), numbers.astype(np.float64)])
+    features[:, :w] = sliding_window_view(padded, w)[:, ::-1]
+
+    big = numbers >= 5
+    change = np.empty(n, dtype=bool)
+    change[0] = True
+    change[1:] = big[1:] != big[:-1]
+    positions = np.arange(n)
+    run_start = np.maximum.accumulate(np.where(change, positions, 0))
+    features[:, w] = big
+    features[:, w + 1] = ~big
+    features[:, w + 2] = (colors & COLOR_RED) > 0
+    features[:, w + 3] = (colors & COLOR_GREEN) > 0
+    features[:, w + 4] = (colors & COLOR_VIOLET) > 0
+    features[:, w + 5] = positions - run_start + 1
+
+    indicators = _indicators(numbers, colors)
+    cumulative = np.vstack([np.zeros((1, indicators.shape[1]), dtype=np.int64), np.cumsum(indicators, axis=0)])
+    lower = np.maximum(positions + 1 - w, 0)
+    counts = cumulative[1:] - cumulative[lower]
+    features[:, w + 6:] = counts / np.minimum(positions + 1, w)[:, None]
+    return features
+
+
+def latest_features(numbers, colors, window_size):
+    """
+    Baris fitur terakhir saja, identik dengan `compute_features(...)[-1]` tetapi
+    tanpa menghitung seluruh jendela (dipakai untuk scoring live).
+    """
+    numbers = np.asarray(numbers, dtype=np.int64)
+    colors = np.asarray(colors, dtype=np.uint8)
+    w = window_size
+    row = np.full(len(feature_names(w)), np.nan, dtype=np.float32)
+    n = len(numbers)
+    if n == 0:
+        return row
+    recent = numbers[-w:]
+    recent_colors = colors[-w:]
+    row[:len(recent)] = recent[::-1]
+    big = numbers >= 5
+    changes = np.flatnonzero(big[1:] != big[:-1])
+    color = int(colors[-1])
+    row[w:w + 6] = (big[-1], not big[-1], (color & COLOR_RED) > 0, (color & COLOR_GREEN) > 0,
+                    (color & COLOR_VIOLET) > 0, n - 1 - changes[-1] if len(changes) else n)
+    row[w + 6:] = _indicators(recent, recent_colors).sum(axis=0) / len(recent)
+    return row
+
+
+class FeatureStore:
+    """
+    Fitur jendela bergulir untuk setiap baris riwayat, disimpan sebagai array
+    NumPy kontigu (`periods` int64 dan matriks `features` float32).
+
+    Backfill memakai `compute_features` (vektor penuh). Saat live scraper
+    menambahkan baris, `sync` hanya menghitung baris baru dari state bergulir
+    (jumlah indikator dalam jendela, streak, dan window_size angka terakhir),
+    sehingga biaya per baris tidak bergantung pada panjang riwayat.
+
+    Persistensi (`path` adalah direktori): `periods.int64` dan `features.float32`
+    berisi array mentah baris demi baris, dan `meta.json` mencatat skema serta
+    jumlah baris yang sudah tersimpan. `save` hanya menambahkan baris baru di
+    akhir kedua file lalu memperbarui `meta.json`; file ditulis ulang penuh
+    hanya setelah `rebuild` (koreksi riwayat atau skema berubah). Byte di luar
+    jumlah baris di `meta.json` (sisa penulisan yang terputus) diabaikan dan
+    ditimpa pada penyimpanan berikutnya.
+    """
+    META_FILE = 'meta.json'
+    PERIODS_FILE = 'periods.int64'
+    FEATURES_FILE = 'features.float32'
+
+    def __init__(self, window_size=15, path=None, save_every=60):
+        self.window_size = int(window_size)
+        self.path = path
+        self.save_every = save_every
+        self.names = feature_names(self.window_size)
+        self.size = 0
+        self._periods = np.empty(0, dtype=np.int64)
+        self._features = np.empty((0, len(self.names)), dtype=np.float32)
+        self._rewrites_seen = None
+        self._unsaved = 0
+        self._saved_rows = 0  # baris yang sudah ada di file dan masih sama dengan array di memori
+        self.rewrites = 0
+        self._reset_state()
+
+    @classmethod
+    def from_config(cls, config):
+        """Membuat store dari `environment.window_size` dan blok `feature_store` di config.yaml."""
+        store_config = config.get('feature_store', {})
+        return cls(
+            window_size=config.get('environment', {}).get('window_size', 15),
+            path=store_config.get('path', 'data/features'),
+            save_every=store_config.get('save_every', 60),
+        )
+
+    @property
+    def periods(self):
+        return self._periods[:self.size]
+
+    @property
+    def features(self):
+        return self._features[:self.size]
+
+    @property
+    def last_period(self):
+        return int(self._periods[self.size - 1]) if self.size else None
+
+    def __len__(self):
+        return self.size
+
+    def column(self, name):
+        return self.features[:, self.names.index(name)]
+
+    def rows_for(self, periods):
+        """Baris fitur untuk Period tertentu (Period yang tidak ada menghasilkan KeyError)."""
+        periods = np.asarray(periods, dtype=np.int64)
+        pos = np.searchsorted(self.periods, periods)
+        if not self.size or np.any(pos >= self.size) or np.any(self._periods[np.minimum(pos, self.size - 1)] != periods):
+            raise KeyError("Sebagian Period tidak ada di feature store.")
+        return self.features[pos]
+
+    def rebuild(self, batch):
+        """Menghitung ulang seluruh fitur dari `ResultBatch` riwayat lengkap."""
+        features = compute_features(batch.number, batch.color, self.window_size)
+        self.size = len(batch)
+        self._periods = batch.period.astype(np.int64, copy=True)
+        self._features = features
+        self._restore_state(batch)
+        self._unsaved = self.size
+        self._saved_rows = 0
+
+    def sync(self, history_store):
+        """
+        Menyelaraskan fitur dengan `HistoryStore`.
+
+        Baris yang ditambahkan di akhir dihitung secara inkremental. Jika store
+        pernah ditulis ulang (koreksi out-of-order) atau isi awal tidak cocok,
+        fitur dibangun ulang dari seluruh riwayat.
+        """
+        index = history_store.index
+        rewrites = getattr(history_store, 'rewrites', 0)
+        if self._rewrites_seen != rewrites and not self._matches_prefix(index):
+            logging.info(f"Feature store tidak cocok dengan riwayat; menghitung ulang {len(index)} baris.")
+            self.rebuild(index.batch())
+        elif self._rewrites_seen is None:
+            # Pertama kali setelah load: state bergulir dipulihkan dari baris terakhir.
+            self._restore_state(index.batch(max(self.size - self.window_size, 0), self.size))
+        self._rewrites_seen = rewrites
+
+        new_rows = len(index) - self.size
+        if new_rows > max(1024, self.size):
+            # Backfill besar lebih cepat dihitung secara vektor. Prefiks sudah cocok,
+            # jadi baris yang tersimpan tetap sah dan `save` cukup menambahkan sisanya.
+            saved_rows = self._saved_rows
+            self.rebuild(index.batch())
+            self._saved_rows = saved_rows
+        elif new_rows > 0:
+            batch = index.batch(self.size)
+            self._ensure_capacity(new_rows)
+            for period, number, color in zip(batch.period.tolist(), batch.number.tolist(), batch.color.tolist()):
+                self.append(period, number, color)
+        if self.path and self.save_every and self._unsaved >= self.save_every:
+            self.save()
+        return self
+
+    def _matches_prefix(self, index):
+        if self.size > len(index):
+            return False
+        if self.size == 0:
+            return True
+        stored = index.batch(0, self.size)
+        return (np.array_equal(stored.period, self.periods)
+                and np.array_equal(stored.number, self.column('lag_0').astype(np.uint8))
+                and np.array_equal((stored.color & COLOR_VIOLET) > 0, self.column('color_violet') > 0))
+
+    def append(self, period, number, color):
+        """Menambahkan satu baris dengan update O(1) pada jumlah jendela dan streak."""
+        w = self.window_size
+        number = int(number)
+        color = int(color)
+        indicator = np.zeros(len(_INDICATOR_NAMES), dtype=np.int64)
+        indicator[number % 10] = 1
+        indicator[10] = number >= 5
+        indicator[11] = (color & COLOR_RED) > 0
+        indicator[12] = (color & COLOR_GREEN) > 0
+        indicator[13] = (color & COLOR_VIOLET) > 0
+
+        self._recent.appendleft((number, indicator))
+        self._counts += indicator
+        if len(self._recent) > w:
+            _, dropped = self._recent.pop()
+            self._counts -= dropped
+        is_big = number >= 5
+        self._streak = self._streak + 1 if self._last_big is not None and self._last_big == is_big else 1
+        self._last_big = is_big
+
+        row = np.full(len(self.names), np.nan, dtype=np.float32)
+        row[:len(self._recent)] = [recent_number for recent_number, _ in self._recent]
+        row[w:w + 6] = (is_big, not is_big, indicator[11], indicator[12], indicator[13], self._streak)
+        row[w + 6:] = self._counts / min(len(self._recent), w)
+
+        self._ensure_capacity(1)
+        self._periods[self.size] = period
+        self._features[self.size] = row
+        self.size += 1
+        self._unsaved += 1
+
+    def _reset_state(self):
+        self._recent = deque()
+        self._counts = np.zeros(len(_INDICATOR_NAMES), dtype=np.int64)
+        self._streak = 0
+        self._last_big = None
+
+    def _restore_state(self, batch):
+        """Memulihkan state bergulir dari baris-baris terakhir `batch`."""
+        self._reset_state()
+        tail = batch[-self.window_size:] if len(batch) > self.window_size else batch
+        if len(tail):
+            indicators = _indicators(tail.number.astype(np.int64), tail.color)
+            for number, indicator in zip(tail.number.tolist(), indicators):
+                self._recent.appendleft((number, indicator))
+            self._counts = indicators.sum(axis=0)
+        if self.size:
+            self._streak = int(self.column('streak_len')[-1])
+            self._last_big = bool(self.column('is_big')[-1])
+
+    def _ensure_capacity(self, extra):
+        needed = self.size + extra
+        capacity = len(self._periods)
+        if needed <= capacity:
+            return
+        new_capacity = max(needed, capacity * 2, 1024)
+        periods = np.empty(new_capacity, dtype=np.int64)
+        periods[:self.size] = self.periods
+        features = np.empty((new_capacity, len(self.names)), dtype=np.float32)
+        features[:self.size] = self.features
+        self._periods, self._features = periods, features
+
+    def _file(self, name):
+        return os.path.join(self.path, name)
+
+    def save(self):
+        """Menyimpan baris yang belum tersimpan (append); tulis ulang penuh hanya setelah rebuild."""
+        if not self.path:
+            return
+        os.makedirs(self.path, exist_ok=True)
+        start = self._saved_rows
+        if start == 0 or not all(os.path.exists(self._file(name)) for name in (self.PERIODS_FILE, self.FEATURES_FILE)):
+            # Tulis ulang: meta dikosongkan dulu agar file yang setengah tertulis tidak pernah dianggap sah.
+            start = 0
+            self._write_meta(0)
+            self.rewrites += 1
+        if start < self.size:
+            for name, rows in ((self.PERIODS_FILE, self._periods), (self.FEATURES_FILE, self._features)):
+                with open(self._file(name), 'r+b' if start else 'wb') as f:
+                    f.seek(start * rows[0].nbytes)
+                    f.truncate()
+                    f.write(rows[start:self.size].tobytes())
+        self._write_meta(self.size)
+        self._saved_rows = self.size
+        self._unsaved = 0
+        logging.info(f"Feature store disimpan: {self.size - start} baris baru ({self.size} total) ke '{self.path}'.")
+
+    def _write_meta(self, rows):
+        tmp_path = self._file(self.META_FILE + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'window_size': self.window_size, 'names': self.names, 'rows': rows}, f)
+        os.replace(tmp_path, self._file(self.META_FILE))
+
+    def load(self):
+        """Memuat fitur dari direktori. Mengembalikan False jika tidak ada, rusak, atau skemanya berbeda."""
+        if not self.path or not os.path.exists(self._file(self.META_FILE)):
+            return False
+        try:
+            with open(self._file(self.META_FILE), 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            if int(meta['window_size']) != self.window_size or list(meta['names']) != self.names:
+                logging.info("Skema feature store berubah; fitur akan dihitung ulang.")
+                return False
+            rows = int(meta['rows'])
+            periods = np.fromfile(self._file(self.PERIODS_FILE), dtype=np.int64, count=rows)
+            features = np.fromfile(self._file(self.FEATURES_FILE), dtype=np.float32, count=rows * len(self.names))
+            if len(periods) != rows or len(features) != rows * len(self.names):
+                raise ValueError(f"file berisi kurang dari {rows} baris")
+        except (OSError, KeyError, ValueError, TypeError) as e:
+            logging.warning(f"Feature store '{self.path}' tidak dapat dibaca, dihitung ulang: {e}")
+            return False
+        self._periods = periods
+        self._features = features.reshape(rows, len(self.names))
+        self.size = rows
+        self._saved_rows = rows
+        self._rewrites_seen = None
+        self._unsaved = 0
+        return True
+
+    def open(self, history_store):
+        """Memuat fitur tersimpan (jika ada) lalu menyelaraskannya dengan riwayat."""
+        self.load()
+        return self.sync(history_store)
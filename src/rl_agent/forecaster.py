@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Forecaster LightGBM untuk peluang Big pada periode berikutnya.
+
+Fitur diambil dari FeatureStore (src/rl_agent/feature_store.py) dengan
+jendela `environment.window_size`; label baris i adalah Big/Small pada baris
+i+1. Pelatihan membaca matriks fitur tersimpan (`feature_store.path`) yang
+diselaraskan dengan riwayat, dan saat live `LightGBMPredictor` membaca baris
+fitur terbaru dari FeatureStore yang sama yang diperbarui loop live, sehingga
+kedua jalur memakai fitur yang identik. Model dan scaler disimpan di
+`project_setup.model_dir` dengan nama dari blok `forecaster_model`, lalu dimuat
+satu kali oleh `LightGBMPredictor` dan tetap resident selama proses live
+berjalan.
+
+Pelatihan:
+    python src/rl_agent/forecaster.py
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+
+import numpy as np
+import yaml
+
+# --- Path Setup ---
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.rl_agent.feature_store import compute_features, latest_features, feature_names
+from src.rl_agent.predictors import Predictor
+from src.rl_agent.records import ResultBatch
+
+try:
+    import joblib
+    import lightgbm as lgb
+    from sklearn.preprocessing import StandardScaler
+except ImportError:
+    joblib = None
+    lgb = None
+    StandardScaler = None
+
+
+def _require_lightgbm():
+    if lgb is None:
+        raise ImportError("Forecaster membutuhkan 'lightgbm', 'scikit-learn', dan 'joblib'. "
+                          "Jalankan: pip install lightgbm scikit-learn joblib")
+
+
+def forecaster_paths(config):
+    """Path model dan scaler dari project_setup.model_dir dan blok forecaster_model."""
+    model_dir = config.get('project_setup', {}).get('model_dir', 'models/')
+    if not os.path.isabs(model_dir):
+        model_dir = os.path.join(project_root, model_dir)
+    forecaster_config = config.get('forecaster_model', {})
+    return (os.path.join(model_dir, forecaster_config.get('model_name', 'forecaster_lgbm.joblib')),
+            os.path.join(model_dir, forecaster_config.get('scaler_name', 'forecaster_scaler.joblib')))
+
+
+def build_training_set(batch, window_size, features=None):
+    """
+    Matriks fitur dan label untuk pelatihan. `features` (mis. FeatureStore.features
+    yang sudah selaras dengan `batch`) dipakai jika diberikan; jika tidak, fitur
+    dihitung dengan `compute_features`.
+
+    Returns:
+        tuple: (X float32 (n-1, F), y int8 (n-1,)) dengan y[i] = 1 jika baris i+1 Big.
+    """
+    if features is None:
+        features = compute_features(batch.number, batch.color, window_size)
+    elif len(features) != len(batch):
+        raise ValueError(f"Jumlah baris fitur ({len(features)}) tidak sama dengan riwayat ({len(batch)}).")
+    labels = (batch.number[1:] >= 5).astype(np.int8)
+    return features[:-1], labels
+
+
+def train_forecaster(batch, config, features=None):
+    """
+    Melatih scaler dan LGBMClassifier secara kronologis. `features` diteruskan
+    ke `build_training_set`.
+
+    Data dibagi sesuai `data_preprocessing.train_ratio`/`val_ratio`; set validasi
+    dipakai untuk early stopping dan sisanya (test) hanya untuk pelaporan.
+
+    Returns:
+        tuple: (model, scaler, metrics dict).
+    """
+    _require_lightgbm()
+    window_size = config.get('environment', {}).get('window_size', 15)
+    split_config = config.get('data_preprocessing', {})
+    params = dict(config.get('forecaster_model', {}).get('lgbm_params', {}))
+    early_stopping_rounds = params.pop('early_stopping_rounds', 50)
+
+    X, y = build_training_set(batch, window_size, features)
+    n = len(y)
+    train_end = int(n * split_config.get('train_ratio', 0.7))
+    val_end = train_end + int(n * split_config.get('val_ratio', 0.15))
+    if train_end == 0 or val_end <= train_end:
+        raise ValueError(f"Riwayat terlalu pendek untuk melatih forecaster ({len(batch)} baris).")
+
+    scaler = StandardScaler().fit(X[:train_end])
+    X_scaled = scaler.transform(X).astype(np.float32)
+
+    model = lgb.LGBMClassifier(**params)
+    model.fit(
+        X_scaled[:train_end], y[:train_end],
+        eval_set=[(X_scaled[train_end:val_end], y[train_end:val_end])],
+        callbacks=[lgb.early_stopping(early_stopping_rounds, verbose=False)],
+        feature_name=feature_names(window_size),
+    )
+
+    metrics = {'rows': len(batch), 'features': X.shape[1], 'best_iteration': model.best_iteration_}
+    for name, (start, stop) in (('val', (train_end, val_end)), ('test', (val_end, n))):
+        if stop > start:
+            p_big = model.predict_proba(X_scaled[start:stop])[:, 1]
+            metrics[f'{name}_accuracy'] = float(np.mean((p_big >= 0.5) == y[start:stop]))
+            metrics[f'{name}_base_rate'] = float(np.mean(y[start:stop]))
+    return model, scaler, metrics
+
+
+def save_forecaster(model, scaler, config):
+    model_path, scaler_path = forecaster_paths(config)
+    os.makedirs(os.path.dirname(model_path), exist_ok=True)
+    joblib.dump(model, model_path)
+    joblib.dump(scaler, scaler_path)
+    logging.info(f"Forecaster disimpan ke {model_path} (scaler: {scaler_path}).")
+    return model_path, scaler_path
+
+
+class LightGBMPredictor(Predictor):
+    """
+    Predictor lokal memakai forecaster LightGBM yang resident di memori.
+
+    Model dan scaler dimuat sekali saat inisialisasi. Saat live, loop scraper
+    memasang FeatureStore-nya lewat `attach_feature_store`; baris fitur untuk
+    Period terakhir jendela dibaca dari store itu alih-alih dihitung ulang dari
+    jendela mentah (tanpa store, atau jika Period belum ada di store, fitur
+    dihitung dengan `latest_features`). Saat scoring, scaler diterapkan
+    langsung dengan NumPy dan booster dipanggil dengan satu thread pada satu
+    baris, karena overhead thread pool LightGBM lebih besar daripada pekerjaan
+    untuk satu baris. `fit` melatih ulang di memori (dipakai evaluasi
+    walk-forward) tanpa menimpa file model.
+    """
+    name = 'lgbm'
+    uses_feature_store = True
+
+    def __init__(self, config=None, load=None):
+        _require_lightgbm()
+        self.config = config or {}
+        self.window_size = self.config.get('environment', {}).get('window_size', 15)
+        # Streak Big/Small dihitung dari window, jadi sediakan jauh lebih banyak baris dari window_size.
+        self.context_rows = max(16 * self.window_size, 256)
+        self.model = None
+        self.booster = None
+        self.feature_store = None
+        self.store_hits = 0
+        self._mean = None
+        self._scale = None
+        if load is None:
+            # Evaluasi walk-forward mematikan ini karena model dilatih per fold lewat `fit`.
+            load = self.config.get('forecaster_model', {}).get('load_pretrained', True)
+        if load:
+            self.load()
+
+    def load(self):
+        model_path, scaler_path = forecaster_paths(self.config)
+        if not os.path.exists(model_path):
+            raise FileNotFoundError(f"Model forecaster tidak ditemukan di {model_path}. "
+                                    f"Latih dulu: python src/rl_agent/forecaster.py")
+        model = joblib.load(model_path)
+        scaler = joblib.load(scaler_path) if os.path.exists(scaler_path) else None
+        self._set_model(model, scaler)
+        logging.info(f"Forecaster LightGBM dimuat dari {model_path} ({self.booster.num_trees()} pohon).")
+
+    def _set_model(self, model, scaler):
+        expected = len(feature_names(self.window_size))
+        if model.n_features_in_ != expected:
+            raise ValueError(f"Model forecaster memakai {model.n_features_in_} fitur, "
+                             f"sedangkan window_size {self.window_size} menghasilkan {expected}. Latih ulang model.")
+        self.model = model
+        self.booster = model.booster_
+        self._best_iteration = model.best_iteration_ or None
+        if scaler is not None:
+            self._mean = scaler.mean_.astype(np.float32)
+            self._scale = scaler.scale_.astype(np.float32)
+        else:
+            self._mean = np.zeros(expected, dtype=np.float32)
+            self._scale = np.ones(expected, dtype=np.float32)
+
+    def attach_feature_store(self, feature_store):
+        """Memakai `feature_store` (disinkronkan oleh loop live) sebagai sumber baris fitur."""
+        if feature_store.window_size != self.window_size:
+            raise ValueError(f"FeatureStore memakai window_size {feature_store.window_size}, "
+                             f"forecaster memakai {self.window_size}.")
+        self.feature_store = feature_store
+
+    def _feature_row(self, window):
+        """Baris fitur untuk Period terakhir `window`, dari FeatureStore jika tersedia."""
+        if self.feature_store is not None:
+            try:
+                row = self.feature_store.rows_for([int(window.period[-1])])[0]
+                self.store_hits += 1
+                return row
+            except KeyError:
+                logging.debug(f"Period {int(window.period[-1])} belum ada di FeatureStore; fitur dihitung dari jendela.")
+        window = window[-self.context_rows:]
+        return latest_features(window.number, window.color, self.window_size)
+
+    def fit(self, history):
+        model, scaler, metrics = train_forecaster(history, self.config)
+        self._set_model(model, scaler)
+        logging.info(f"Forecaster dilatih ulang di memori: {metrics}")
+
+    def score_features(self, rows):
+        """Peluang Big untuk baris fitur mentah (n, F)."""
+        rows = (np.atleast_2d(rows) - self._mean) / self._scale
+        return self.booster.predict(rows, num_iteration=self._best_iteration, num_threads=1)
+
+    def predict_big_probability(self, window):
+        if not isinstance(window, ResultBatch):
+            window = ResultBatch.from_frame(window)
+        if len(window) == 0:
+            return None
+        return float(self.score_features(self._feature_row(window))[0])
+
+    def predict_label(self, window):
+        p_big = self.predict_big_probability(window)
+        if p_big is None:
+            return None
+        return 'Big' if p_big >= 0.5 else 'Small'
+
+    def predict_next_period(self, window):
+        if not isinstance(window, ResultBatch):
+            window = ResultBatch.from_frame(window)
+        p_big = self.predict_big_probability(window)
+        if p_big is None:
+            return "--- PREDICTION ---\nTidak ada data untuk diprediksi."
+        big_small = 'Big' if p_big >= 0.5 else 'Small'
+        return (
+            f"--- PREDICTION ---\n"
+            f"Periode: {int(window.period[-1]) + 1}\n"
+            f"Besar/Kecil: {big_small} (P(Big)={p_big:.3f})\n"
+            f"Model: LightGBM ({self.booster.num_trees()} pohon, window {self.window_size})"
+        )
+
+    def generate_holistic_report(self, new_data):
+        return f"Forecaster LightGBM lokal menerima data baru: {new_data}. Gunakan predict_next_period untuk prediksi."
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Latih forecaster LightGBM dari riwayat tersimpan.")
+    parser.add_argument('--benchmark', type=int, default=1000, help="Jumlah scoring untuk mengukur latensi (0 = lewati).")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    with open(os.path.join(project_root, 'config.yaml'), 'r', encoding='utf-8') as f:
+        config = yaml.safe_load(f)
+
+    from src.rl_agent.data_store import HistoryStore
+    from src.rl_agent.feature_store import FeatureStore
+    from src.utils.storage import storage_from_config
+    data_path = config.get('project_setup', {}).get('data_path', 'data/databaru_from_api.csv')
+    config['project_setup']['data_path'] = os.path.join(project_root, data_path)
+    history_store = HistoryStore(storage_from_config(config))
+    history_store.load()
+    history = history_store.index.batch()
+
+    # Fitur dibaca dari feature store tersimpan (diperbarui inkremental jika riwayat bertambah).
+    feature_store = FeatureStore.from_config(config)
+    if feature_store.path and not os.path.isabs(feature_store.path):
+        feature_store.path = os.path.join(project_root, feature_store.path)
+    feature_store.open(history_store)
+    feature_store.save()
+
+    started = time.perf_counter()
+    model, scaler, metrics = train_forecaster(history, config, features=feature_store.features)
+    logging.info(f"Pelatihan selesai dalam {time.perf_counter() - started:.1f}s: {metrics}")
+    save_forecaster(model, scaler, config)
+
+    if args.benchmark:
+        predictor = LightGBMPredictor(config)
+        predictor.attach_feature_store(feature_store)
+        window = history[-predictor.context_rows:]
+        predictor.predict_big_probability(window)
+        started = time.perf_counter()
+        for _ in range(args.benchmark):
+            predictor.predict_big_probability(window)
+        elapsed_ms = (time.perf_counter() - started) * 1000 / args.benchmark
+        logging.info(f"Latensi scoring jendela terbaru: {elapsed_ms:.3f} ms per prediksi.")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,7 @@
 import os
 import sys
+import hashlib
+import logging
 from dotenv import load_dotenv
 
 # Try to import the correct Google AI package
@@ -31,8 +33,28 @@ project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(_
 if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
-class GeminiPredictor:
-    def __init__(self, model_name='gemini-2.5-flash'):
+from src.rl_agent.records import ResultBatch
+from src.rl_agent.response_cache import ResponseCache, content_key
+from src.rl_agent.prompt_encoding import CompactPromptEncoder, encode_table, encode_csv, estimate_tokens
+from src.rl_agent.predictors import Predictor, PredictionFailure
+
+# Nilai bawaan untuk blok `gemini` di config.yaml.
+DEFAULT_GEMINI_CONFIG = {
+    'context_cache': True,
+    'context_cache_ttl_seconds': 3600,
+    'prompt_encoding': 'compact',
+    'response_cache': {
+        'enabled': True,
+        'max_entries': 256,
+        'ttl_seconds': 3600,
+        'path': 'data/gemini_response_cache.json',
+    },
+}
+
+class GeminiPredictor(Predictor):
+    name = 'gemini'
+
+    def __init__(self, model_name='gemini-2.5-flash', config=None):
         load_dotenv()
         api_key = os.getenv("GEMINI_API_KEY")
         if not api_key:
@@ -46,12 +68,17 @@ class GeminiPredictor:
         except AttributeError:
             print("[W] Could not determine package version")
         
+        gemini_config = dict(DEFAULT_GEMINI_CONFIG, **((config or {}).get('gemini') or {}))
+        self.model_name = model_name
+        self.prompt_encoding = gemini_config.get('prompt_encoding', 'compact')
+        self.context_rows = int(gemini_config.get('prompt_window', 200))
+        self.prompt_encoder = CompactPromptEncoder(window=self.context_rows)
+
         # Configure based on package type
         if PACKAGE_TYPE == "google-genai":
             # For google-genai package
             client = genai.Client(api_key=api_key)
             self.client = client
-            self.model_name = model_name
         else:
             # For google-generativeai package
             genai.configure(api_key=api_key)
@@ -60,12 +87,29 @@ class GeminiPredictor:
         self.knowledge_codex = self._load_prompt_file('gemini_gems/KODEKS_FINAL_PREDIKSI.md')
         
         system_instruction = self.constitution + "\n\n" + self.knowledge_codex
-        
+        self.system_instruction = system_instruction
+        self.instruction_digest = hashlib.sha256(system_instruction.encode('utf-8')).hexdigest()
+
+        response_cache_config = dict(DEFAULT_GEMINI_CONFIG['response_cache'], **(gemini_config.get('response_cache') or {}))
+        self.response_cache = None
+        if response_cache_config.get('enabled', True):
+            cache_path = response_cache_config.get('path')
+            self.response_cache = ResponseCache(
+                max_entries=response_cache_config.get('max_entries', 256),
+                ttl_seconds=response_cache_config.get('ttl_seconds', 3600),
+                path=os.path.join(project_root, cache_path) if cache_path else None,
+                save_every=response_cache_config.get('save_every', 1),
+            )
+
         # Create model based on package type
         if PACKAGE_TYPE == "google-genai":
-            # For google-genai package - simpler initialization
+            # For google-genai package - instruksi sistem dikirim lewat cached content
+            # (sekali per sesi) atau field system_instruction, bukan digabung ke prompt.
             self.model = None  # Will use client directly
-            self.system_instruction = system_instruction
+            self.use_context_cache = bool(gemini_config.get('context_cache', True))
+            self.context_cache_ttl = int(gemini_config.get('context_cache_ttl_seconds', 3600))
+            self.cached_content_name = None
+            self._context_cache_failed = False
         else:
             # For google-generativeai package
             generation_config = None
@@ -113,98 +157,180 @@ class GeminiPredictor:
         except FileNotFoundError:
             raise FileNotFoundError(f"Prompt file not found at: {full_path}")
 
-    def generate_holistic_report(self, new_data):
-        prompt = f"Data baru telah tiba: {new_data}. Laksanakan protokol pelaporan holistik Anda."
+    def _ensure_context_cache(self):
+        """Membuat cached content berisi instruksi sistem satu kali per sesi (jika didukung)."""
+        if self.cached_content_name or not self.use_context_cache or self._context_cache_failed:
+            return self.cached_content_name
         try:
-            if PACKAGE_TYPE == "google-genai":
-                # For google-genai package - use simpler format
-                # Combine system instruction with user prompt
-                full_prompt = f"{self.system_instruction}\n\nUser Request: {prompt}"
-                
-                response = self.client.models.generate_content(
+            cached = self.client.caches.create(
+                model=self.model_name,
+                config=types.CreateCachedContentConfig(
+                    display_name='kodeks-prediksi',
+                    system_instruction=self.system_instruction,
+                    ttl=f"{self.context_cache_ttl}s",
+                ),
+            )
+            self.cached_content_name = cached.name
+            logging.info(f"Instruksi sistem Gemini disimpan sebagai cached content: {cached.name}")
+        except Exception as e:
+            # Mis. model tidak mendukung caching atau instruksi di bawah batas token minimum.
+            self._context_cache_failed = True
+            logging.info(f"Context cache Gemini tidak tersedia, memakai system_instruction biasa: {e}")
+        return self.cached_content_name
+
+    def _generate_content(self, prompt):
+        """Memanggil google-genai dengan instruksi sistem dari cached content atau system_instruction."""
+        cached_name = self._ensure_context_cache()
+        if cached_name:
+            try:
+                return self.client.models.generate_content(
                     model=self.model_name,
-                    contents=[
-                        {"role": "user", "parts": [{"text": full_prompt}]}
-                    ]
+                    contents=prompt,
+                    config=types.GenerateContentConfig(cached_content=cached_name),
                 )
+            except Exception as e:
+                # Cached content bisa kedaluwarsa; buat ulang sekali pada panggilan berikutnya.
+                logging.warning(f"Panggilan dengan cached content gagal, mengulang tanpa cache: {e}")
+                self.cached_content_name = None
+        return self.client.models.generate_content(
+            model=self.model_name,
+            contents=prompt,
+            config=types.GenerateContentConfig(system_instruction=self.system_instruction),
+        )
+
+    def _cached_response(self, kind, prompt, produce):
+        """
+        Mengembalikan respons dari cache lokal bila model, instruksi, dan prompt
+        (termasuk jendela data) identik; jika tidak, memanggil `produce()` dan
+        menyimpan hasilnya. Error tidak disimpan karena dilempar sebelum `put`.
+        """
+        if self.response_cache is None:
+            return produce()
+        key = content_key(self.model_name, self.instruction_digest, kind, prompt)
+        cached = self.response_cache.get(key)
+        if cached is not None:
+            logging.debug(f"Respons Gemini ({kind}) diambil dari cache lokal. Statistik: {self.cache_stats()}")
+            return cached
+        result = produce()
+        self.response_cache.put(key, result)
+        return result
+
+    def close(self):
+        """Menyimpan entri cache respons yang belum ditulis ke disk."""
+        if self.response_cache:
+            self.response_cache.flush()
+
+    def cache_stats(self):
+        """Statistik cache respons (hit/miss/eviction) dan status context cache."""
+        stats = self.response_cache.stats() if self.response_cache else {'hits': 0, 'misses': 0, 'evictions': 0, 'size': 0, 'hit_rate': 0.0}
+        stats['context_cache'] = getattr(self, 'cached_content_name', None)
+        return stats
+
+    def generate_holistic_report(self, new_data):
+        prompt = f"Data baru telah tiba: {new_data}. Laksanakan protokol pelaporan holistik Anda."
+        try:
+            return self._cached_response('report', prompt, lambda: self._holistic_report_uncached(prompt))
+        except Exception as e:
+            logging.error(f"Laporan Gemini gagal: {e}")
+            return PredictionFailure(f"An error occurred while generating the report: {e}")
+
+    def _holistic_report_uncached(self, prompt):
+        if PACKAGE_TYPE == "google-genai":
+            response = self._generate_content(prompt)
+            text = response.candidates[0].content.parts[0].text
+            if not text:
+                raise ValueError("No response generated")
+            return text
+        else:
+            # For google-generativeai package
+            response = self.model.generate_content(prompt)
+            
+            # Handle different response formats
+            if hasattr(response, 'text') and response.text:
+                return response.text
+            elif hasattr(response, 'candidates') and response.candidates:
                 return response.candidates[0].content.parts[0].text
             else:
-                # For google-generativeai package
-                response = self.model.generate_content(prompt)
-                
-                # Handle different response formats
-                if hasattr(response, 'text') and response.text:
-                    return response.text
-                elif hasattr(response, 'candidates') and response.candidates:
-                    return response.candidates[0].content.parts[0].text
-                else:
-                    return "No response generated"
-                    
-        except Exception as e:
-            return f"An error occurred while generating the report: {e}"
+                # Dilempar (bukan dikembalikan) agar tidak tersimpan di cache respons.
+                raise ValueError("No response generated")
 
     def predict_next_period(self, latest_data_df):
         """
         Menganalisis data terbaru dan menghasilkan prediksi untuk periode berikutnya.
+        `latest_data_df` boleh berupa DataFrame atau `ResultBatch`.
         """
-        # Ubah DataFrame menjadi format teks yang lebih mudah dibaca
-        data_str = latest_data_df.to_string(index=False)
-        
-        # Dapatkan periode terakhir dan hitung periode berikutnya
+        prompt = self.build_prediction_prompt(latest_data_df)
         try:
-            last_period = int(latest_data_df['Period'].iloc[-1])
-            next_period = last_period + 1
-        except (ValueError, IndexError):
-            next_period = "berikutnya"
+            return self._cached_response('prediction', prompt, lambda: self._prediction_uncached(prompt))
+        except Exception as e:
+            logging.error(f"Prediksi Gemini gagal: {e}")
+            return PredictionFailure(f"Terjadi kesalahan saat membuat prediksi: {e}")
+
+    def build_prediction_prompt(self, latest_data_df):
+        """Menyusun prompt prediksi dari jendela data (tanpa memanggil API)."""
+        if isinstance(latest_data_df, ResultBatch):
+            batch = latest_data_df
+        else:
+            batch = ResultBatch.from_frame(latest_data_df)
 
-        prompt = f"Berdasarkan data terbaru ini:\n{data_str}\n\nLakukan analisis dan berikan prediksi untuk periode {next_period}."
+        # Ubah jendela data menjadi teks sesuai `gemini.prompt_encoding`
+        data_str = self._encode_window(batch)
         
-        try:
-            if PACKAGE_TYPE == "google-genai":
-                # For google-genai package - use simpler format
-                # Combine system instruction with user prompt
-                full_prompt = f"{self.system_instruction}\n\nUser Request: {prompt}"
-                
-                response = self.client.models.generate_content(
-                    model=self.model_name,
-                    contents=[
-                        {"role": "user", "parts": [{"text": full_prompt}]}
-                    ]
-                )
-                answer = response.candidates[0].content.parts[0].text
-                return f"--- PREDICTION ---\n{answer}"
-            else:
-                # For google-generativeai package
-                response = self.model.generate_content(prompt)
+        # Dapatkan periode terakhir dan hitung periode berikutnya
+        next_period = int(batch.period[-1]) + 1 if len(batch) else "berikutnya"
+
+        return f"Berdasarkan data terbaru ini:\n{data_str}\n\nLakukan analisis dan berikan prediksi untuk periode {next_period}."
+
+    def _encode_window(self, batch):
+        """
+        Encoding 'compact' memakai encoder inkremental (hanya baris baru yang
+        diproses setiap periode); 'csv' dan 'table' dibangun ulang setiap kali.
+        """
+        if self.prompt_encoding == 'table':
+            data_str = encode_table(batch)
+        elif self.prompt_encoding == 'csv':
+            data_str = encode_csv(batch)
+        else:
+            data_str = self.prompt_encoder.sync(batch).render()
+        logging.debug(f"Prompt '{self.prompt_encoding}': {len(batch)} baris, ~{estimate_tokens(data_str)} token.")
+        return data_str
+
+    def _prediction_uncached(self, prompt):
+        if PACKAGE_TYPE == "google-genai":
+            response = self._generate_content(prompt)
+            answer = response.candidates[0].content.parts[0].text
+            if not answer:
+                raise ValueError("No response generated")
+            return f"--- PREDICTION ---\n{answer}"
+        else:
+            # For google-generativeai package
+            response = self.model.generate_content(prompt)
+            
+            # Handle different response formats
+            if hasattr(response, 'candidates') and response.candidates:
+                thoughts = ""
+                answer = ""
                 
-                # Handle different response formats
-                if hasattr(response, 'candidates') and response.candidates:
-                    thoughts = ""
-                    answer = ""
+                try:
+                    # Try to parse thinking parts if available
+                    for part in response.candidates[0].content.parts:
+                        if not part.text:
+                            continue
+                        if hasattr(part, 'thought') and part.thought:
+                            thoughts += part.text
+                        else:
+                            answer += part.text
                     
-                    try:
-                        # Try to parse thinking parts if available
-                        for part in response.candidates[0].content.parts:
-                            if not part.text:
-                                continue
-                            if hasattr(part, 'thought') and part.thought:
-                                thoughts += part.text
-                            else:
-                                answer += part.text
+                    if thoughts:
+                        return f"--- THOUGHTS ---\n{thoughts}\n\n--- PREDICTION ---\n{answer}"
+                    else:
+                        return f"--- PREDICTION ---\n{answer if answer else response.text}"
                         
-                        if thoughts:
-                            return f"--- THOUGHTS ---\n{thoughts}\n\n--- PREDICTION ---\n{answer}"
-                        else:
-                            return f"--- PREDICTION ---\n{answer if answer else response.text}"
-                            
-                    except AttributeError:
-                        # Fallback to simple text response
-                        return f"--- PREDICTION ---\n{response.text}"
-                else:
+                except AttributeError:
+                    # Fallback to simple text response
                     return f"--- PREDICTION ---\n{response.text}"
-                
-        except Exception as e:
-            return f"Terjadi kesalahan saat membuat prediksi: {e}"
+            else:
+                return f"--- PREDICTION ---\n{response.text}"
 
 if __name__ == '__main__':
     # Example usage for testing
@@ -0,0 +1,136 @@
+import json
+import logging
+import time
+
+from selenium.common.exceptions import WebDriverException
+
+from src.rl_agent.response_feed import CapturedResponse
+from src.utils.scraping import INPAGE_FETCH_MARKER, decode_api_body
+
+# Header yang diatur browser sendiri (atau dilarang untuk fetch) dan tidak disalin dari templat.
+_BROWSER_HEADERS = {'content-length', 'host', 'connection', 'accept-encoding', 'cookie', 'user-agent',
+                    'origin', 'referer'}
+
+# Dijalankan dengan execute_async_script: argumen terakhir adalah callback WebDriver.
+FETCH_SCRIPT = """
+const [url, method, headers, body, timeoutMs, done] = arguments;
+const controller = new AbortController();
+const timer = setTimeout(() => controller.abort(), timeoutMs);
+fetch(url, {method: method, headers: headers, body: body, credentials: 'include', cache: 'no-store',
+            signal: controller.signal})
+  .then(response => response.text().then(text => done({status: response.status, body: text})))
+  .catch(error => done({status: 0, error: String(error)}))
+  .finally(() => clearTimeout(timer));
+"""
+
+
+class InPageFetcher:
+    """
+    Mengambil halaman 1 riwayat dari dalam konteks halaman game (`fetch` via
+    `execute_async_script`), tanpa menunggu polling halaman itu sendiri.
+
+    Permintaan API terakhir yang ditangkap dipakai sebagai templat (URL, metode,
+    header otorisasi, body JSON dengan nomor halaman 1); cookie dan header
+    browser lainnya dikirim oleh browser. Templat diperbarui dari setiap
+    permintaan halaman yang tertangkap, sehingga field body yang berubah
+    (mis. timestamp/signature) tetap terbaru. Permintaan dibatasi
+    `min_interval` detik; respons ditolak (status bukan 200 atau body kosong)
+    menggandakan jeda hingga `max_backoff` detik. Loop live memanggil
+    `fetch_latest` `fetch_delay` detik setelah batas periode yang hasilnya belum
+    tertangkap.
+
+    URL fetch diberi parameter `INPAGE_FETCH_MARKER`, sehingga respons ini
+    tidak direkam selenium-wire (di luar scope CapturePolicy) dan diabaikan
+    `ResponseFeed`; hasilnya hanya masuk lewat `fetch_latest`.
+    """
+    def __init__(self, min_interval=5.0, fetch_delay=0.3, timeout=5.0, page_field='pageNo', max_backoff=60.0):
+        self.min_interval = float(min_interval)
+        self.fetch_delay = float(fetch_delay)
+        self.timeout = float(timeout)
+        self.page_field = page_field
+        self.max_backoff = float(max_backoff)
+        self.template = None
+        self.fetches = 0
+        self.failures = 0
+        self.throttled = 0
+        self._next_allowed = 0.0
+        self._backoff = 0.0
+
+    @classmethod
+    def from_config(cls, scraping_config):
+        """Fetcher dari `web_agent.scraping`, atau None jika `latest_fetch` bukan 'inpage'."""
+        if scraping_config.get('latest_fetch', 'passive') != 'inpage':
+            return None
+        return cls(
+            min_interval=scraping_config.get('inpage_min_interval_seconds', 5),
+            fetch_delay=scraping_config.get('inpage_fetch_delay_seconds', 0.3),
+            timeout=scraping_config.get('inpage_timeout_seconds', 5),
+            page_field=scraping_config.get('api_page_field', 'pageNo'),
+        )
+
+    def update_template(self, request):
+        """Memakai `request` (permintaan API halaman yang tertangkap) sebagai templat."""
+        if request is None or not getattr(request, 'body', None):
+            return
+        try:
+            payload = json.loads(request.body.decode('utf-8'))
+        except (ValueError, UnicodeDecodeError):
+            return
+        payload[self.page_field] = 1
+        headers = {key: value for key, value in request.headers.items()
+                   if key.lower() not in _BROWSER_HEADERS and not key.lower().startswith('sec-')}
+        url = request.url
+        if INPAGE_FETCH_MARKER not in url:
+            url += ('&' if '?' in url else '?') + INPAGE_FETCH_MARKER
+        self.template = (url, request.method or 'POST', headers, json.dumps(payload))
+
+    def seconds_until_due(self, pending_close):
+        """
+        Detik hingga fetch untuk batas periode `pending_close` (waktu dinding)
+        boleh dijalankan; None jika belum ada templat atau batas.
+        """
+        if self.template is None or pending_close is None:
+            return None
+        return max(pending_close + self.fetch_delay - time.time(), self._next_allowed - time.monotonic(), 0.0)
+
+    def fetch_latest(self, driver):
+        """
+        Mengambil halaman 1 dari dalam halaman.
+
+        Returns:
+            CapturedResponse | None: None jika belum ada templat, masih dalam
+            interval minimum, atau permintaan gagal.
+        """
+        if self.template is None:
+            return None
+        now = time.monotonic()
+        if now < self._next_allowed:
+            self.throttled += 1
+            return None
+        self._next_allowed = now + self.min_interval + self._backoff
+        url, method, headers, body = self.template
+        self.fetches += 1
+        try:
+            result = driver.execute_async_script(FETCH_SCRIPT, url, method, headers, body, int(self.timeout * 1000))
+        except WebDriverException as e:
+            return self._failed(f"execute_async_script gagal: {e}")
+        received_at = time.monotonic()
+        if not result or result.get('status') != 200:
+            return self._failed(f"status {result and result.get('status')} {result and result.get('error') or ''}")
+        # Browser sudah mendekompresi body; teks JSON didekode tanpa Content-Encoding.
+        records = decode_api_body(result.get('body', '').encode('utf-8'), {})
+        if not records:
+            return self._failed("respons tanpa rekaman")
+        self._backoff = 0.0
+        return CapturedResponse(None, records, received_at)
+
+    def _failed(self, reason):
+        self.failures += 1
+        self._backoff = min(max(self._backoff * 2, self.min_interval), self.max_backoff)
+        self._next_allowed = time.monotonic() + self.min_interval + self._backoff
+        logging.warning(f"Fetch dalam halaman gagal ({reason}); jeda {self.min_interval + self._backoff:.0f}s.")
+        return None
+
+    def stats(self):
+        return {'fetches': self.fetches, 'failures': self.failures, 'throttled': self.throttled,
+                'backoff_s': self._backoff}
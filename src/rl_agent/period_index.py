@@ -0,0 +1,191 @@
+import numpy as np
+import pandas as pd
+from src.rl_agent.records import ResultBatch
+
+INDEX_COLUMNS = {
+    'number': np.uint8,
+    'color': np.uint8,
+    'premium': np.int32,
+}
+
+
+class UpsertResult:
+    """Ringkasan hasil upsert: posisi baris yang ditambahkan, diperbarui, atau disisipkan."""
+    def __init__(self, appended=0, updated=None, inserted=None):
+        self.appended = appended
+        self.updated = updated if updated is not None else np.empty(0, dtype=np.int64)
+        self.inserted = inserted if inserted is not None else np.empty(0, dtype=np.int64)
+
+    @property
+    def append_only(self):
+        """True jika upsert hanya menambahkan baris di akhir tabel."""
+        return len(self.updated) == 0 and len(self.inserted) == 0
+
+    @property
+    def changed(self):
+        return self.appended > 0 or not self.append_only
+
+
+class PeriodIndex:
+    """
+    Tabel riwayat in-memory yang selalu terurut berdasarkan Period (int64).
+
+    Kolom disimpan sebagai array NumPy ringkas (lihat `ResultBatch`) dengan
+    kapasitas cadangan sehingga penambahan di akhir bersifat amortized O(k).
+    Batch masuk dicocokkan dengan `np.searchsorted`: Period yang sudah ada
+    dideteksi lewat indeks (tanpa drop_duplicates), Period baru yang lebih besar
+    dari maksimum ditambahkan di akhir, dan hanya Period lama yang hilang yang
+    memicu penggabungan O(n).
+    """
+    def __init__(self, capacity=1024):
+        capacity = max(int(capacity), 1)
+        self.size = 0
+        self._periods = np.empty(capacity, dtype=np.int64)
+        self._columns = {name: np.empty(capacity, dtype=dtype) for name, dtype in INDEX_COLUMNS.items()}
+
+    @classmethod
+    def from_batch(cls, batch):
+        """Membangun indeks dari `ResultBatch` (diurutkan dan dideduplikasi satu kali)."""
+        batch = batch.sorted_unique()
+        n = len(batch)
+        index = cls(capacity=n + max(1024, n // 8))
+        index._periods[:n] = batch.period
+        for name in INDEX_COLUMNS:
+            index._columns[name][:n] = getattr(batch, name)
+        index.size = n
+        return index
+
+    @classmethod
+    def from_frame(cls, df):
+        """Membangun indeks dari DataFrame riwayat."""
+        return cls.from_batch(ResultBatch.from_frame(df))
+
+    @property
+    def periods(self):
+        return self._periods[:self.size]
+
+    @property
+    def max_period(self):
+        return int(self._periods[self.size - 1]) if self.size else None
+
+    def __len__(self):
+        return self.size
+
+    def contains(self, periods):
+        """Mengembalikan mask boolean untuk Period yang sudah ada di indeks."""
+        periods = np.asarray(periods, dtype=np.int64)
+        pos = np.searchsorted(self.periods, periods)
+        found = pos < self.size
+        found[found] = self._periods[pos[found]] == periods[found]
+        return found
+
+    def upsert(self, batch):
+        """
+        Menggabungkan batch ke tabel terurut.
+
+        Args:
+            batch (ResultBatch | pd.DataFrame): Rekaman Period/Number/Color/Premium.
+
+        Returns:
+            UpsertResult: Jumlah baris yang ditambahkan di akhir serta posisi baris
+                          yang diperbarui atau disisipkan out-of-order.
+        """
+        if isinstance(batch, pd.DataFrame):
+            batch = ResultBatch.from_frame(batch)
+        batch = batch.sorted_unique()
+        if len(batch) == 0:
+            return UpsertResult()
+        periods = batch.period
+        columns = {name: getattr(batch, name) for name in INDEX_COLUMNS}
+
+        current = self.periods
+        pos = np.searchsorted(current, periods)
+        found = pos < self.size
+        found[found] = current[pos[found]] == periods[found]
+
+        # Period yang sudah ada: hanya tulis ulang jika nilainya berbeda.
+        updated = np.empty(0, dtype=np.int64)
+        if found.any():
+            hit_pos = pos[found]
+            differs = np.zeros(len(hit_pos), dtype=bool)
+            for name, values in columns.items():
+                differs |= self._columns[name][hit_pos] != values[found]
+            updated = hit_pos[differs]
+            for name, values in columns.items():
+                self._columns[name][updated] = values[found][differs]
+
+        missing = ~found
+        ahead = missing & (pos == self.size)
+        behind = missing & ~ahead
+
+        inserted = np.empty(0, dtype=np.int64)
+        if behind.any():
+            insert_at = self._merge(periods[behind], {name: values[behind] for name, values in columns.items()})
+            # Baris lama bergeser sebanyak jumlah baris yang disisipkan sebelum posisinya.
+            updated = updated + np.searchsorted(insert_at, updated, side='right')
+            inserted = insert_at + np.arange(len(insert_at))
+
+        appended = int(ahead.sum())
+        if appended:
+            self._append(periods[ahead], {name: values[ahead] for name, values in columns.items()})
+
+        return UpsertResult(appended=appended, updated=updated, inserted=inserted)
+
+    def batch(self, start=0, stop=None):
+        """Mengembalikan potongan tabel sebagai `ResultBatch` (salinan)."""
+        stop = self.size if stop is None else min(stop, self.size)
+        window = slice(max(start, 0), stop)
+        return ResultBatch(self._periods[window].copy(),
+                           *(self._columns[name][window].copy() for name in INDEX_COLUMNS))
+
+    def tail_batch(self, n):
+        return self.batch(start=self.size - n)
+
+    def to_frame(self, start=0, stop=None):
+        """Mengembalikan potongan tabel sebagai DataFrame dengan kolom final."""
+        return self.batch(start, stop).to_frame()
+
+    def tail(self, n):
+        return self.to_frame(start=self.size - n)
+
+    def rows(self, positions):
+        """Mengembalikan baris pada posisi tertentu sebagai DataFrame."""
+        positions = np.sort(np.asarray(positions, dtype=np.int64))
+        return ResultBatch(self._periods[positions], *(self._columns[name][positions] for name in INDEX_COLUMNS)).to_frame()
+
+    def _ensure_capacity(self, extra):
+        needed = self.size + extra
+        capacity = len(self._periods)
+        if needed <= capacity:
+            return
+        new_capacity = max(needed, capacity * 2)
+        self._periods = self._grow(self._periods, new_capacity)
+        self._columns = {name: self._grow(values, new_capacity) for name, values in self._columns.items()}
+
+    def _grow(self, values, capacity):
+        grown = np.empty(capacity, dtype=values.dtype)
+        grown[:self.size] = values[:self.size]
+        return grown
+
+    def _append(self, periods, columns):
+        n = len(periods)
+        self._ensure_capacity(n)
+        self._periods[self.size:self.size + n] = periods
+        for name, values in columns.items():
+            self._columns[name][self.size:self.size + n] = values
+        self.size += n
+
+    def _merge(self, periods, columns):
+        """Penggabungan dua arah untuk Period out-of-order. Mengembalikan titik sisip (posisi lama)."""
+        n = len(periods)
+        self._ensure_capacity(n)
+        current = self._periods[:self.size]
+        insert_at = np.searchsorted(current, periods)
+        merged_periods = np.insert(current, insert_at, periods)
+        merged_columns = {name: np.insert(self._columns[name][:self.size], insert_at, values)
+                          for name, values in columns.items()}
+        self.size += n
+        self._periods[:self.size] = merged_periods
+        for name, values in merged_columns.items():
+            self._columns[name][:self.size] = values
+        return insert_at
@@ -0,0 +1,209 @@
+import logging
+import time
+from collections import deque
+
+import numpy as np
+
+# Nilai bawaan untuk kunci penjadwal di blok `web_agent.scraping` config.yaml.
+DEFAULT_SCHEDULE_CONFIG = {
+    'live_schedule': 'period',
+    'period_seconds': 60,
+    'schedule_lead_seconds': 2.0,
+    'capture_deadline_seconds': 10.0,
+}
+
+
+class PeriodScheduler:
+    """
+    Penjadwal live scraping yang mengikuti batas periode Win Go (satu hasil per
+    `period_seconds`).
+
+    Fase batas periode diperkirakan dalam jam dinding lokal (detik modulo
+    `period_seconds`), sehingga offset jam server terhadap jam lokal diketahui
+    modulo satu periode:
+    - Timer `TimeLeft__C-time`: tampilan R detik pada waktu t berarti periode
+      ditutup dalam [t + R - 1, t + R + 1] (pembulatan tampilan tidak diketahui).
+      Interval dari beberapa sampel diiris sehingga estimasi makin sempit.
+    - Waktu diterimanya hasil baru: hasil tidak mungkin tiba sebelum periodenya
+      ditutup. Tanpa sampel timer, fase diambil dari hasil tercepat; hasil yang
+      tiba "sebelum" batas perkiraan menjadi batas atas interval timer (atau
+      menggeser batas lebih awal jika di luar interval).
+
+    Di antara periode, loop tidur (Event.wait) hingga `lead_seconds` (ditambah
+    ketidakpastian estimasi) sebelum batas berikutnya, lalu menangkap respons dengan tenggat `capture_deadline`
+    detik setelah batas. `stats()` melaporkan offset, lag capture (batas ->
+    respons diterima), lag ingest (batas -> tersimpan), dan jumlah periode yang
+    terlewat tenggat.
+    """
+    def __init__(self, period_seconds=60, lead_seconds=2.0, capture_deadline=10.0, lag_window=200):
+        self.period_seconds = float(period_seconds)
+        self.lead_seconds = float(lead_seconds)
+        self.capture_deadline = float(capture_deadline)
+        self.phase = None
+        self.phase_source = None
+        self.captured = 0
+        self.missed = 0
+        self._timer_bounds = None
+        self._lags = deque(maxlen=lag_window)
+        self._ingest_lags = deque(maxlen=lag_window)
+        self._pending = None
+        self._last_close = None
+        self._wall_offset = time.time() - time.monotonic()
+
+    @classmethod
+    def from_config(cls, scraping_config):
+        """Penjadwal dari `web_agent.scraping`, atau None jika `live_schedule` bukan 'period'."""
+        schedule_config = dict(DEFAULT_SCHEDULE_CONFIG, **{key: scraping_config[key] for key in DEFAULT_SCHEDULE_CONFIG
+                                                           if key in scraping_config})
+        if schedule_config['live_schedule'] != 'period':
+            return None
+        return cls(
+            period_seconds=schedule_config['period_seconds'],
+            lead_seconds=schedule_config['schedule_lead_seconds'],
+            capture_deadline=schedule_config['capture_deadline_seconds'],
+        )
+
+    # --- Estimasi offset ---
+    def to_wall(self, monotonic_time):
+        return monotonic_time + self._wall_offset
+
+    @property
+    def offset_seconds(self):
+        """
+        Pergeseran batas periode server terhadap batas kelipatan `period_seconds`
+        jam lokal, dalam [-period/2, period/2); None sebelum ada estimasi.
+        """
+        if self.phase is None:
+            return None
+        half = self.period_seconds / 2
+        return (self.phase + half) % self.period_seconds - half
+
+    def observe_timer(self, seconds_left, observed_at=None):
+        """Mencatat sampel timer UI (`seconds_left` pada waktu monotonic `observed_at`)."""
+        if seconds_left is None:
+            return
+        close = self.to_wall(time.monotonic() if observed_at is None else observed_at) + seconds_left
+        low, high = close - 1.0, close + 1.0
+        if self._timer_bounds is not None:
+            # Samakan siklus sampel dengan interval yang sudah ada sebelum diiris.
+            center = sum(self._timer_bounds) / 2
+            shift = round((center - close) / self.period_seconds) * self.period_seconds
+            low, high = max(low + shift, self._timer_bounds[0]), min(high + shift, self._timer_bounds[1])
+            if low > high:
+                logging.info("Sampel timer tidak konsisten dengan estimasi sebelumnya; estimasi offset diulang.")
+                low, high = close - 1.0, close + 1.0
+        self._timer_bounds = (low, high)
+        self.phase = ((low + high) / 2) % self.period_seconds
+        self.phase_source = 'timer'
+
+    def observe_result(self, received_at, ingested_at=None):
+        """
+        Mencatat diterimanya hasil periode baru (waktu monotonic) dan
+        mengembalikan lag capture terhadap batas periode (detik). `ingested_at`
+        (monotonic, default sekarang) adalah saat hasil tersimpan.
+        """
+        received = self.to_wall(received_at)
+        if self.phase is None:
+            self.phase = received % self.period_seconds
+            self.phase_source = 'results'
+        if self._pending is not None:
+            lag = received - self._pending
+        else:
+            half = self.period_seconds / 2
+            lag = (received - self.phase + half) % self.period_seconds - half
+        if lag < 0:
+            # Hasil tidak mungkin mendahului penutupan periodenya: batas sebenarnya lebih awal.
+            lag = self._tighten(received)
+        self._last_close = received - lag
+        self._lags.append(lag)
+        self._ingest_lags.append(lag + (time.monotonic() if ingested_at is None else ingested_at) - received_at)
+        self.captured += 1
+        self._pending = None
+        return lag
+
+    def _tighten(self, received):
+        """Menjadikan `received` batas atas penutupan periode; mengembalikan lag terhadap estimasi baru."""
+        if self._timer_bounds is not None:
+            low, high = self._timer_bounds
+            shift = round(((low + high) / 2 - received) / self.period_seconds) * self.period_seconds
+            aligned = received + shift
+            if aligned >= low:
+                self._timer_bounds = (low, min(high, aligned))
+                center = (low + min(high, aligned)) / 2
+                self.phase = center % self.period_seconds
+                return aligned - center
+        self._timer_bounds = None
+        self.phase = received % self.period_seconds
+        self.phase_source = 'results'
+        return 0.0
+
+    @property
+    def uncertainty_seconds(self):
+        """Setengah lebar interval estimasi batas periode (0 jika dari waktu hasil)."""
+        if self._timer_bounds is None:
+            return 0.0
+        return (self._timer_bounds[1] - self._timer_bounds[0]) / 2
+
+    # --- Penjadwalan ---
+    @property
+    def pending_close(self):
+        """Batas periode (waktu dinding) yang sedang ditunggu hasilnya, atau None."""
+        return self._pending
+
+    def next_close(self, now=None):
+        """Waktu dinding batas periode berikutnya, atau None sebelum ada estimasi."""
+        if self.phase is None:
+            return None
+        now = time.time() if now is None else now
+        return now + (self.phase - now) % self.period_seconds
+
+    def wait_for_window(self, stop_event, default_timeout=5.0):
+        """
+        Tidur hingga jendela capture periode berikutnya dan mengembalikan batas
+        waktu (detik) untuk satu `drain` berikutnya; None jika `stop_event` diatur.
+
+        Selama jendela capture (hingga `capture_deadline` setelah batas) belum
+        habis, tidak ada tidur tambahan. Sebelum fase diketahui dan hasil pertama
+        tertangkap, perilakunya sama dengan loop lama (timeout `default_timeout`).
+        """
+        if self.phase is None or self._last_close is None:
+            # Sampai hasil pertama tertangkap (antrean awal mungkin sudah berisi hasil), jangan tidur.
+            return None if stop_event.is_set() else default_timeout
+        now = time.time()
+        if self._pending is not None and now > self._pending + self.capture_deadline:
+            self.missed += 1
+            logging.warning(f"Hasil periode yang ditutup pada {time.strftime('%H:%M:%S', time.localtime(self._pending))} "
+                            f"tidak tertangkap dalam {self.capture_deadline:g}s.")
+            self._pending = None
+        if self._pending is None:
+            self._pending = self.next_close(now)
+            if self._last_close is not None and self._pending < self._last_close + self.period_seconds / 2:
+                # Batas yang baru saja tertangkap; tunggu batas berikutnya.
+                self._pending += self.period_seconds
+            sleep_seconds = self._pending - self.uncertainty_seconds - self.lead_seconds - now
+            if sleep_seconds > 0 and stop_event.wait(sleep_seconds):
+                return None
+        if stop_event.is_set():
+            return None
+        # Drain dalam potongan maksimal 1 detik agar stop_event tetap diperiksa.
+        return max(min(self._pending + self.capture_deadline - time.time(), 1.0), 0.05)
+
+    def stats(self):
+        lags_ms = np.array(self._lags) * 1000
+        ingest_lags_ms = np.array(self._ingest_lags) * 1000
+        stats = {
+            'offset_s': None if self.offset_seconds is None else round(self.offset_seconds, 3),
+            'offset_source': self.phase_source,
+            'offset_uncertainty_s': round(self.uncertainty_seconds, 3),
+            'captured': self.captured,
+            'missed': self.missed,
+        }
+        if len(lags_ms):
+            stats.update({
+                'capture_lag_ms_p50': float(np.percentile(lags_ms, 50)),
+                'capture_lag_ms_p95': float(np.percentile(lags_ms, 95)),
+                'capture_lag_ms_max': float(lags_ms.max()),
+                'ingest_lag_ms_p50': float(np.percentile(ingest_lags_ms, 50)),
+                'ingest_lag_ms_p95': float(np.percentile(ingest_lags_ms, 95)),
+            })
+        return stats
@@ -0,0 +1,97 @@
+import logging
+import threading
+import time
+
+
+class PredictionWorker:
+    """
+    Menjalankan prediksi di thread terpisah agar loop live scraping tidak
+    menunggu LLM.
+
+    Antrean berisi paling banyak satu job tertunda (latest-wins): job baru yang
+    masuk sebelum job sebelumnya sempat diproses menggantikannya, sehingga
+    hanya jendela data terbaru yang diprediksi. Job yang tergantikan dihitung
+    sebagai `superseded`.
+    """
+    def __init__(self, predictor, on_result=None, name='prediction-worker'):
+        self.predictor = predictor
+        self.on_result = on_result
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.superseded = 0
+        self.last_latency = None
+        self._pending = None
+        self._busy = False
+        self._stopping = False
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def submit(self, period, window):
+        """Menjadwalkan prediksi untuk `window` (jendela riwayat) tanpa memblokir pemanggil."""
+        with self._condition:
+            if self._stopping:
+                return False
+            if self._pending is not None:
+                self.superseded += 1
+                logging.debug(f"Job prediksi untuk periode {self._pending[0]} digantikan oleh {period}.")
+            self._pending = (period, window, time.monotonic())
+            self.submitted += 1
+            self._condition.notify()
+        return True
+
+    @property
+    def queue_depth(self):
+        """Jumlah job tertunda ditambah job yang sedang diproses (0..2)."""
+        with self._condition:
+            return int(self._pending is not None) + int(self._busy)
+
+    def stats(self):
+        with self._condition:
+            return {
+                'submitted': self.submitted,
+                'completed': self.completed,
+                'failed': self.failed,
+                'superseded': self.superseded,
+                'queue_depth': int(self._pending is not None) + int(self._busy),
+                'last_latency_seconds': self.last_latency,
+            }
+
+    def stop(self, timeout=None):
+        """Menghentikan worker. Job tertunda dibuang; job yang sedang berjalan ditunggu hingga `timeout`."""
+        with self._condition:
+            self._stopping = True
+            if self._pending is not None:
+                self.superseded += 1
+                self._pending = None
+            self._condition.notify()
+        self._thread.join(timeout)
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while self._pending is None and not self._stopping:
+                    self._condition.wait()
+                if self._stopping:
+                    return
+                period, window, queued_at = self._pending
+                self._pending = None
+                self._busy = True
+            started = time.monotonic()
+            try:
+                result = self.predictor.predict_next_period(window)
+                if self.on_result:
+                    self.on_result(period, result)
+                with self._condition:
+                    self.completed += 1
+            except Exception as e:
+                logging.error(f"Prediksi untuk periode {period} gagal: {e}", exc_info=True)
+                with self._condition:
+                    self.failed += 1
+            finally:
+                with self._condition:
+                    self._busy = False
+                    self.last_latency = time.monotonic() - started
+                logging.debug(f"Prediksi periode {period}: antre {started - queued_at:.2f}s, "
+                              f"proses {self.last_latency:.2f}s.")
@@ -0,0 +1,301 @@
+import logging
+import re
+import threading
+import time
+
+import numpy as np
+
+from src.rl_agent.records import ResultBatch, COLOR_LABELS, NUMBER_COLORS
+
+PREDICTOR_CHOICES = ['stats', 'lgbm', 'gemini-2.5-flash', 'gemini-2.5-pro']
+
+# Label Inggris dicari lebih dulu karena judul seperti "Besar/Kecil:" memuat kedua kata Indonesia.
+_LABEL_PATTERNS = (re.compile(r'\b(big|small)\b', re.IGNORECASE), re.compile(r'\b(besar|kecil)\b', re.IGNORECASE))
+_LABELS = {'big': 'Big', 'besar': 'Big', 'small': 'Small', 'kecil': 'Small'}
+
+
+class PredictionFailure(str):
+    """
+    Teks error yang dikembalikan predictor saat gagal membuat prediksi atau
+    laporan (mis. kuota, autentikasi, jaringan, respons kosong). Tetap berupa
+    str agar pemanggil lama dapat menampilkannya, tetapi FallbackPredictor
+    mengenalinya sebagai kegagalan.
+    """
+
+
+def parse_big_small(text):
+    """Mengambil label Big/Small pertama dari bagian PREDICTION teks prediksi (None jika tidak ada)."""
+    if not text:
+        return None
+    marker = max(text.find('--- PREDICTION ---'), 0)
+    for pattern in _LABEL_PATTERNS:
+        match = pattern.search(text, marker)
+        if match:
+            return _LABELS[match.group(1).lower()]
+    return None
+
+
+class Predictor:
+    """
+    Antarmuka predictor yang dipakai DataScraper, PredictionWorker, dan scraper_shell.
+
+    - predict_next_period(window): window berupa ResultBatch (atau DataFrame)
+      terurut lama->baru; mengembalikan teks prediksi, atau PredictionFailure
+      jika gagal.
+    - generate_holistic_report(new_data): laporan teks bebas untuk data baru.
+    - predict_label(window): 'Big'/'Small' (dipakai evaluasi walk-forward).
+    - fit(history): opsional, dipanggil dengan data latih setiap fold.
+    - close(): opsional, melepas sumber daya (mis. menyimpan cache).
+    - context_rows: jumlah baris riwayat yang sebaiknya diberikan sebagai window.
+    """
+    name = 'base'
+    context_rows = 200
+
+    def predict_next_period(self, window):
+        raise NotImplementedError
+
+    def predict_label(self, window):
+        return parse_big_small(self.predict_next_period(window))
+
+    def fit(self, history):
+        pass
+
+    def close(self):
+        pass
+
+    def generate_holistic_report(self, new_data):
+        raise NotImplementedError
+
+
+class StatisticalPredictor(Predictor):
+    """
+    Predictor lokal berbasis statistik vektor NumPy, tanpa jaringan.
+
+    Tiga sinyal dihitung dari window riwayat:
+      - frekuensi angka (bincount dengan smoothing Laplace),
+      - transisi Markov orde-1 angka -> angka berikutnya dari angka terakhir,
+      - hazard streak Besar/Kecil: peluang streak saat ini berlanjut, dihitung
+        dari panjang run yang sudah selesai di window.
+    Peluang Big adalah campuran berbobot ketiga sinyal; distribusi angka
+    (Markov + frekuensi) diskalakan agar massa Big/Small sesuai peluang tersebut.
+    """
+    name = 'stats'
+
+    def __init__(self, config=None):
+        stats_config = ((config or {}).get('predictor') or {}).get('stats') or {}
+        self.context_rows = int(stats_config.get('context_rows', 2000))
+        self.smoothing = float(stats_config.get('smoothing', 1.0))
+        weights = stats_config.get('weights') or {}
+        self.weights = {
+            'markov': float(weights.get('markov', 0.4)),
+            'frequency': float(weights.get('frequency', 0.2)),
+            'streak': float(weights.get('streak', 0.4)),
+        }
+
+    def predict_proba(self, window):
+        """
+        Menghitung statistik dan peluang untuk periode berikutnya.
+
+        Returns:
+            dict: next_period, p_big, number_probs (10,), number, color, serta
+                  komponen markov/frequency/streak; None jika window kosong.
+        """
+        if not isinstance(window, ResultBatch):
+            window = ResultBatch.from_frame(window)
+        numbers = window.number[-self.context_rows:].astype(np.int64) % 10
+        if len(numbers) == 0:
+            return None
+        alpha = self.smoothing
+
+        frequency = np.bincount(numbers, minlength=10) + alpha
+        p_frequency = frequency / frequency.sum()
+
+        transitions = np.bincount(numbers[:-1] * 10 + numbers[1:], minlength=100).reshape(10, 10) + alpha
+        last = numbers[-1]
+        p_markov = transitions[last] / transitions[last].sum()
+
+        # Panjang run Besar/Kecil; run terakhir adalah streak yang sedang berjalan.
+        big = numbers >= 5
+        boundaries = np.flatnonzero(big[1:] != big[:-1]) + 1
+        run_lengths = np.diff(np.concatenate(([0], boundaries, [len(numbers)])))
+        streak = int(run_lengths[-1])
+        completed = run_lengths[:-1]
+        reached = np.count_nonzero(completed >= streak)
+        continued = np.count_nonzero(completed > streak)
+        p_continue = (continued + 0.5 * alpha) / (reached + alpha)
+        p_big_streak = p_continue if big[-1] else 1.0 - p_continue
+
+        components = {
+            'markov': p_markov[5:].sum(),
+            'frequency': p_frequency[5:].sum(),
+            'streak': p_big_streak,
+        }
+        total_weight = sum(self.weights.values()) or 1.0
+        p_big = sum(self.weights[name] * value for name, value in components.items()) / total_weight
+
+        number_weight = (self.weights['markov'] + self.weights['frequency']) or 1.0
+        p_number = (self.weights['markov'] * p_markov + self.weights['frequency'] * p_frequency) / number_weight
+        p_number[5:] *= p_big / p_number[5:].sum()
+        p_number[:5] *= (1.0 - p_big) / p_number[:5].sum()
+        number = int(np.argmax(p_number))
+
+        return {
+            'next_period': int(window.period[-1]) + 1,
+            'p_big': float(p_big),
+            'number_probs': p_number,
+            'number': number,
+            'color': COLOR_LABELS[NUMBER_COLORS[number]],
+            'streak': (('Big' if big[-1] else 'Small'), streak, float(p_continue)),
+            'components': {name: float(value) for name, value in components.items()},
+            'last_number': int(last),
+            'rows': len(numbers),
+        }
+
+    def predict_label(self, window):
+        result = self.predict_proba(window)
+        if result is None:
+            return None
+        return 'Big' if result['p_big'] >= 0.5 else 'Small'
+
+    def predict_next_period(self, window):
+        result = self.predict_proba(window)
+        if result is None:
+            return "--- PREDICTION ---\nTidak ada data untuk diprediksi."
+        big_small = 'Big' if result['p_big'] >= 0.5 else 'Small'
+        confidence = max(result['p_big'], 1.0 - result['p_big'])
+        top = np.argsort(result['number_probs'])[::-1][:3]
+        side, streak, p_continue = result['streak']
+        components = result['components']
+        return (
+            f"--- PREDICTION ---\n"
+            f"Periode: {result['next_period']}\n"
+            f"Besar/Kecil: {big_small} (p={confidence:.3f})\n"
+            f"Angka: {result['number']} | 3 teratas: "
+            + ', '.join(f"{n} ({result['number_probs'][n]:.3f})" for n in top) + "\n"
+            f"Warna: {result['color']}\n"
+            f"Dasar ({result['rows']} periode): Markov P(Big|{result['last_number']})={components['markov']:.3f}, "
+            f"frekuensi P(Big)={components['frequency']:.3f}, "
+            f"streak {side} x{streak} P(lanjut)={p_continue:.3f}"
+        )
+
+    def generate_holistic_report(self, new_data):
+        return f"Predictor statistik lokal menerima data baru: {new_data}. Gunakan predict_next_period untuk prediksi."
+
+
+class FallbackPredictor(Predictor):
+    """
+    Membungkus predictor LLM agar setiap periode tetap mendapat prediksi.
+
+    `predict_next_period` dijalankan di thread terpisah dengan batas
+    `latency_budget` detik (None/0 = tanpa batas). Jika predictor utama gagal
+    (melempar exception atau mengembalikan PredictionFailure, mis. kuota habis)
+    atau melewati batas, prediksi diambil dari
+    StatisticalPredictor. Panggilan yang melewati batas tidak dapat dibatalkan;
+    selama panggilan itu belum selesai, periode berikutnya langsung memakai
+    predictor statistik. Atribut lain (mis. `cache_stats`) diteruskan ke
+    predictor utama.
+    """
+    def __init__(self, primary, fallback, latency_budget=None):
+        self.primary = primary
+        self.fallback = fallback
+        self.latency_budget = float(latency_budget) if latency_budget else None
+        self.name = primary.name
+        self.context_rows = primary.context_rows
+        self.calls = 0
+        self.fallbacks = {'error': 0, 'timeout': 0, 'busy': 0}
+        self._inflight = None  # Event selesai dari panggilan utama yang masih berjalan
+
+    def __getattr__(self, name):
+        if name == 'primary':
+            raise AttributeError(name)
+        return getattr(self.primary, name)
+
+    def predict_next_period(self, window):
+        self.calls += 1
+        if self._inflight is not None and not self._inflight.is_set():
+            return self._fall_back('busy', window, "panggilan sebelumnya belum selesai")
+        outcome = {}
+        done = threading.Event()
+
+        def call():
+            try:
+                outcome['result'] = self.primary.predict_next_period(window)
+            except Exception as e:
+                outcome['error'] = e
+            finally:
+                done.set()
+
+        started = time.monotonic()
+        threading.Thread(target=call, name=f'{self.name}-predict', daemon=True).start()
+        if not done.wait(self.latency_budget):
+            self._inflight = done
+            return self._fall_back('timeout', window, f"melewati batas {self.latency_budget:g}s")
+        if 'error' in outcome:
+            return self._fall_back('error', window, outcome['error'])
+        if isinstance(outcome['result'], PredictionFailure):
+            return self._fall_back('error', window, outcome['result'])
+        logging.debug(f"Prediksi {self.name} selesai dalam {time.monotonic() - started:.2f}s.")
+        return outcome['result']
+
+    def _fall_back(self, reason, window, detail):
+        self.fallbacks[reason] += 1
+        logging.warning(f"Predictor '{self.name}' tidak tersedia ({detail}); memakai predictor statistik lokal.")
+        return self.fallback.predict_next_period(window)
+
+    def fit(self, history):
+        self.primary.fit(history)
+        self.fallback.fit(history)
+
+    def close(self):
+        self.primary.close()
+
+    def generate_holistic_report(self, new_data):
+        report = self.primary.generate_holistic_report(new_data)
+        if isinstance(report, PredictionFailure):
+            self.fallbacks['error'] += 1
+            logging.warning(f"Laporan '{self.name}' gagal ({report}); memakai predictor statistik lokal.")
+            return self.fallback.generate_holistic_report(new_data)
+        return report
+
+    def fallback_stats(self):
+        return {'calls': self.calls, 'fallbacks': dict(self.fallbacks), 'latency_budget_seconds': self.latency_budget}
+
+
+def create_predictor(model, config=None):
+    """
+    Membuat predictor berdasarkan nama model (`--model` di scraper_shell).
+
+    Args:
+        model (str): 'stats', 'lgbm', atau nama model Gemini (mis. 'gemini-2.5-flash').
+        config (dict, optional): Konfigurasi lengkap dari config.yaml.
+
+    Returns:
+        Predictor atau None jika `model` kosong. Jika Gemini/LightGBM gagal
+        diinisialisasi (mis. API key atau file model tidak ada) dan
+        `predictor.fallback_to_stats` aktif, mengembalikan StatisticalPredictor.
+        Predictor Gemini dibungkus FallbackPredictor jika
+        `predictor.runtime_fallback` juga aktif.
+    """
+    if not model:
+        return None
+    predictor_config = (config or {}).get('predictor') or {}
+    if model == 'stats':
+        return StatisticalPredictor(config)
+    if model == 'lgbm' or model.startswith('gemini'):
+        try:
+            # Diimpor di sini agar predictor statistik tidak membutuhkan paket Google AI atau LightGBM.
+            if model == 'lgbm':
+                from src.rl_agent.forecaster import LightGBMPredictor
+                return LightGBMPredictor(config)
+            from src.rl_agent.gemini_predictor import GeminiPredictor
+            predictor = GeminiPredictor(model_name=model, config=config)
+        except Exception as e:
+            if predictor_config.get('fallback_to_stats', True):
+                logging.warning(f"Predictor '{model}' gagal diinisialisasi ({e}); memakai predictor statistik lokal.")
+                return StatisticalPredictor(config)
+            raise
+        if predictor_config.get('fallback_to_stats', True) and predictor_config.get('runtime_fallback', True):
+            return FallbackPredictor(predictor, StatisticalPredictor(config),
+                                     predictor_config.get('latency_budget_seconds', 30))
+        return predictor
+    raise ValueError(f"Model predictor tidak dikenal: '{model}'. Pilihan: {', '.join(PREDICTOR_CHOICES)}")
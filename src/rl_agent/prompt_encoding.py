@@ -0,0 +1,239 @@
+import math
+import time
+from collections import deque
+from itertools import islice
+
+import numpy as np
+
+from src.rl_agent.records import ResultBatch, COLOR_RED, COLOR_GREEN, COLOR_VIOLET, NUMBER_COLORS
+
+# Huruf warna, hanya ditulis jika ada baris yang tidak mengikuti NUMBER_COLORS.
+COLOR_LETTERS = {COLOR_RED: 'r', COLOR_GREEN: 'g', COLOR_RED | COLOR_VIOLET: 'R', COLOR_GREEN | COLOR_VIOLET: 'G'}
+
+ENCODINGS = ('table', 'csv', 'compact')
+
+
+def estimate_tokens(text):
+    """
+    Perkiraan kasar jumlah token: ~4 karakter per token untuk teks biasa.
+    Cukup untuk membandingkan ukuran relatif antar encoding, bukan tagihan pasti.
+    """
+    return math.ceil(len(text) / 4) if text else 0
+
+
+def encode_table(batch):
+    """Encoding lama: DataFrame.to_string(index=False)."""
+    return batch.to_frame().to_string(index=False)
+
+
+def encode_csv(batch):
+    """CSV minimal Period,Number (warna dan Besar/Kecil diturunkan dari angka)."""
+    lines = ['Period,Number']
+    lines.extend(f"{period},{number}" for period, number in zip(batch.period.tolist(), batch.number.tolist()))
+    return '\n'.join(lines)
+
+
+# Hash 64-bit per baris (Period, angka, warna). Jumlahnya (mod 2^64) untuk seluruh
+# baris yang sudah dienkode dibandingkan dengan jumlah vektor dari jendela baru,
+# sehingga koreksi di tengah jendela terdeteksi tanpa membandingkan baris satu per satu.
+_HASH_MASK = (1 << 64) - 1
+_HASH_PERIOD = np.uint64(0x9E3779B97F4A7C15)
+_HASH_VALUE = np.uint64(0xC2B2AE3D27D4EB4F)
+
+
+def _row_hashes(batch):
+    """Hash uint64 per baris; perkalian uint64 numpy membungkus mod 2^64."""
+    with np.errstate(over='ignore'):
+        values = (batch.number.astype(np.uint64) << np.uint64(8)) | batch.color.astype(np.uint64)
+        mixed = (batch.period.astype(np.uint64) * _HASH_PERIOD) ^ (values * _HASH_VALUE)
+        return mixed ^ (mixed >> np.uint64(29))
+
+
+def _hash_sum(hashes):
+    return int(hashes.sum(dtype=np.uint64)) if len(hashes) else 0
+
+
+class CompactPromptEncoder:
+    """
+    Encoding ringkas untuk jendela riwayat yang diperbarui secara inkremental.
+
+    Bentuk keluaran:
+      - Period awal + selisih: hanya lompatan yang bukan +1 yang ditulis.
+      - Angka sebagai satu string digit (lama -> baru).
+      - Streak Besar/Kecil dalam run-length (mis. B3 S1 B2).
+      - Warna hanya ditulis eksplisit jika tidak mengikuti aturan standar.
+
+    Potongan teks disimpan per baris/run dalam deque (digit, huruf warna, token
+    streak, lompatan Period), sehingga `sync` hanya menambah di akhir dan
+    membuang di awal, dan `render` cukup menggabungkan potongan tersebut tanpa
+    memformat ulang jendela; teksnya di-cache sampai jendela berubah.
+
+    Pemeriksaan tumpang tindih hanya membandingkan baris terakhir yang sudah
+    dienkode secara langsung; sisa jendela diverifikasi lewat jumlah hash per
+    baris. Jika bagian yang sudah dienkode tidak sama (koreksi data, celah yang
+    terisi, jendela melebar ke belakang), encoder dibangun ulang dari awal.
+    """
+    def __init__(self, window=200):
+        self.window = window
+        self.rebuilds = 0
+        self.incremental_updates = 0
+        self.reset()
+
+    def reset(self):
+        self._periods = deque()
+        self._digits = deque()
+        self._letters = deque()
+        self._hashes = deque()
+        self._runs = deque()  # [label, panjang]
+        self._run_tokens = deque()  # teks run, mis. 'B3', sejajar dengan _runs
+        self._gaps = deque()  # (ordinal, period) untuk baris yang bukan +1 dari baris sebelumnya
+        self._next_ordinal = 0
+        self._hash_total = 0
+        self._nonstandard_colors = 0
+        self._rendered = None
+
+    def __len__(self):
+        return len(self._periods)
+
+    @property
+    def last_period(self):
+        return self._periods[-1] if self._periods else None
+
+    def sync(self, window):
+        """Menyelaraskan encoder dengan `window` (ResultBatch terurut, terbaru di akhir)."""
+        if not isinstance(window, ResultBatch):
+            window = ResultBatch.from_frame(window)
+        window = window[-self.window:] if len(window) > self.window else window
+        if not len(window):
+            self.reset()
+            return self
+        hashes = _row_hashes(window)
+        start = self._overlap(window, hashes)
+        if start is None:
+            self.reset()
+            self.rebuilds += 1
+            start = 0
+        elif start < len(window):
+            self.incremental_updates += 1
+        for period, number, color, row_hash in zip(window.period[start:].tolist(), window.number[start:].tolist(),
+                                                   window.color[start:].tolist(), hashes[start:].tolist()):
+            self._push(period, number, color, row_hash)
+        while len(self._periods) > len(window):
+            self._pop()
+        return self
+
+    def _overlap(self, window, hashes):
+        """Posisi baris pertama yang belum ada di encoder, atau None jika harus dibangun ulang."""
+        if not self._periods:
+            return None
+        last = self._periods[-1]
+        start = int(np.searchsorted(window.period, last, side='right'))
+        if start == 0 or start > len(self._periods):
+            return None
+        # Ujung: baris terakhir yang sudah dienkode harus sama persis.
+        tail = start - 1
+        if int(window.period[tail]) != last or int(hashes[tail]) != self._hashes[-1]:
+            return None
+        # Sisa tumpang tindih: jumlah hash baris yang akan tetap ada harus sama
+        # dengan jumlah hash window[:start] (celah terisi atau koreksi di tengah jendela).
+        skip = len(self._periods) - start
+        if skip <= start:
+            kept = self._hash_total - sum(islice(self._hashes, skip))
+        else:
+            kept = sum(islice(self._hashes, skip, None))
+        if kept & _HASH_MASK != _hash_sum(hashes[:start]):
+            return None
+        return start
+
+    def _push(self, period, number, color, row_hash):
+        if self._periods and period - self._periods[-1] != 1:
+            self._gaps.append((self._next_ordinal, period))
+        self._next_ordinal += 1
+        self._periods.append(period)
+        self._digits.append(str(number))
+        self._letters.append(COLOR_LETTERS.get(color, '?'))
+        self._hashes.append(row_hash)
+        self._hash_total = (self._hash_total + row_hash) & _HASH_MASK
+        if color != NUMBER_COLORS[number % 10]:
+            self._nonstandard_colors += 1
+        label = 'B' if number >= 5 else 'S'
+        if self._runs and self._runs[-1][0] == label:
+            self._runs[-1][1] += 1
+            self._run_tokens[-1] = f"{label}{self._runs[-1][1]}"
+        else:
+            self._runs.append([label, 1])
+            self._run_tokens.append(f"{label}1")
+        self._rendered = None
+
+    def _pop(self):
+        self._periods.popleft()
+        number = int(self._digits.popleft())
+        letter = self._letters.popleft()
+        self._hash_total = (self._hash_total - self._hashes.popleft()) & _HASH_MASK
+        # Lompatan baris pertama yang baru relatif terhadap baris yang dibuang tidak lagi ditulis.
+        first_ordinal = self._next_ordinal - len(self._periods)
+        while self._gaps and self._gaps[0][0] <= first_ordinal:
+            self._gaps.popleft()
+        if letter != COLOR_LETTERS[int(NUMBER_COLORS[number % 10])]:
+            self._nonstandard_colors -= 1
+        self._runs[0][1] -= 1
+        if self._runs[0][1] == 0:
+            self._runs.popleft()
+            self._run_tokens.popleft()
+        else:
+            self._run_tokens[0] = f"{self._runs[0][0]}{self._runs[0][1]}"
+        self._rendered = None
+
+    def render(self):
+        if not self._periods:
+            return "Tidak ada data."
+        if self._rendered is not None:
+            return self._rendered
+        first_ordinal = self._next_ordinal - len(self._periods)
+        gaps = ' '.join(f"#{ordinal - first_ordinal}={period}" for ordinal, period in self._gaps)
+        lines = [
+            f"{len(self._periods)} periode, urut lama->baru.",
+            f"Period awal: {self._periods[0]}; tiap baris berikutnya +1"
+            + (f" kecuali {gaps}." if gaps else "."),
+            f"Angka: {''.join(self._digits)}",
+            "Streak Besar(B=5-9)/Kecil(S=0-4): " + ' '.join(self._run_tokens),
+        ]
+        if self._nonstandard_colors:
+            lines.append(f"Warna (r=merah, g=hijau, R/G=+ungu): {''.join(self._letters)}")
+        else:
+            lines.append("Warna mengikuti aturan standar: 0=merah+ungu, 5=hijau+ungu, genap=merah, ganjil=hijau.")
+        self._rendered = '\n'.join(lines)
+        return self._rendered
+
+
+def encoding_report(window, encodings=ENCODINGS, ttft=None):
+    """
+    Membandingkan ukuran dan waktu bangun setiap encoding untuk satu jendela.
+
+    Args:
+        ttft (callable, optional): `ttft(text) -> detik` hingga token pertama
+            diterima untuk prompt berisi `text` (mis. panggilan streaming ke
+            model, atau model latensi tiruan di benchmark).
+
+    Returns:
+        dict: {encoding: {'chars', 'tokens_est', 'build_ms'}}, ditambah 'ttft_ms' jika `ttft` diberikan.
+    """
+    if not isinstance(window, ResultBatch):
+        window = ResultBatch.from_frame(window)
+    builders = {
+        'table': encode_table,
+        'csv': encode_csv,
+        'compact': lambda batch: CompactPromptEncoder(window=len(batch)).sync(batch).render(),
+    }
+    report = {}
+    for name in encodings:
+        started = time.perf_counter()
+        text = builders[name](window)
+        report[name] = {
+            'chars': len(text),
+            'tokens_est': estimate_tokens(text),
+            'build_ms': (time.perf_counter() - started) * 1000,
+        }
+        if ttft is not None:
+            report[name]['ttft_ms'] = ttft(text) * 1000
+    return report
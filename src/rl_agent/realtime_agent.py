@@ -4,13 +4,13 @@ import os
 import queue
 import pandas as pd
 import threading
-from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
 
 from src.rl_agent.browser_manager import BrowserManager
 from src.rl_agent.data_scraper import DataScraper
+from src.rl_agent.ui_state import SelectorRegistry
 
 class RealtimeAgent:
     """
@@ -29,19 +29,16 @@ class RealtimeAgent:
         self.timeouts = self.web_agent_config.get('timeouts', {})
         self.timers = self.web_agent_config.get('timers', {})
         self.xpaths = self.web_agent_config.get('xpaths', {})
+        self.selectors = SelectorRegistry.from_config(self.xpaths)
         self.browser_manager = BrowserManager(config)
         self.data_scraper = None
 
     def _get_selector(self, category, name):
-        try:
-            selector_config = self.xpaths[category][name]
-            by_str = selector_config.get('by', 'XPATH').upper()
-            by = getattr(By, by_str)
-            value = selector_config.get('value')
-            return by, value
-        except KeyError:
+        locator = self.selectors.get(category, name)
+        if locator is None:
             logging.error(f"Selector untuk '{category}.{name}' tidak ditemukan di config.yaml.")
             return None, None
+        return locator
 
     def _initialize_modules(self):
         logging.info("Menginisialisasi modul-modul agen...")
@@ -52,7 +49,7 @@ class RealtimeAgent:
         
         self.data_scraper = DataScraper(driver, self.config)
                     
-        if not self.browser_manager.login(phone=self.phone, password=self.password) or not self.browser_manager.navigate_to_game():
+        if not self.browser_manager.start_session(phone=self.phone, password=self.password):
             logging.error("Gagal login atau navigasi ke game. Agen berhenti.")
             return False
             
@@ -69,8 +66,8 @@ class RealtimeAgent:
 
             self.data_scraper = DataScraper(driver, self.config)
             
-            # Teruskan kredensial ke metode login
-            if not self.browser_manager.login(phone=self.phone, password=self.password) or not self.browser_manager.navigate_to_game():
+            # Teruskan kredensial ke metode login (dilewati jika sesi tersimpan masih valid)
+            if not self.browser_manager.start_session(phone=self.phone, password=self.password):
                 logging.error("Gagal login atau navigasi untuk scraping.")
                 return
 
@@ -98,7 +95,7 @@ class RealtimeAgent:
 
             self.data_scraper = DataScraper(driver, self.config, self.gemini_predictor)
             
-            if not self.browser_manager.login(phone=self.phone, password=self.password) or not self.browser_manager.navigate_to_game():
+            if not self.browser_manager.start_session(phone=self.phone, password=self.password):
                 logging.error("Gagal login atau navigasi untuk live scraping.")
                 return
 
@@ -0,0 +1,249 @@
+import functools
+
+import numpy as np
+import pandas as pd
+
+# Period Win Go berformat YYYYMMDD + kode game (5 digit) + urutan harian (4 digit),
+# misalnya 20250719 10001 0279. Semua bagian dapat diambil dengan aritmetika int64.
+SEQUENCE_DIGITS = 4
+GAME_CODE_DIGITS = 5
+WIN_GO_1MIN = 10001
+
+COLOR_RED = 1
+COLOR_GREEN = 2
+COLOR_VIOLET = 4
+_COLOR_BITS = (('red', COLOR_RED), ('green', COLOR_GREEN), ('violet', COLOR_VIOLET))
+# Label teks untuk setiap kombinasi bitmask (0..7), mis. 5 -> "red,violet".
+COLOR_LABELS = np.array(
+    [','.join(name for name, bit in _COLOR_BITS if mask & bit) or None for mask in range(8)],
+    dtype=object,
+)
+MISSING_PREMIUM = -1
+# Warna resmi untuk setiap Number: 0 merah+ungu, 5 hijau+ungu, genap merah, ganjil hijau.
+NUMBER_COLORS = np.array(
+    [COLOR_RED | COLOR_VIOLET, COLOR_GREEN, COLOR_RED, COLOR_GREEN, COLOR_RED,
+     COLOR_GREEN | COLOR_VIOLET, COLOR_RED, COLOR_GREEN, COLOR_RED, COLOR_GREEN],
+    dtype=np.uint8,
+)
+PERIODS_PER_DAY = 1440  # Win Go 1Min: satu periode per menit
+
+RESULT_COLUMNS = ['Period', 'Number', 'Big/Small', 'Color', 'Premium']
+
+
+def period_game_code(periods):
+    """Kode game dari Period (mis. 10001), dihitung secara vektor."""
+    return (np.asarray(periods, dtype=np.int64) // 10 ** SEQUENCE_DIGITS) % 10 ** GAME_CODE_DIGITS
+
+
+def period_sequence(periods):
+    """Nomor urut harian dari Period."""
+    return np.asarray(periods, dtype=np.int64) % 10 ** SEQUENCE_DIGITS
+
+
+def period_date(periods):
+    """Tanggal Period sebagai integer YYYYMMDD."""
+    return np.asarray(periods, dtype=np.int64) // 10 ** (SEQUENCE_DIGITS + GAME_CODE_DIGITS)
+
+
+def encode_color(label):
+    """Mengubah label warna seperti 'red,violet' menjadi bitmask."""
+    if not isinstance(label, str):
+        return 0
+    mask = 0
+    for part in label.lower().split(','):
+        for name, bit in _COLOR_BITS:
+            if part.strip() == name:
+                mask |= bit
+    return mask
+
+
+def encode_colors(labels):
+    """Versi vektor dari `encode_color`: label unik di-encode sekali lalu dipetakan."""
+    labels = pd.Series(labels, dtype=object)
+    codes, uniques = pd.factorize(labels, use_na_sentinel=True)
+    table = np.array([encode_color(label) for label in uniques] + [0], dtype=np.uint8)
+    return table[codes]  # kode -1 (NA) mengambil elemen terakhir (0)
+
+
+def decode_colors(masks):
+    """Mengubah array bitmask kembali menjadi label teks."""
+    return COLOR_LABELS[np.asarray(masks, dtype=np.uint8) & 7]
+
+
+def _to_int64(values, missing=None):
+    """Konversi kolom (int, float, atau string angka) ke int64; nilai kosong diganti `missing`."""
+    values = np.asarray(values)
+    if values.dtype.kind in 'iu':
+        return values.astype(np.int64, copy=False)
+    if missing is None:
+        # int() menjaga presisi Period 17 digit yang akan hilang bila melalui float64.
+        return np.fromiter((int(v) for v in values), dtype=np.int64, count=len(values))
+    numeric = pd.to_numeric(values, errors='coerce')
+    return np.where(pd.isna(numeric), missing, numeric).astype(np.int64)
+
+
+@functools.lru_cache(maxsize=64)
+def _color_mask(label):
+    # API hanya memakai segelintir label warna; hasil encode di-cache per label.
+    return encode_color(label)
+
+
+def _column_int64(values, missing=None):
+    """Kolom JSON (int atau string angka) ke int64 lewat konversi numpy; kosong/None diganti `missing`."""
+    try:
+        return np.array(values).astype(np.int64)
+    except (TypeError, ValueError):
+        if missing is None:
+            raise
+    return np.fromiter((int(v) if v not in (None, '') else missing for v in values), dtype=np.int64, count=len(values))
+
+
+def records_to_columns(records):
+    """
+    Dekode kolumnar: daftar rekaman JSON API langsung menjadi array per kolom,
+    tanpa objek per baris atau DataFrame.
+
+    Returns:
+        dict: 'period' (int64), 'number' (uint8), 'colour' (uint8 bitmask), 'premium' (int32, MISSING_PREMIUM jika kosong).
+    """
+    n = len(records)
+    return {
+        'period': _column_int64([r['issueNumber'] for r in records]),
+        'number': _column_int64([r['number'] for r in records]).astype(np.uint8),
+        'colour': np.fromiter(map(_color_mask, [r.get('colour') for r in records]), dtype=np.uint8, count=n),
+        'premium': _column_int64([r.get('premium') for r in records], missing=MISSING_PREMIUM).astype(np.int32),
+    }
+
+
+class ResultBatch:
+    """
+    Batch hasil game berbasis array dengan skema Period/Number/Big-Small/Color/Premium.
+
+    - period  : int64 (kode game dan urutan diambil secara aritmetika)
+    - number  : uint8
+    - color   : uint8 bitmask (COLOR_RED | COLOR_GREEN | COLOR_VIOLET)
+    - premium : int32 (MISSING_PREMIUM jika tidak ada)
+    Big/Small tidak disimpan; diturunkan dari `number` saat dibutuhkan.
+    Satu baris memakan 14 byte, dibanding ratusan byte untuk baris pandas berdtype object.
+    """
+    __slots__ = ('period', 'number', 'color', 'premium')
+
+    def __init__(self, period, number, color, premium):
+        self.period = np.asarray(period, dtype=np.int64)
+        self.number = np.asarray(number, dtype=np.uint8)
+        self.color = np.asarray(color, dtype=np.uint8)
+        self.premium = np.asarray(premium, dtype=np.int32)
+
+    @classmethod
+    def empty(cls):
+        return cls(np.empty(0, np.int64), np.empty(0, np.uint8), np.empty(0, np.uint8), np.empty(0, np.int32))
+
+    @classmethod
+    def from_records(cls, records):
+        """Membangun batch dari daftar rekaman API (`issueNumber`, `number`, `colour`, `premium`)."""
+        if not records:
+            return cls.empty()
+        return cls.from_columns(records_to_columns(records))
+
+    @classmethod
+    def from_columns(cls, columns):
+        """Membangun batch dari keluaran `records_to_columns`."""
+        return cls(columns['period'], columns['number'], columns['colour'], columns['premium'])
+
+    @classmethod
+    def from_frame(cls, df):
+        """Membangun batch dari DataFrame berkolom Period/Number/Color/Premium."""
+        n = len(df)
+        if not n:
+            return cls.empty()
+        color = encode_colors(df['Color'].to_numpy()) if 'Color' in df.columns else np.zeros(n, dtype=np.uint8)
+        if 'Premium' in df.columns:
+            premium = _to_int64(df['Premium'].to_numpy(), missing=MISSING_PREMIUM)
+        else:
+            premium = np.full(n, MISSING_PREMIUM, dtype=np.int32)
+        return cls(_to_int64(df['Period'].to_numpy()), _to_int64(df['Number'].to_numpy()), color, premium)
+
+    @classmethod
+    def concat(cls, batches):
+        batches = [b for b in batches if len(b)]
+        if not batches:
+            return cls.empty()
+        return cls(*(np.concatenate([getattr(b, name) for b in batches]) for name in cls.__slots__))
+
+    def __len__(self):
+        return len(self.period)
+
+    def __getitem__(self, key):
+        """Slice, mask boolean, atau array indeks menghasilkan batch baru."""
+        if isinstance(key, (int, np.integer)):
+            key = slice(key, key + 1 if key != -1 else None)
+        return ResultBatch(self.period[key], self.number[key], self.color[key], self.premium[key])
+
+    @property
+    def nbytes(self):
+        return sum(getattr(self, name).nbytes for name in self.__slots__)
+
+    @property
+    def game_code(self):
+        return period_game_code(self.period)
+
+    @property
+    def sequence(self):
+        return period_sequence(self.period)
+
+    @property
+    def is_big(self):
+        return self.number >= 5
+
+    @property
+    def big_small(self):
+        """Label 'Big'/'Small' yang diturunkan dari Number."""
+        return np.where(self.is_big, 'Big', 'Small').astype(object)
+
+    @property
+    def color_labels(self):
+        return decode_colors(self.color)
+
+    def filter_game(self, game_code=WIN_GO_1MIN):
+        """Hanya menyisakan baris untuk kode game tertentu (operasi integer vektor)."""
+        mask = self.game_code == game_code
+        return self if mask.all() else self[mask]
+
+    def sorted_unique(self):
+        """Mengurutkan berdasarkan Period dan mempertahankan kemunculan terakhir untuk Period ganda."""
+        period = self.period
+        if len(period) < 2 or np.all(period[1:] > period[:-1]):
+            return self
+        order = np.argsort(period, kind='stable')
+        ordered = self[order]
+        keep = np.append(ordered.period[1:] != ordered.period[:-1], True)
+        return ordered[keep]
+
+    def to_frame(self):
+        """Mengubah batch menjadi DataFrame dengan kolom final (untuk CSV/tampilan)."""
+        premium = pd.array(self.premium.astype(np.int64), dtype='Int64')
+        premium[self.premium == MISSING_PREMIUM] = pd.NA
+        return pd.DataFrame({
+            'Period': self.period.copy(),
+            'Number': self.number.astype(np.int64),
+            'Big/Small': self.big_small,
+            'Color': self.color_labels,
+            'Premium': premium,
+        }, columns=RESULT_COLUMNS)
+
+
+def synthetic_history(n_rows, seed=0, start_date='2025-01-01', game_code=WIN_GO_1MIN):
+    """
+    Riwayat sintetis sepanjang `n_rows` dengan format Period asli (1440 periode
+    per hari mulai `start_date`), Number acak seragam, dan warna sesuai Number.
+    Dipakai server API tiruan dan benchmark bila riwayat rekaman tidak tersedia.
+    """
+    rng = np.random.default_rng(seed)
+    index = np.arange(n_rows, dtype=np.int64)
+    day = index // PERIODS_PER_DAY
+    calendar = np.datetime64(start_date, 'D') + np.arange(int(day[-1]) + 1 if n_rows else 0)
+    dates = np.array([d.year * 10000 + d.month * 100 + d.day for d in calendar.astype(object)], dtype=np.int64)
+    period = (dates[day] * 10 ** GAME_CODE_DIGITS + game_code) * 10 ** SEQUENCE_DIGITS + index % PERIODS_PER_DAY + 1
+    number = rng.integers(0, 10, size=n_rows, dtype=np.uint8)
+    premium = rng.integers(10000, 100000, size=n_rows, dtype=np.int32)
+    return ResultBatch(period, number, NUMBER_COLORS[number], premium)
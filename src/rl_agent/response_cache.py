@@ -0,0 +1,123 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+
+
+def content_key(*parts):
+    """Kunci content-addressed: SHA-256 dari seluruh bagian (model, instruksi, data)."""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(str(part).encode('utf-8'))
+        digest.update(b'\x00')
+    return digest.hexdigest()
+
+
+class ResponseCache:
+    """
+    Cache respons lokal dengan eviksi LRU dan TTL.
+
+    Entri disimpan sebagai {kunci: (waktu_simpan, respons)} di OrderedDict;
+    akses memindahkan entri ke akhir sehingga entri paling lama tidak dipakai
+    dibuang lebih dulu saat `max_entries` terlampaui. Jika `path` diberikan,
+    cache ditulis ke file JSON setiap `save_every` entri baru (dan saat `flush`)
+    agar tetap berlaku setelah program dimulai ulang. `ttl_seconds` 0/None
+    berarti entri tidak kedaluwarsa.
+    """
+    def __init__(self, max_entries=256, ttl_seconds=3600, path=None, save_every=1):
+        self.max_entries = max(int(max_entries), 1)
+        self.ttl_seconds = ttl_seconds
+        self.path = path
+        self.save_every = max(int(save_every), 1)
+        self._unsaved = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        if path:
+            self._load()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _expired(self, stored_at, now):
+        return bool(self.ttl_seconds) and now - stored_at > self.ttl_seconds
+
+    def get(self, key):
+        """Mengembalikan respons tersimpan atau None (dihitung sebagai hit/miss)."""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._expired(entry[0], now):
+                del self._entries[key]
+                self.evictions += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.time(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+            self._unsaved += 1
+            due = self.path and self._unsaved >= self.save_every
+        if due:
+            self.flush()
+
+    def flush(self):
+        """Menulis entri yang belum tersimpan ke file."""
+        with self._lock:
+            if not self.path or not self._unsaved:
+                return
+            snapshot = list(self._entries.items())
+            self._unsaved = 0
+        self._save(snapshot)
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'size': len(self._entries),
+            'hit_rate': self.hits / total if total else 0.0,
+        }
+
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                raw = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logging.warning(f"Cache respons '{self.path}' tidak dapat dibaca, dimulai kosong: {e}")
+            return
+        now = time.time()
+        for key, stored_at, value in raw.get('entries', []):
+            if not self._expired(stored_at, now):
+                self._entries[key] = (stored_at, value)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _save(self, entries):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'entries': [[key, stored_at, value] for key, (stored_at, value) in entries]}, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logging.warning(f"Gagal menyimpan cache respons ke '{self.path}': {e}")
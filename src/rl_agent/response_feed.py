@@ -0,0 +1,156 @@
+import logging
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+from src.utils.scraping import INPAGE_FETCH_MARKER, decode_api_body
+
+
+class CapturedResponse:
+    """Respons API yang dicegat: request asal, rekaman hasil dekode, dan waktu diterima (monotonic)."""
+    __slots__ = ('request', 'records', 'received_at')
+
+    def __init__(self, request, records, received_at):
+        self.request = request
+        self.records = records
+        self.received_at = received_at
+
+
+class ResponseFeed:
+    """
+    Penangkapan berbasis push memakai `response_interceptor` selenium-wire.
+
+    Interceptor dipanggil di thread proxy untuk setiap respons yang cocok dengan
+    `api_endpoint`; body langsung didekode dan rekamannya dimasukkan ke antrean
+    thread-safe. Loop live cukup mengonsumsi antrean dengan `drain`, tanpa
+    `del driver.requests` + `wait_for_request`, sehingga tidak ada respons yang
+    hilang di antara keduanya. Antrean dibatasi `max_queue`; jika penuh, entri
+    tertua dibuang (halaman 1 yang lebih baru sudah memuat periode terbarunya).
+
+    Respons fetch dalam halaman (URL dengan `INPAGE_FETCH_MARKER`) diabaikan
+    dan hanya dihitung di `ignored`: InPageFetcher sudah mengembalikannya
+    langsung, sehingga setiap hasil hanya di-ingest sekali.
+
+    Lag (respons diterima proxy -> `mark_ingested`) dicatat untuk `lag_window`
+    entri terakhir dan dilaporkan oleh `stats`.
+    """
+    def __init__(self, api_endpoint, max_queue=256, lag_window=1000):
+        self.api_endpoint = api_endpoint
+        self.max_queue = max(int(max_queue), 1)
+        self.received = 0
+        self.consumed = 0
+        self.dropped = 0
+        self.errors = 0
+        self.ignored = 0
+        self._queue = deque()
+        self._lags = deque(maxlen=lag_window)
+        self._condition = threading.Condition()
+
+    @classmethod
+    def attach(cls, driver, api_endpoint, max_queue=256):
+        """Membuat feed dan memasangnya sebagai `driver.response_interceptor`."""
+        feed = cls(api_endpoint, max_queue)
+        driver.response_interceptor = feed.intercept
+        return feed
+
+    @staticmethod
+    def detach(driver):
+        # selenium-wire menolak setter None; deleter mengosongkan interceptor.
+        del driver.response_interceptor
+
+    def intercept(self, request, response):
+        """Interceptor selenium-wire; tidak mengubah respons yang diteruskan ke browser."""
+        if self.api_endpoint not in request.url or response.status_code != 200:
+            return
+        if INPAGE_FETCH_MARKER in request.url:
+            with self._condition:
+                self.ignored += 1
+            return
+        received_at = time.monotonic()
+        try:
+            records = decode_api_body(response.body, response.headers)
+        except Exception as e:
+            # Exception di thread proxy tidak boleh merusak respons ke browser.
+            logging.error(f"Gagal mendekode respons API yang dicegat: {e}")
+            with self._condition:
+                self.errors += 1
+            return
+        with self._condition:
+            if len(self._queue) >= self.max_queue:
+                self._queue.popleft()
+                self.dropped += 1
+            self._queue.append(CapturedResponse(request, records, received_at))
+            self.received += 1
+            self._condition.notify_all()
+
+    def get(self, timeout=None):
+        """Mengambil respons tertua dari antrean; None jika tidak ada dalam `timeout` detik."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            while not self._queue:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return None
+                self._condition.wait(remaining)
+            self.consumed += 1
+            return self._queue.popleft()
+
+    def drain(self, timeout=None):
+        """
+        Menunggu hingga `timeout` detik lalu mengambil seluruh respons yang
+        mengantre (tertua lebih dulu); daftar kosong jika tidak ada. Dipakai loop
+        live agar backlog diproses dalam satu ingest, bukan satu per satu.
+        """
+        first = self.get(timeout)
+        if first is None:
+            return []
+        with self._condition:
+            captured = [first] + list(self._queue)
+            self.consumed += len(self._queue)
+            self._queue.clear()
+        return captured
+
+    def latest(self, timeout=None):
+        """Seperti `get`, tetapi membuang entri lama dan mengembalikan respons terbaru."""
+        captured = self.get(timeout)
+        if captured is None:
+            return None
+        with self._condition:
+            if self._queue:
+                self.consumed += len(self._queue)
+                captured = self._queue.pop()
+                self._queue.clear()
+        return captured
+
+    def mark_ingested(self, captured):
+        """Mencatat lag respons -> tersimpan untuk `captured`."""
+        lag = time.monotonic() - captured.received_at
+        with self._condition:
+            self._lags.append(lag)
+        return lag
+
+    @property
+    def queue_depth(self):
+        with self._condition:
+            return len(self._queue)
+
+    def stats(self):
+        with self._condition:
+            lags_ms = np.array(self._lags) * 1000
+            stats = {
+                'received': self.received,
+                'consumed': self.consumed,
+                'dropped': self.dropped,
+                'errors': self.errors,
+                'ignored': self.ignored,
+                'queue_depth': len(self._queue),
+            }
+        if len(lags_ms):
+            stats.update({
+                'lag_ms_p50': float(np.percentile(lags_ms, 50)),
+                'lag_ms_p95': float(np.percentile(lags_ms, 95)),
+                'lag_ms_max': float(lags_ms.max()),
+            })
+        return stats
@@ -0,0 +1,196 @@
+import json
+import logging
+import os
+import time
+from urllib.parse import urlsplit
+
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+# Nilai bawaan untuk blok `web_agent.session_cache` di config.yaml.
+DEFAULT_SESSION_CACHE_CONFIG = {
+    'enabled': True,
+    'state_path': 'data/browser_session.json',
+    'user_data_dir': '',
+    'max_age_hours': 24,
+    'validate_timeout': 10,
+}
+
+# Field CDP Network.Cookie yang diterima kembali oleh Network.setCookies.
+_COOKIE_FIELDS = ('name', 'value', 'domain', 'path', 'secure', 'httpOnly', 'sameSite', 'expires')
+
+# Mengisi localStorage sebelum skrip halaman berjalan; kunci yang sudah ada tidak ditimpa.
+_SEED_STORAGE_SCRIPT = """
+if (location.origin === %s) {
+  const saved = %s;
+  for (const key in saved) { if (localStorage.getItem(key) === null) localStorage.setItem(key, saved[key]); }
+}
+"""
+
+
+class SessionCache:
+    """
+    Menyimpan state sesi yang sudah login agar restart tidak perlu login ulang.
+
+    Setelah login dan navigasi ke game berhasil, cookies (semua domain, via CDP),
+    localStorage origin situs, dan URL halaman game disimpan ke `state_path`.
+    Saat start berikutnya, state dipulihkan sebelum navigasi pertama (cookies
+    via `Network.setCookies`, localStorage via skrip pra-dokumen), lalu URL game
+    dibuka langsung dan divalidasi: elemen game terlihat = sesi diterima, form
+    login terlihat = sesi ditolak dan file state dihapus.
+
+    `user_data_dir` opsional memakai profil Chrome persisten; satu direktori
+    hanya dapat dipakai oleh satu browser dalam satu waktu.
+
+    File state berisi token login dan ditulis dengan izin 0600.
+    """
+    def __init__(self, state_path, user_data_dir=None, max_age_hours=24, validate_timeout=10, enabled=True):
+        self.state_path = state_path
+        self.user_data_dir = os.path.abspath(user_data_dir) if user_data_dir else None
+        self.max_age_seconds = float(max_age_hours) * 3600 if max_age_hours else None
+        self.validate_timeout = float(validate_timeout)
+        self.enabled = enabled
+        self._seed_script_id = None
+
+    @classmethod
+    def from_config(cls, web_agent_config):
+        cache_config = dict(DEFAULT_SESSION_CACHE_CONFIG, **(web_agent_config.get('session_cache') or {}))
+        return cls(
+            state_path=cache_config.get('state_path'),
+            user_data_dir=cache_config.get('user_data_dir'),
+            max_age_hours=cache_config.get('max_age_hours'),
+            validate_timeout=cache_config.get('validate_timeout'),
+            enabled=bool(cache_config.get('enabled')),
+        )
+
+    def load(self):
+        """State tersimpan, atau None jika tidak ada, rusak, atau kedaluwarsa."""
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (json.JSONDecodeError, OSError) as e:
+            logging.warning(f"Cache sesi '{self.state_path}' tidak dapat dibaca ({e}). Login penuh diperlukan.")
+            return None
+        age = time.time() - state.get('saved_at', 0)
+        if self.max_age_seconds and age > self.max_age_seconds:
+            logging.info(f"Cache sesi berumur {age / 3600:.1f} jam melebihi batas; login penuh diperlukan.")
+            return None
+        if not state.get('game_url'):
+            return None
+        return state
+
+    def save(self, driver):
+        """Menyimpan cookies, localStorage, dan URL game dari driver yang sudah login."""
+        try:
+            current_url = driver.current_url
+            parts = urlsplit(current_url)
+            local_storage = json.loads(driver.execute_script("return JSON.stringify(Object.assign({}, localStorage));"))
+            try:
+                cookies = driver.execute_cdp_cmd('Network.getAllCookies', {})['cookies']
+            except (AttributeError, WebDriverException):
+                cookies = driver.get_cookies()
+        except WebDriverException as e:
+            logging.warning(f"Gagal membaca state sesi dari browser: {e}")
+            return False
+        state = {
+            'origin': f"{parts.scheme}://{parts.netloc}",
+            'game_url': current_url,
+            'cookies': cookies,
+            'local_storage': local_storage,
+            'saved_at': time.time(),
+        }
+        directory = os.path.dirname(self.state_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = self.state_path + '.tmp'
+        with os.fdopen(os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.state_path)
+        logging.info(f"Cache sesi disimpan ({len(cookies)} cookies, {len(local_storage)} kunci localStorage).")
+        return True
+
+    def invalidate(self):
+        if os.path.exists(self.state_path):
+            os.remove(self.state_path)
+
+    def restore(self, driver, state):
+        """Memasang cookies dan localStorage tersimpan sebelum navigasi pertama."""
+        cookies = [self._cookie_param(cookie) for cookie in state.get('cookies', [])]
+        try:
+            if cookies:
+                driver.execute_cdp_cmd('Network.setCookies', {'cookies': cookies})
+            if state.get('local_storage'):
+                script = _SEED_STORAGE_SCRIPT % (json.dumps(state['origin']), json.dumps(state['local_storage']))
+                self._seed_script_id = driver.execute_cdp_cmd(
+                    'Page.addScriptToEvaluateOnNewDocument', {'source': script})['identifier']
+        except (AttributeError, WebDriverException) as e:
+            logging.warning(f"Gagal memulihkan state sesi via CDP: {e}")
+            return False
+        return True
+
+    def open_game(self, driver, state, game_locator, login_locator):
+        """
+        Membuka URL game tersimpan dan memvalidasi sesi.
+
+        Returns:
+            bool: True jika elemen game terlihat sebelum form login dalam `validate_timeout` detik.
+        """
+        try:
+            driver.get(state['game_url'])
+            WebDriverWait(driver, self.validate_timeout).until(EC.any_of(
+                EC.visibility_of_element_located(game_locator),
+                EC.visibility_of_element_located(login_locator),
+            ))
+            game_elements = driver.find_elements(*game_locator)
+            return bool(game_elements) and game_elements[0].is_displayed()
+        except TimeoutException:
+            logging.info("Validasi cache sesi: halaman game tidak siap dalam batas waktu.")
+            return False
+        except WebDriverException as e:
+            logging.warning(f"Validasi cache sesi gagal: {e}")
+            return False
+        finally:
+            self._remove_seed_script(driver)
+
+    def resume(self, driver, game_locator, login_locator):
+        """
+        Memulihkan dan memvalidasi sesi tersimpan.
+
+        Returns:
+            bool: True jika browser sudah berada di halaman game dalam keadaan login.
+        """
+        if not self.enabled:
+            return False
+        state = self.load()
+        if state is None:
+            return False
+        started = time.monotonic()
+        if self.restore(driver, state) and self.open_game(driver, state, game_locator, login_locator):
+            logging.info(f"Sesi tersimpan diterima; login dilewati ({time.monotonic() - started:.1f}s).")
+            return True
+        logging.info("Sesi tersimpan ditolak; cache dihapus dan login penuh dilakukan.")
+        self.invalidate()
+        return False
+
+    def _remove_seed_script(self, driver):
+        # Token yang diperbarui situs tidak boleh ditimpa nilai lama pada navigasi berikutnya.
+        if self._seed_script_id is not None:
+            try:
+                driver.execute_cdp_cmd('Page.removeScriptToEvaluateOnNewDocument', {'identifier': self._seed_script_id})
+            except WebDriverException:
+                pass
+            self._seed_script_id = None
+
+    @staticmethod
+    def _cookie_param(cookie):
+        param = {key: cookie[key] for key in _COOKIE_FIELDS if key in cookie}
+        # Cookie sesi (tanpa kedaluwarsa) dikirim tanpa `expires`.
+        if cookie.get('session') or param.get('expires', -1) <= 0:
+            param.pop('expires', None)
+        # Format get_cookies() Selenium memakai `expiry`.
+        if 'expiry' in cookie:
+            param['expires'] = cookie['expiry']
+        return param
@@ -0,0 +1,148 @@
+import logging
+import re
+import time
+
+from selenium.webdriver.common.by import By
+
+# Elemen yang dibaca `take_snapshot`: (kunci, kategori, nama selector, kunci induk untuk selector relatif).
+SNAPSHOT_FIELDS = (
+    ('timer', 'game_interface', 'timer_display', None),
+    ('period', 'game_interface', 'period_display', None),
+    ('balance_container', 'game_interface', 'balance_container', None),
+    ('balance', 'game_interface', 'balance_value', 'balance_container'),
+    ('popup', 'game_interface', 'popup_confirm_button', None),
+)
+
+# Satu panggilan execute_script: mencari semua elemen dan mengembalikan [teks, terlihat] per kunci.
+SNAPSHOT_SCRIPT = """
+const find = (by, value, root) => {
+  switch (by) {
+    case 'xpath':
+      return document.evaluate(value, root, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    case 'css selector': return root.querySelector(value);
+    case 'class name': return root.querySelector('.' + CSS.escape(value));
+    case 'id': return root.querySelector('#' + CSS.escape(value));
+    case 'name': return root.querySelector('[name="' + CSS.escape(value) + '"]');
+    case 'tag name': return root.querySelector(value);
+    default: return null;
+  }
+};
+const found = {}, state = {};
+for (const [key, by, value, parent] of arguments[0]) {
+  const root = parent ? found[parent] : document;
+  let element = null;
+  try { element = root ? find(by, value, root) : null; } catch (e) { element = null; }
+  found[key] = element;
+  state[key] = element ? [element.innerText || element.textContent || '',
+                          element.getClientRects().length > 0] : null;
+}
+return state;
+"""
+
+
+class SelectorRegistry:
+    """
+    Selector dari `web_agent.xpaths` yang sudah dikompilasi sekali menjadi
+    locator `(By, value)`, sehingga pencarian per panggilan hanya lookup dict.
+    """
+    def __init__(self, locators):
+        self.locators = locators
+
+    @classmethod
+    def from_config(cls, xpaths):
+        locators = {}
+        for category, selectors in (xpaths or {}).items():
+            for name, selector_config in (selectors or {}).items():
+                by = getattr(By, str(selector_config.get('by', 'XPATH')).upper(), None)
+                value = selector_config.get('value')
+                if by is None or value is None:
+                    logging.error(f"Selector '{category}.{name}' tidak valid di config.yaml: {selector_config}")
+                    continue
+                locators[(category, name)] = (by, value)
+        return cls(locators)
+
+    def get(self, category, name):
+        """Locator `(By, value)`, atau None jika tidak dikonfigurasi."""
+        return self.locators.get((category, name))
+
+    def snapshot_spec(self, fields=SNAPSHOT_FIELDS):
+        """Argumen `SNAPSHOT_SCRIPT` untuk field yang selector-nya tersedia."""
+        spec = []
+        for key, category, name, parent in fields:
+            locator = self.get(category, name)
+            if locator:
+                spec.append([key, locator[0], locator[1], parent])
+        return spec
+
+
+class UiSnapshot:
+    """
+    Keadaan UI game pada satu waktu.
+
+    Attributes:
+        timer (str): Teks timer, mis. "00:42" ("00:00" jika tidak ditemukan).
+        seconds_left (int | None): Sisa detik dari `timer`.
+        period (int | None): Period yang sedang berjalan (yang akan diprediksi).
+        balance (float | None): Saldo akun.
+        popup_open (bool): Pop-up "Confirm" sedang terlihat.
+        taken_at (float): Waktu snapshot (time.monotonic).
+    """
+    __slots__ = ('timer', 'seconds_left', 'period', 'balance', 'popup_open', 'taken_at')
+
+    def __init__(self, timer, seconds_left, period, balance, popup_open, taken_at):
+        self.timer = timer
+        self.seconds_left = seconds_left
+        self.period = period
+        self.balance = balance
+        self.popup_open = popup_open
+        self.taken_at = taken_at
+
+    @classmethod
+    def from_state(cls, state, taken_at=None):
+        """Membangun snapshot dari hasil `SNAPSHOT_SCRIPT`."""
+        timer = _text(state.get('timer'))
+        timer = re.sub(r'\s+', '', timer) if timer else "00:00"
+        return cls(
+            timer=timer,
+            seconds_left=parse_timer(timer),
+            period=_parse_int(_text(state.get('period'))),
+            balance=parse_balance(_text(state.get('balance'))),
+            popup_open=bool(state.get('popup') and state['popup'][1]),
+            taken_at=time.monotonic() if taken_at is None else taken_at,
+        )
+
+    def __repr__(self):
+        return (f"UiSnapshot(timer={self.timer!r}, period={self.period}, balance={self.balance}, "
+                f"popup_open={self.popup_open})")
+
+
+def take_snapshot(driver, registry, fields=SNAPSHOT_FIELDS):
+    """Membaca timer, period, saldo, dan status pop-up dalam satu round-trip WebDriver."""
+    state = driver.execute_script(SNAPSHOT_SCRIPT, registry.snapshot_spec(fields)) or {}
+    return UiSnapshot.from_state(state)
+
+
+def parse_timer(text):
+    """'00:42' -> 42; None jika teks bukan mm:ss."""
+    match = re.fullmatch(r'(\d+):(\d{2})', text or '')
+    return int(match.group(1)) * 60 + int(match.group(2)) if match else None
+
+
+def parse_balance(text):
+    """'Rp1,234.50' -> 1234.5; None jika tidak dapat di-parse."""
+    if not text:
+        return None
+    try:
+        return float(text.replace('Rp', '').replace(',', '').strip())
+    except ValueError:
+        logging.error(f"Gagal mem-parsing nilai saldo. Teks yang ditemukan tidak valid: {text!r}")
+        return None
+
+
+def _text(entry):
+    return entry[0].strip() if entry else None
+
+
+def _parse_int(text):
+    digits = re.sub(r'\D', '', text or '')
+    return int(digits) if digits else None
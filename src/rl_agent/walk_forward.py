@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Evaluasi walk-forward untuk predictor apa pun (lihat src/rl_agent/predictors.py).
+
+Riwayat dibagi menjadi fold sesuai blok `walk_forward_validation` di
+config.yaml: fold k melatih pada baris [0, initial_train_size + k*step_size)
+dan menguji test_size baris berikutnya. Setiap fold dijalankan di proses
+terpisah (satu fold per core), sehingga evaluasi penuh berskala dengan jumlah
+core. Untuk predictor LLM, cache respons disimpan per fold di `--cache-dir`
+tanpa kedaluwarsa, sehingga evaluasi ulang tidak memanggil API lagi.
+
+Contoh:
+    python src/rl_agent/walk_forward.py --model stats
+    python src/rl_agent/walk_forward.py --model gemini-2.5-flash --workers 4 --output logs/wf.json
+"""
+import argparse
+import copy
+import json
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import yaml
+
+# --- Path Setup ---
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.rl_agent.predictors import PREDICTOR_CHOICES, create_predictor
+from src.utils.storage import storage_from_config
+
+
+def make_folds(n_rows, initial_train_size, test_size, step_size):
+    """
+    Membuat daftar fold (train_end, test_end) untuk riwayat sepanjang `n_rows`.
+    Data uji fold adalah baris [train_end, test_end).
+    """
+    folds = []
+    train_end = initial_train_size
+    while train_end + test_size <= n_rows:
+        folds.append((train_end, train_end + test_size))
+        train_end += step_size
+    return folds
+
+
+def _fold_config(config, model, fold_no, cache_dir):
+    """Salinan config dengan cache respons per fold yang persisten dan tidak kedaluwarsa."""
+    config = copy.deepcopy(config)
+    if model == 'lgbm':
+        config.setdefault('forecaster_model', {})['load_pretrained'] = False
+    if model.startswith('gemini'):
+        # Prediksi statistik pengganti akan tercatat sebagai akurasi Gemini; evaluasi tanpa fallback saat berjalan.
+        config.setdefault('predictor', {})['runtime_fallback'] = False
+    if model.startswith('gemini') and cache_dir:
+        gemini = config.setdefault('gemini', {})
+        gemini['response_cache'] = {
+            'enabled': True,
+            'path': os.path.join(cache_dir, model, f'fold_{fold_no:02d}.json'),
+            'ttl_seconds': 0,
+            'max_entries': 1_000_000,
+            'save_every': 50,
+        }
+    return config
+
+
+def evaluate_fold(model, config, fold_no, history, train_end, test_end, cache_dir=None):
+    """
+    Menjalankan satu fold: fit pada data latih lalu memprediksi setiap baris uji
+    secara berurutan dengan window `context_rows` baris sebelumnya.
+
+    Returns:
+        dict: Akurasi Big/Small, cakupan (prediksi yang dapat dibaca), dan latensi.
+    """
+    started = time.perf_counter()
+    predictor = create_predictor(model, _fold_config(config, model, fold_no, cache_dir))
+    try:
+        predictor.fit(history[:train_end])
+        context_rows = getattr(predictor, 'context_rows', 200)
+        actual_big = history.number[train_end:test_end] >= 5
+        predicted = np.zeros(test_end - train_end, dtype=np.int8)  # 1=Big, -1=Small, 0=tidak ada
+        latencies = np.empty(test_end - train_end, dtype=np.float64)
+        for offset, i in enumerate(range(train_end, test_end)):
+            window = history[max(i - context_rows, 0):i]
+            t0 = time.perf_counter()
+            label = predictor.predict_label(window)
+            latencies[offset] = time.perf_counter() - t0
+            predicted[offset] = 1 if label == 'Big' else -1 if label == 'Small' else 0
+    finally:
+        predictor.close()
+
+    answered = predicted != 0
+    correct = int(np.count_nonzero(answered & ((predicted == 1) == actual_big)))
+    n_answered = int(np.count_nonzero(answered))
+    latency_ms = latencies * 1000
+    return {
+        'fold': fold_no,
+        'predictor': predictor.name,
+        'train_end': train_end,
+        'test_start': train_end,
+        'test_end': test_end,
+        'n_test': test_end - train_end,
+        'n_answered': n_answered,
+        'coverage': n_answered / (test_end - train_end),
+        'accuracy': correct / n_answered if n_answered else None,
+        'base_rate_big': float(actual_big.mean()),
+        'latency_ms_mean': float(latency_ms.mean()),
+        'latency_ms_p50': float(np.percentile(latency_ms, 50)),
+        'latency_ms_p95': float(np.percentile(latency_ms, 95)),
+        'seconds': time.perf_counter() - started,
+    }
+
+
+def run_walk_forward(config, model, workers=None, cache_dir=None, max_folds=None):
+    """
+    Menjalankan seluruh fold secara paralel.
+
+    Args:
+        config (dict): Konfigurasi lengkap (memakai project_setup dan walk_forward_validation).
+        model (str): Nama predictor, seperti pada `scraper_shell.py --model`.
+        workers (int, optional): Jumlah proses; default jumlah core (maks. jumlah fold).
+        cache_dir (str, optional): Direktori cache respons LLM per fold.
+        max_folds (int, optional): Batasi jumlah fold (untuk uji cepat).
+
+    Returns:
+        list[dict]: Hasil per fold, urut berdasarkan nomor fold.
+    """
+    wf_config = config.get('walk_forward_validation', {})
+    history = storage_from_config(config).read_batch().sorted_unique()
+    folds = make_folds(len(history), wf_config.get('initial_train_size', 15000),
+                       wf_config.get('test_size', 2500), wf_config.get('step_size', 2500))
+    if max_folds:
+        folds = folds[:max_folds]
+    if not folds:
+        logging.warning(f"Riwayat ({len(history)} baris) terlalu pendek untuk satu fold walk-forward.")
+        return []
+    workers = max(1, min(workers or os.cpu_count() or 1, len(folds)))
+    logging.info(f"Walk-forward '{model}': {len(folds)} fold, {len(history)} baris, {workers} proses.")
+
+    if workers == 1:
+        return [evaluate_fold(model, config, k, history, train_end, test_end, cache_dir)
+                for k, (train_end, test_end) in enumerate(folds)]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # Setiap fold hanya menerima riwayat hingga akhir data ujinya.
+        futures = [executor.submit(evaluate_fold, model, config, k, history[:test_end], train_end, test_end, cache_dir)
+                   for k, (train_end, test_end) in enumerate(folds)]
+        return [future.result() for future in futures]
+
+
+def summarize(results):
+    """Ringkasan gabungan seluruh fold (akurasi berbobot jumlah prediksi)."""
+    answered = sum(r['n_answered'] for r in results)
+    correct = sum((r['accuracy'] or 0) * r['n_answered'] for r in results)
+    total = sum(r['n_test'] for r in results)
+    return {
+        'folds': len(results),
+        'n_test': total,
+        'coverage': answered / total if total else 0.0,
+        'accuracy': correct / answered if answered else None,
+        'latency_ms_mean': sum(r['latency_ms_mean'] * r['n_test'] for r in results) / total if total else 0.0,
+        'seconds_total_cpu': sum(r['seconds'] for r in results),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluasi walk-forward predictor Big/Small.")
+    parser.add_argument('--model', choices=PREDICTOR_CHOICES, default='stats')
+    parser.add_argument('--workers', type=int, default=None, help="Jumlah proses (default: jumlah core).")
+    parser.add_argument('--cache-dir', default=os.path.join(project_root, 'data', 'walk_forward_cache'),
+                        help="Direktori cache respons LLM per fold.")
+    parser.add_argument('--max-folds', type=int, default=None)
+    parser.add_argument('--output', help="Simpan hasil per fold dan ringkasan sebagai JSON.")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    with open(os.path.join(project_root, 'config.yaml'), 'r', encoding='utf-8') as f:
+        config = yaml.safe_load(f)
+    # Path data di config relatif terhadap root proyek.
+    data_path = config.get('project_setup', {}).get('data_path', 'data/databaru_from_api.csv')
+    config.setdefault('project_setup', {})['data_path'] = os.path.join(project_root, data_path)
+
+    started = time.perf_counter()
+    results = run_walk_forward(config, args.model, args.workers, args.cache_dir, args.max_folds)
+    wall = time.perf_counter() - started
+
+    print(f"{'fold':>4} {'test rows':>17} {'n':>6} {'cover':>7} {'acc':>7} {'base':>7} {'lat ms':>9} {'p95 ms':>9}")
+    for r in results:
+        accuracy = f"{r['accuracy']:.4f}" if r['accuracy'] is not None else '-'
+        print(f"{r['fold']:>4} {r['test_start']:>8}-{r['test_end']:<8} {r['n_test']:>6} {r['coverage']:>7.3f} "
+              f"{accuracy:>7} {r['base_rate_big']:>7.4f} {r['latency_ms_mean']:>9.3f} {r['latency_ms_p95']:>9.3f}")
+    summary = summarize(results)
+    summary['seconds_wall'] = wall
+    print(f"\nTotal: {summary}")
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'model': args.model, 'folds': results, 'summary': summary}, f, indent=2)
+        print(f"Hasil disimpan ke {args.output}")
+
+
+if __name__ == '__main__':
+    main()
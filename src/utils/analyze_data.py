@@ -1,6 +1,6 @@
 import sys
 import os
-import pandas as pd
+import yaml
 
 # Path setup
 project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -8,23 +8,26 @@ if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
 from src.rl_agent.gemini_predictor import GeminiPredictor
+from src.utils.storage import storage_from_config
 
 def main():
     """
     Analyzes existing data with Gemini AI.
     """
     print("[A] Analyzing existing data with Gemini AI...")
+    with open(os.path.join(project_root, 'config.yaml'), 'r', encoding='utf-8') as f:
+        config = yaml.safe_load(f)
+    storage = storage_from_config(config)
     try:
-        df = pd.read_csv('data/databaru_from_api.csv')
-        latest_data = df.tail(200).to_string()
-        predictor = GeminiPredictor('gemini-2.5-flash')
+        latest_data = storage.read_tail(200).to_string()
+        predictor = GeminiPredictor('gemini-2.5-flash', config=config)
         analysis = predictor.generate_holistic_report(f'Latest 200 records: {latest_data}')
         print('[R] GEMINI AI ANALYSIS REPORT')
         print('=' * 50)
         print(analysis)
         print('=' * 50)
     except FileNotFoundError:
-        print("[X] No data file found at data/databaru_from_api.csv")
+        print(f"[X] No data file found at {storage.path}")
         print("Please run scraping first to generate data.")
     except Exception as e:
         print(f'[X] Analysis failed: {e}')
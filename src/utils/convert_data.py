@@ -0,0 +1,50 @@
+import argparse
+import os
+import sys
+import time
+import yaml
+
+# Path setup
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.utils.storage import open_storage
+
+
+def main():
+    """
+    Konversi satu kali file riwayat CSV ke format kolumnar (Arrow IPC atau Parquet).
+    Setelah konversi, arahkan `project_setup.data_path` di config.yaml ke file hasil.
+    """
+    with open(os.path.join(project_root, 'config.yaml'), 'r', encoding='utf-8') as f:
+        config = yaml.safe_load(f)
+    default_source = config.get('project_setup', {}).get('data_path', 'data/databaru_from_api.csv')
+
+    parser = argparse.ArgumentParser(description='Convert the history CSV to a columnar storage format.')
+    parser.add_argument('--source', default=default_source, help='Source data file (default: project_setup.data_path)')
+    parser.add_argument('--to', choices=['arrow', 'parquet'], default='arrow', help='Target storage format')
+    parser.add_argument('--output', help='Target file (default: source path with the new extension)')
+    args = parser.parse_args()
+
+    output = args.output or os.path.splitext(args.source)[0] + ('.arrow' if args.to == 'arrow' else '.parquet')
+    source = open_storage(args.source)
+    target = open_storage(output, data_format=args.to)
+
+    print(f"[C] Converting {args.source} ({source.format_name}) -> {output} ({args.to})...")
+    df = source.read()
+    target.write(df)
+    print(f"[V] {len(df)} records written to {output}")
+
+    start = time.perf_counter()
+    source.read()
+    source_time = time.perf_counter() - start
+    start = time.perf_counter()
+    target.read()
+    target_time = time.perf_counter() - start
+    print(f"[I] Full load: {source.format_name} {source_time * 1000:.1f} ms, {args.to} {target_time * 1000:.1f} ms")
+    print(f"[I] Set project_setup.data_path to \"{output}\" in config.yaml to use the new backend.")
+
+
+if __name__ == "__main__":
+    main()
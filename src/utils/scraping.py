@@ -8,9 +8,23 @@
 # Standard library imports
 import json
 import logging
+import os
+import re
+import threading
 import time
+from collections import deque
 import zstandard
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
 # Third-party imports
 from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.common.by import By
@@ -19,28 +33,258 @@ from selenium.webdriver.support.ui import WebDriverWait
 from seleniumwire import webdriver
 from selenium.webdriver.chrome.service import Service
 
-def setup_driver(is_realtime=False):
+# Parameter query penanda permintaan `fetch` dalam halaman (src/rl_agent/page_fetch.py).
+# Respons bertanda tidak direkam selenium-wire dan diabaikan ResponseFeed, karena
+# InPageFetcher sudah mengembalikannya langsung ke loop live.
+INPAGE_FETCH_MARKER = '_inpage=1'
+
+# Nilai bawaan untuk blok `web_agent.capture` di config.yaml.
+DEFAULT_CAPTURE_CONFIG = {
+    'request_storage': 'memory',
+    'max_requests': 100,
+    'max_body_bytes': 1024 * 1024,
+    'extra_scopes': [],
+    'ignore_http_methods': ['OPTIONS'],
+}
+
+
+class CapturePolicy:
+    """
+    Kebijakan penangkapan lalu lintas selenium-wire.
+
+    - Scope: hanya URL yang cocok dengan `api_endpoint` (plus `extra_scopes`)
+      yang direkam. Permintaan lain (gambar, websocket, analitik) tetap
+      diteruskan proxy tetapi di-stream tanpa disimpan. Permintaan API yang
+      membawa `INPAGE_FETCH_MARKER` (fetch dalam halaman) berada di luar scope.
+    - Storage: `request_storage: memory` menyimpan request di memori dan membuang
+      yang tertua begitu `max_requests` tercapai, sehingga buffer tidak tumbuh
+      meskipun `del driver.requests` tidak dipanggil.
+    - Body: salinan tersimpan yang body-nya melebihi `max_body_bytes` dikosongkan
+      (lalu lintas ke browser tidak diubah).
+    """
+    def __init__(self, scopes=None, request_storage='memory', max_requests=100, max_body_bytes=1024 * 1024,
+                 ignore_http_methods=('OPTIONS',)):
+        self.scopes = list(scopes or [])
+        self.request_storage = request_storage
+        self.max_requests = int(max_requests) if max_requests else None
+        self.max_body_bytes = int(max_body_bytes) if max_body_bytes else None
+        self.ignore_http_methods = list(ignore_http_methods)
+        self.dropped_bodies = 0
+
+    @classmethod
+    def from_config(cls, web_agent_config):
+        capture_config = dict(DEFAULT_CAPTURE_CONFIG, **(web_agent_config.get('capture') or {}))
+        api_endpoint = web_agent_config.get('api_endpoint')
+        scopes = [re.escape(api_endpoint) + f'(?!.*{re.escape(INPAGE_FETCH_MARKER)})'] if api_endpoint else []
+        scopes += list(capture_config.get('extra_scopes') or [])
+        return cls(
+            scopes=scopes,
+            request_storage=capture_config.get('request_storage'),
+            max_requests=capture_config.get('max_requests'),
+            max_body_bytes=capture_config.get('max_body_bytes'),
+            ignore_http_methods=capture_config.get('ignore_http_methods') or [],
+        )
+
+    def seleniumwire_options(self):
+        options = {'ignore_http_methods': list(self.ignore_http_methods)}
+        if self.request_storage == 'memory':
+            options['request_storage'] = 'memory'
+            if self.max_requests:
+                options['request_storage_max_size'] = self.max_requests
+        return options
+
+    def apply(self, driver):
+        """Memasang scope dan batas body pada driver (atau backend) selenium-wire."""
+        if self.scopes:
+            driver.scopes = self.scopes
+        if self.max_body_bytes:
+            storage = driver.backend.storage
+            save_request, save_response = storage.save_request, storage.save_response
+
+            def save_request_capped(request):
+                self._cap_body(request)
+                save_request(request)
+
+            def save_response_capped(request_id, response):
+                self._cap_body(response)
+                save_response(request_id, response)
+
+            storage.save_request = save_request_capped
+            storage.save_response = save_response_capped
+        return driver
+
+    def _cap_body(self, message):
+        # Objek yang disimpan adalah salinan; flow yang diteruskan ke browser sudah dibangun.
+        if len(message.body) > self.max_body_bytes:
+            logging.debug(f"Body {len(message.body)} byte melebihi batas capture {self.max_body_bytes}; tidak disimpan.")
+            message.body = b''
+            self.dropped_bodies += 1
+
+
+# Profil browser bawaan untuk blok `web_agent.browser` di config.yaml.
+BROWSER_PROFILES = {
+    # Perilaku lama: Chrome dengan jendela, dimaksimalkan saat real-time, memuat semua resource.
+    'full': {
+        'headless': False,
+        'block_resources': [],
+        'window_size': None,
+        'renderer_process_limit': None,
+    },
+    # Hanya API riwayat dan beberapa elemen DOM yang dibutuhkan scraper.
+    'lean': {
+        'headless': True,
+        'block_resources': ['image', 'font', 'media'],
+        'window_size': '1024,768',
+        'renderer_process_limit': 1,
+    },
+}
+
+# Pola URL Network.setBlockedURLs per jenis resource.
+RESOURCE_URL_PATTERNS = {
+    'image': ['*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.avif', '*.svg', '*.ico', '*.bmp'],
+    'font': ['*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot'],
+    'media': ['*.mp4', '*.webm', '*.ogg', '*.mp3', '*.wav', '*.m4a', '*.aac', '*.m3u8'],
+}
+
+
+class BrowserProfile:
+    """
+    Profil peluncuran Chrome untuk scraping.
+
+    - `headless`: Chrome tanpa jendela (`--headless=new`).
+    - `block_resources`: jenis resource ('image', 'font', 'media') yang diblokir.
+      Gambar dimatikan lewat preferensi konten Chrome; semua jenis juga diblokir
+      per URL lewat CDP `Network.setBlockedURLs`, sehingga tidak pernah melewati
+      proxy selenium-wire.
+    - `window_size`: ukuran jendela "W,H" (menggantikan `--start-maximized`).
+    - `renderer_process_limit`: batas jumlah proses renderer.
+    """
+    def __init__(self, name='full', headless=False, block_resources=(), window_size=None,
+                 renderer_process_limit=None):
+        unknown = set(block_resources) - set(RESOURCE_URL_PATTERNS)
+        if unknown:
+            raise ValueError(f"Jenis resource tidak dikenal: {sorted(unknown)}. "
+                             f"Pilihan: {sorted(RESOURCE_URL_PATTERNS)}")
+        self.name = name
+        self.headless = bool(headless)
+        self.block_resources = list(block_resources)
+        self.window_size = window_size
+        self.renderer_process_limit = int(renderer_process_limit) if renderer_process_limit else None
+
+    @classmethod
+    def from_config(cls, web_agent_config, name=None):
+        browser_config = web_agent_config.get('browser') or {}
+        name = name or browser_config.get('profile', 'full')
+        if name not in BROWSER_PROFILES:
+            raise ValueError(f"Profil browser tidak dikenal: '{name}'. Pilihan: {sorted(BROWSER_PROFILES)}")
+        profile_config = dict(BROWSER_PROFILES[name], **(browser_config.get(name) or {}))
+        return cls(name=name, **profile_config)
+
+    @property
+    def blocked_url_patterns(self):
+        return [pattern for kind in self.block_resources for pattern in RESOURCE_URL_PATTERNS[kind]]
+
+    def apply_options(self, options, is_realtime=False):
+        """Menambahkan argumen dan preferensi profil ke ChromeOptions."""
+        if self.headless:
+            options.add_argument("--headless=new")
+        if self.window_size:
+            options.add_argument(f"--window-size={self.window_size}")
+        elif is_realtime:
+            options.add_argument("--start-maximized")
+        if self.renderer_process_limit:
+            options.add_argument(f"--renderer-process-limit={self.renderer_process_limit}")
+        if self.headless or self.block_resources:
+            for argument in ("--disable-extensions", "--mute-audio", "--disable-background-networking"):
+                options.add_argument(argument)
+        if 'image' in self.block_resources:
+            options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+        return options
+
+    def apply(self, driver):
+        """Memasang pemblokiran URL via CDP pada driver yang sudah berjalan."""
+        patterns = self.blocked_url_patterns
+        if patterns:
+            try:
+                driver.execute_cdp_cmd('Network.enable', {})
+                driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': patterns})
+            except Exception as e:
+                logging.warning(f"Gagal memasang pemblokiran resource via CDP: {e}")
+        return driver
+
+
+_psutil_warned = False
+
+
+def browser_resource_usage(driver):
+    """
+    Total RSS (MB) dan waktu CPU (detik) chromedriver beserta semua proses
+    Chrome turunannya. None jika psutil tidak terpasang atau proses tidak diketahui.
+    """
+    global _psutil_warned
+    if psutil is None:
+        if not _psutil_warned:
+            logging.warning("psutil tidak terpasang; laporan resource browser dilewati. Jalankan: pip install psutil")
+            _psutil_warned = True
+        return None
+    service_process = getattr(getattr(driver, 'service', None), 'process', None)
+    if service_process is None:
+        return None
+    try:
+        root = psutil.Process(service_process.pid)
+        processes = [root] + root.children(recursive=True)
+    except psutil.Error:
+        return None
+    rss = cpu = 0.0
+    counted = 0
+    for process in processes:
+        try:
+            rss += process.memory_info().rss
+            cpu_times = process.cpu_times()
+            cpu += cpu_times.user + cpu_times.system
+            counted += 1
+        except psutil.Error:
+            continue  # Proses renderer dapat berakhir di antara listing dan pembacaan
+    return {'processes': counted, 'rss_mb': rss / 2 ** 20, 'cpu_seconds': cpu}
+
+
+def setup_driver(is_realtime=False, capture_loopback=False, capture_policy=None, browser_profile=None,
+                 user_data_dir=None):
     """
     Menginisialisasi dan mengembalikan instance WebDriver Selenium-Wire Chrome.
 
     Args:
         is_realtime (bool): Jika True, konfigurasikan untuk agen real-time (misalnya, start-maximized).
                             Jika False, konfigurasikan untuk scraping latar belakang.
+        capture_loopback (bool): Jika True, permintaan ke localhost juga dilewatkan ke proxy
+                                 selenium-wire (Chrome melewatinya secara default), misalnya
+                                 saat memakai server API tiruan (web_agent.mock_api).
+        capture_policy (CapturePolicy, optional): Scope, storage, dan batas body capture.
+                                                  Default: penyimpanan memori terbatas tanpa scope.
+        browser_profile (BrowserProfile, optional): Headless, pemblokiran resource, ukuran jendela,
+                                                    dan batas renderer. Default: profil 'full'.
+        user_data_dir (str, optional): Direktori profil Chrome persisten (cookies/localStorage
+                                       bertahan antar-restart); default profil sementara.
 
     Returns:
         selenium.webdriver.Chrome: Instance WebDriver yang telah dikonfigurasi.
     """
-    logging.info(f"Initializing WebDriver (Real-time: {is_realtime})...")
+    browser_profile = browser_profile or BrowserProfile()
+    logging.info(f"Initializing WebDriver (Real-time: {is_realtime}, profile: {browser_profile.name})...")
     options = webdriver.ChromeOptions()
     options.add_argument("--disable-gpu")
     options.add_argument("--no-sandbox")
     options.add_argument("--disable-dev-shm-usage")
     options.add_experimental_option("excludeSwitches", ["enable-logging"])
 
-    if is_realtime:
-        options.add_argument("--start-maximized")
+    browser_profile.apply_options(options, is_realtime=is_realtime)
+    if capture_loopback:
+        options.add_argument("--proxy-bypass-list=<-loopback>")
+    if user_data_dir:
+        options.add_argument(f"--user-data-dir={user_data_dir}")
 
-    seleniumwire_options = {'ignore_http_methods': ['OPTIONS']}
+    capture_policy = capture_policy or CapturePolicy()
+    seleniumwire_options = capture_policy.seleniumwire_options()
     
     service = Service()
     driver = webdriver.Chrome(
@@ -48,10 +292,210 @@ def setup_driver(is_realtime=False):
         options=options,
         seleniumwire_options=seleniumwire_options
     )
-    logging.info("WebDriver initialized successfully.")
+    capture_policy.apply(driver)
+    browser_profile.apply(driver)
+    logging.info(f"WebDriver initialized successfully (capture scopes: {capture_policy.scopes or 'semua'}, "
+                 f"storage: {seleniumwire_options.get('request_storage', 'disk')}).")
     return driver
 
-def handle_popups(driver, xpaths, timers, max_popups=10):
+# Nilai bawaan untuk blok `web_agent.waits` di config.yaml.
+DEFAULT_WAIT_CONFIG = {
+    'adaptive': True,
+    'margin': 3.0,
+    'min_timeout': 0.5,
+    'history': 20,
+    'poll_frequency': 0.1,
+    'popup_probe_timeout': 3,
+    'timings_path': 'data/wait_timings.json',
+}
+
+
+def document_ready(driver):
+    """Kondisi WebDriverWait: `document.readyState` sudah 'complete'."""
+    return driver.execute_script("return document.readyState;") == 'complete'
+
+
+def api_response_seen(api_endpoint, since):
+    """
+    Kondisi WebDriverWait: selenium-wire telah menangkap respons `api_endpoint`
+    untuk request yang dikirim setelah `since` (datetime).
+    """
+    def _predicate(driver):
+        for request in reversed(driver.requests):
+            if api_endpoint in request.url and request.response and request.date >= since:
+                return request
+        return False
+    return _predicate
+
+
+class WaitEngine:
+    """
+    Menunggu kondisi DOM/jaringan alih-alih sleep tetap, dengan timeout adaptif.
+
+    - `until(step, condition)`: WebDriverWait pada kondisi; durasi setiap langkah
+      dicatat per nama langkah. Setelah beberapa sampel, timeout langkah menjadi
+      `margin` x durasi maksimum yang teramati (minimal `min_timeout`, maksimal
+      timeout bawaan). Jika batas adaptif terlewati, penantian dilanjutkan
+      hingga timeout bawaan sehingga halaman yang lambat tidak langsung gagal.
+    - `probe(step, locators)`: satu pemeriksaan singkat untuk sekumpulan elemen
+      opsional (misalnya pop-up); locator XPath/CSS digabung menjadi satu query.
+      Probe yang tidak menemukan apa pun tidak ikut dipelajari.
+    - `summary()`/`log_summary()`: ke mana waktu dihabiskan.
+
+    Sampel durasi disimpan ke `timings_path` agar timeout adaptif berlaku sejak start berikutnya.
+    """
+    def __init__(self, driver, default_timeout=30, adaptive=True, margin=3.0, min_timeout=0.5, history=20,
+                 poll_frequency=0.1, popup_probe_timeout=3, timings_path=None):
+        self.driver = driver
+        self.default_timeout = float(default_timeout)
+        self.popup_probe_timeout = float(popup_probe_timeout)
+        self.adaptive = adaptive
+        self.margin = float(margin)
+        self.min_timeout = float(min_timeout)
+        self.history = max(int(history), 1)
+        self.poll_frequency = float(poll_frequency)
+        self.timings_path = timings_path
+        self.misses = {}
+        self._samples = {}
+        self._session = []
+        self._load_timings()
+
+    @classmethod
+    def from_config(cls, driver, web_agent_config):
+        wait_config = dict(DEFAULT_WAIT_CONFIG, **(web_agent_config.get('waits') or {}))
+        return cls(
+            driver,
+            default_timeout=web_agent_config.get('timeouts', {}).get('element_wait', 30),
+            adaptive=wait_config.get('adaptive'),
+            margin=wait_config.get('margin'),
+            min_timeout=wait_config.get('min_timeout'),
+            history=wait_config.get('history'),
+            poll_frequency=wait_config.get('poll_frequency'),
+            popup_probe_timeout=wait_config.get('popup_probe_timeout'),
+            timings_path=wait_config.get('timings_path') or None,
+        )
+
+    def timeout_for(self, step, default=None):
+        """Timeout adaptif untuk `step`, dibatasi `default` (atau timeout bawaan)."""
+        ceiling = self.default_timeout if default is None else float(default)
+        samples = self._samples.get(step)
+        if not self.adaptive or not samples or len(samples) < 3:
+            return ceiling
+        return min(max(self.margin * max(samples), self.min_timeout), ceiling)
+
+    def until(self, step, condition, timeout=None, required=True):
+        """
+        Menunggu `condition` (callable driver -> nilai truthy) dan mengembalikan nilainya.
+
+        Jika `required` False, None dikembalikan saat timeout alih-alih TimeoutException.
+        """
+        ceiling = self.default_timeout if timeout is None else float(timeout)
+        budget = self.timeout_for(step, ceiling)
+        started = time.monotonic()
+        try:
+            try:
+                result = WebDriverWait(self.driver, budget, poll_frequency=self.poll_frequency).until(condition)
+            except TimeoutException:
+                if budget >= ceiling:
+                    raise
+                logging.info(f"Langkah '{step}' lebih lambat dari biasanya (> {budget:.1f}s); menunggu hingga {ceiling:.0f}s.")
+                result = WebDriverWait(self.driver, ceiling - budget, poll_frequency=self.poll_frequency).until(condition)
+        except TimeoutException:
+            self._miss(step, time.monotonic() - started)
+            if required:
+                raise
+            logging.info(f"Langkah '{step}': kondisi tidak terpenuhi dalam {ceiling:.1f}s; dilanjutkan.")
+            return None
+        self._record(step, time.monotonic() - started)
+        return result
+
+    def probe(self, step, locators, timeout=None):
+        """Elemen terlihat pertama yang cocok dengan salah satu `locators`, atau None dalam batas waktu."""
+        budget = self.timeout_for(step, self.popup_probe_timeout if timeout is None else timeout)
+        locator = _batched_locator(locators)
+        if locator:
+            condition = EC.visibility_of_any_elements_located(locator)
+        else:
+            condition = EC.any_of(*[EC.visibility_of_element_located(item) for item in locators])
+        started = time.monotonic()
+        try:
+            found = WebDriverWait(self.driver, budget, poll_frequency=self.poll_frequency).until(condition)
+        except TimeoutException:
+            self._miss(step, time.monotonic() - started)
+            return None
+        self._record(step, time.monotonic() - started)
+        return found[0] if isinstance(found, list) else found
+
+    def _record(self, step, seconds):
+        self._samples.setdefault(step, deque(maxlen=self.history)).append(seconds)
+        self._session.append((step, seconds, True))
+        logging.debug(f"Langkah '{step}' selesai dalam {seconds:.2f}s.")
+
+    def _miss(self, step, seconds):
+        self.misses[step] = self.misses.get(step, 0) + 1
+        self._session.append((step, seconds, False))
+
+    def summary(self):
+        """Total waktu, jumlah, dan miss per langkah sejak engine dibuat (urutan pertama kali muncul)."""
+        summary = {}
+        for step, seconds, hit in self._session:
+            entry = summary.setdefault(step, {'count': 0, 'seconds': 0.0, 'misses': 0})
+            entry['count'] += 1
+            entry['seconds'] += seconds
+            entry['misses'] += 0 if hit else 1
+        return summary
+
+    def log_summary(self, title="Waktu tunggu"):
+        summary = self.summary()
+        if not summary:
+            return
+        total = sum(entry['seconds'] for entry in summary.values())
+        steps = ", ".join(
+            f"{step} {entry['seconds']:.2f}s" + (f" (x{entry['count']})" if entry['count'] > 1 else "")
+            + (f" [{entry['misses']} timeout]" if entry['misses'] else "")
+            for step, entry in summary.items()
+        )
+        logging.info(f"{title}: total {total:.2f}s - {steps}")
+
+    def _load_timings(self):
+        if not self.timings_path:
+            return
+        try:
+            with open(self.timings_path, 'r', encoding='utf-8') as f:
+                stored = json.load(f)
+        except FileNotFoundError:
+            return
+        except (json.JSONDecodeError, OSError) as e:
+            logging.warning(f"Riwayat waktu tunggu '{self.timings_path}' tidak dapat dibaca ({e}).")
+            return
+        for step, samples in stored.items():
+            self._samples[step] = deque(samples, maxlen=self.history)
+
+    def save_timings(self):
+        if not self.timings_path or not self._samples:
+            return
+        directory = os.path.dirname(self.timings_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = self.timings_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({step: list(samples) for step, samples in self._samples.items()}, f)
+        os.replace(tmp_path, self.timings_path)
+
+
+def _batched_locator(locators):
+    """Menggabungkan locator sejenis menjadi satu query (XPath union / daftar selector CSS)."""
+    kinds = {by for by, _ in locators}
+    if len(locators) == 1:
+        return locators[0]
+    if kinds == {By.XPATH}:
+        return By.XPATH, " | ".join(value for _, value in locators)
+    if kinds == {By.CSS_SELECTOR}:
+        return By.CSS_SELECTOR, ", ".join(value for _, value in locators)
+    return None
+
+
+def handle_popups(driver, xpaths, timers, max_popups=10, waits=None):
     """
     Secara berulang mencari dan menutup semua pop-up "Confirm" setelah login.
 
@@ -60,75 +504,110 @@ def handle_popups(driver, xpaths, timers, max_popups=10):
         xpaths (dict): Konfigurasi XPath dari file config.
         timers (dict): Konfigurasi timer dari file config.
         max_popups (int): Jumlah maksimum pop-up yang akan ditutup.
+        waits (WaitEngine, optional): Engine tunggu bersama; probe pertama memakai timeout
+                                      yang dipelajari dari waktu munculnya pop-up sebelumnya.
     """
     logging.info("Checking for post-login pop-ups...")
+    waits = waits or WaitEngine(driver)
     popups_closed = 0
     
     try:
         popup_config = xpaths.get('game_interface', {}).get('popup_confirm_button', {})
         by_str = popup_config.get('by', 'XPATH').upper()
-        by = getattr(By, by_str)
-        value = popup_config.get('value')
+        locators = [(getattr(By, by_str), popup_config['value'])]
     except (KeyError, AttributeError):
         logging.error("Popup configuration not found or invalid in config.")
         return
 
     while popups_closed < max_popups:
         try:
-            confirm_button = WebDriverWait(driver, 3).until(
-                EC.element_to_be_clickable((by, value))
-            )
+            # Pop-up berikutnya biasanya sudah ada di DOM; hanya probe pertama yang menunggu lama.
+            if popups_closed == 0:
+                confirm_button = waits.probe('popup.first', locators, timeout=waits.popup_probe_timeout)
+            else:
+                confirm_button = waits.probe('popup.next', locators, timeout=timers.get('popup_check_sleep', 0.5))
+            if confirm_button is None:
+                logging.info("No more 'Confirm' pop-ups found.")
+                break
             logging.info(f"Found a 'Confirm' pop-up. Closing it (popup #{popups_closed + 1})...")
             driver.execute_script("arguments[0].click();", confirm_button)
             popups_closed += 1
-            time.sleep(timers.get('post_action_sleep', 1))
-        except TimeoutException:
-            logging.info("No more 'Confirm' pop-ups found.")
-            break
+            waits.until('popup.dismiss', EC.invisibility_of_element(confirm_button),
+                        timeout=timers.get('post_action_sleep', 1), required=False)
         except Exception as e:
             logging.error(f"An error occurred while handling pop-ups: {e}")
             break
 
-def process_api_response(request):
+_decoder_state = threading.local()
+
+
+def _get_decompressor():
+    """Mengembalikan ZstdDecompressor per-thread yang dipakai ulang antar panggilan."""
+    dctx = getattr(_decoder_state, 'dctx', None)
+    if dctx is None:
+        dctx = zstandard.ZstdDecompressor()
+        _decoder_state.dctx = dctx
+    return dctx
+
+
+def _json_loads(data):
+    """Parse JSON langsung dari bytes; memakai orjson jika tersedia."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def decode_api_body(body, headers):
     """
-    Memproses respons permintaan API, menangani kemungkinan kompresi zstd,
-    dan mengembalikan daftar rekaman.
+    Mendekompresi (jika zstd) dan mem-parsing body respons API menjadi daftar rekaman.
 
     Args:
-        request: Objek permintaan yang ditangkap oleh Selenium-Wire.
+        body (bytes): Body respons mentah.
+        headers: Header respons (mapping dengan `get`).
 
     Returns:
         list: Daftar rekaman dari respons API, atau daftar kosong jika terjadi kesalahan.
     """
-    if not (request and request.response and request.response.body):
-        logging.warning("Request, response, or response body is missing.")
-        return []
-
-    body = request.response.body
-    
-    if request.response.headers.get('Content-Encoding') == 'zstd':
+    if headers.get('Content-Encoding') == 'zstd':
         try:
-            dctx = zstandard.ZstdDecompressor()
-            with dctx.stream_reader(body) as reader:
-                body = reader.read()
+            dctx = _get_decompressor()
+            if zstandard.frame_content_size(body) > 0:
+                body = dctx.decompress(body)
+            else:
+                # Frame tanpa ukuran konten (mode streaming) tidak bisa didekompresi sekali jalan.
+                body = dctx.decompressobj().decompress(body)
         except zstandard.ZstdError as e:
             logging.error(f"Failed to decompress zstd body: {e}")
             return []
 
-    try:
-        response_str = body.decode('utf-8')
-    except UnicodeDecodeError as e:
-        logging.error(f"Failed to decode response body to UTF-8: {e}")
-        return []
-
-    if not response_str.strip():
+    if not body.strip():
         logging.warning("Response body is empty after decoding.")
         return []
-        
+
     try:
-        data = json.loads(response_str)
-        records = data.get('data', {}).get('list', [])
-        return records if isinstance(records, list) else []
-    except json.JSONDecodeError as e:
-        logging.error(f"Failed to parse JSON from response: {e}. Body: {response_str[:200]}")
+        data = _json_loads(body)
+    except ValueError as e:
+        logging.error(f"Failed to parse JSON from response: {e}. Body: {body[:200]!r}")
         return []
+    if not isinstance(data, dict):
+        return []
+    records = (data.get('data') or {}).get('list', [])
+    return records if isinstance(records, list) else []
+
+
+def process_api_response(request):
+    """
+    Memproses respons permintaan API, menangani kemungkinan kompresi zstd,
+    dan mengembalikan daftar rekaman.
+
+    Args:
+        request: Objek permintaan yang ditangkap oleh Selenium-Wire.
+
+    Returns:
+        list: Daftar rekaman dari respons API, atau daftar kosong jika terjadi kesalahan.
+    """
+    if not (request and request.response and request.response.body):
+        logging.warning("Request, response, or response body is missing.")
+        return []
+
+    return decode_api_body(request.response.body, request.response.headers)
@@ -0,0 +1,400 @@
+# ==============================================================================
+#                         MODUL PENYIMPANAN DATA RIWAYAT
+# ==============================================================================
+#  Lapisan penyimpanan yang dapat diganti untuk file riwayat game. Format
+#  dipilih dari ekstensi `project_setup.data_path` (atau `data_format`):
+#    - .csv               : teks, kompatibel dengan file lama.
+#    - .arrow / .feather  : Arrow IPC dengan kolom bertipe, dibaca via mmap.
+#    - .parquet           : Parquet dengan kolom bertipe, dibaca via mmap.
+#  Backend kolumnar menyimpan penambahan sebagai segmen Arrow kecil di samping
+#  file utama dan memadatkannya secara bertingkat, sehingga biaya append
+#  rata-rata tetap datar berapa pun panjang riwayatnya.
+# ==============================================================================
+
+# Standard library imports
+import glob
+import io
+import logging
+import os
+
+# Third-party imports
+import pandas as pd
+
+from src.rl_agent.records import ResultBatch, MISSING_PREMIUM, encode_colors
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+COLUMNS = ['Period', 'Number', 'Big/Small', 'Color', 'Premium']
+CSV_DTYPES = {'Period': 'int64', 'Number': 'int64', 'Big/Small': 'object', 'Color': 'object', 'Premium': 'Int64'}
+
+FORMAT_BY_EXTENSION = {
+    '.csv': 'csv',
+    '.arrow': 'arrow',
+    '.feather': 'arrow',
+    '.ipc': 'arrow',
+    '.parquet': 'parquet',
+}
+
+
+def to_typed_frame(df):
+    """Mengubah DataFrame riwayat ke skema bertipe yang dipakai semua backend."""
+    df = df.copy()
+    for col in COLUMNS:
+        if col not in df.columns:
+            df[col] = pd.NA
+    df = df[COLUMNS]
+    df['Period'] = pd.to_numeric(df['Period']).astype('int64')
+    df['Number'] = pd.to_numeric(df['Number']).astype('int64')
+    df['Premium'] = pd.to_numeric(df['Premium'], errors='coerce').astype('Int64')
+    df['Big/Small'] = df['Big/Small'].astype('object')
+    df['Color'] = df['Color'].astype('object')
+    return df
+
+
+class CsvStorage:
+    """Backend CSV. Append menulis baris ke akhir file; tail dibaca dari akhir file."""
+    format_name = 'csv'
+
+    def __init__(self, path):
+        self.path = path
+
+    def exists(self):
+        return os.path.exists(self.path) and os.path.getsize(self.path) > 0
+
+    def read(self, columns=None):
+        if not self.exists():
+            raise FileNotFoundError(self.path)
+        dtypes = {col: CSV_DTYPES[col] for col in (columns or COLUMNS)}
+        return pd.read_csv(self.path, usecols=columns, dtype=dtypes)
+
+    def read_batch(self):
+        """Membaca seluruh riwayat sebagai `ResultBatch` ringkas."""
+        return ResultBatch.from_frame(self.read())
+
+    def read_tail(self, n):
+        """Membaca n baris terakhir dengan seek dari akhir file, tanpa parsing seluruh file."""
+        if not self.exists():
+            raise FileNotFoundError(self.path)
+        block_size = 64 * 1024
+        with open(self.path, 'rb') as f:
+            header = f.readline()
+            data_start = f.tell()
+            f.seek(0, os.SEEK_END)
+            pos = f.tell()
+            chunk = b''
+            while pos > data_start and chunk.count(b'\n') <= n:
+                step = min(block_size, pos - data_start)
+                pos -= step
+                f.seek(pos)
+                chunk = f.read(step) + chunk
+        lines = chunk.splitlines()
+        if pos > data_start:
+            lines = lines[1:]  # Baris pertama mungkin terpotong
+        lines = [line for line in lines if line.strip()][-n:] if n > 0 else []
+        return pd.read_csv(io.BytesIO(header + b'\n'.join(lines) + b'\n'), dtype=CSV_DTYPES)
+
+    def count(self):
+        if not self.exists():
+            return 0
+        with open(self.path, 'rb') as f:
+            return max(sum(chunk.count(b'\n') for chunk in iter(lambda: f.read(1 << 20), b'')) - 1, 0)
+
+    def append(self, df):
+        df = to_typed_frame(df)
+        df.to_csv(self.path, mode='a', header=not self.exists(), index=False)
+
+    def write(self, df):
+        df = to_typed_frame(df)
+        tmp_path = self.path + '.tmp'
+        df.to_csv(tmp_path, index=False)
+        os.replace(tmp_path, self.path)
+
+
+class ArrowStorage:
+    """
+    Backend Arrow IPC dengan kolom bertipe. File utama dan segmen append dibaca
+    melalui memory map, sehingga load dan tail-read tidak perlu mem-parsing teks.
+
+    Setiap append ditulis sebagai segmen kecil bernama `<id awal>-<id akhir>-<baris>.arrow`.
+    Pemadatan bertingkat: setiap `compact_segments` segmen setingkat terbaru
+    digabung menjadi satu segmen tingkat berikutnya, sehingga setiap baris hanya
+    ditulis ulang O(log n) kali. Segmen baru digabung ke file utama setelah
+    jumlah barisnya menyamai file utama (file utama paling sedikit berlipat dua
+    setiap kali ditulis ulang), jadi biaya append rata-rata tidak bergantung
+    pada panjang riwayat. `compact()` memadatkan semuanya secara eksplisit
+    (mis. saat offline). File utama mencatat id segmen terakhir yang sudah
+    dimuatnya di metadata skema, sehingga segmen sisa pemadatan yang terputus
+    diabaikan.
+    """
+    format_name = 'arrow'
+    THROUGH_KEY = b'segments_through'
+
+    def __init__(self, path, compact_segments=8):
+        if pa is None:
+            raise ImportError("Backend kolumnar membutuhkan paket 'pyarrow'. Jalankan: pip install pyarrow")
+        self.path = path
+        self.segment_dir = path + '.segments'
+        self.compact_segments = max(int(compact_segments), 2)
+        self.schema = pa.schema([
+            ('Period', pa.int64()),
+            ('Number', pa.uint8()),
+            ('Big/Small', pa.dictionary(pa.int8(), pa.string())),
+            ('Color', pa.dictionary(pa.int8(), pa.string())),
+            ('Premium', pa.int64()),
+        ])
+        self._base_meta = None  # (id segmen terakhir di file utama, jumlah baris), dibaca sekali
+
+    def exists(self):
+        return os.path.exists(self.path) or bool(self._segments())
+
+    # --- File utama ---
+    def _read_base(self, columns=None):
+        with pa.memory_map(self.path, 'r') as source:
+            table = pa.ipc.open_file(source).read_all()
+        return table.select(columns) if columns else table
+
+    def _read_base_meta(self):
+        """(metadata skema, jumlah baris) file utama tanpa membaca kolomnya."""
+        with pa.memory_map(self.path, 'r') as source:
+            reader = pa.ipc.open_file(source)
+            rows = sum(reader.get_batch(i).num_rows for i in range(reader.num_record_batches))
+            return reader.schema.metadata, rows
+
+    def _write_base_file(self, table):
+        tmp_path = self.path + '.tmp'
+        with pa.OSFile(tmp_path, 'wb') as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(tmp_path, self.path)
+
+    def _write_base(self, table, through):
+        metadata = dict(table.schema.metadata or {})
+        metadata[self.THROUGH_KEY] = str(through).encode()
+        self._write_base_file(table.replace_schema_metadata(metadata))
+        self._base_meta = (through, table.num_rows)
+
+    def _base_info(self):
+        if self._base_meta is None:
+            if os.path.exists(self.path):
+                metadata, rows = self._read_base_meta()
+                self._base_meta = (int((metadata or {}).get(self.THROUGH_KEY, -1)), rows)
+            else:
+                self._base_meta = (-1, 0)
+        return self._base_meta
+
+    # --- Segmen append ---
+    def _segments(self, prune=False):
+        """
+        Segmen aktif terurut sebagai daftar (id awal, id akhir, baris, path).
+        Segmen yang sudah termuat di file utama atau tercakup segmen gabungan
+        (sisa pemadatan yang terputus) dilewati, atau dihapus jika `prune`.
+        """
+        entries = []
+        for path in glob.glob(os.path.join(self.segment_dir, '*.arrow')):
+            parts = os.path.basename(path)[:-len('.arrow')].split('-')
+            try:
+                first = int(parts[0])
+                last = int(parts[1]) if len(parts) > 1 else first
+                rows = int(parts[2]) if len(parts) > 2 else None  # Nama lama: '<id>.arrow'
+            except ValueError:
+                continue
+            entries.append((first, last, rows, path))
+        entries.sort(key=lambda entry: (entry[0], -entry[1]))
+        through = self._base_info()[0]
+        active = []
+        for entry in entries:
+            if entry[1] <= through or (active and entry[1] <= active[-1][1]):
+                if prune:
+                    os.remove(entry[3])
+                continue
+            active.append(entry)
+        return active
+
+    def _segment_paths(self):
+        return [entry[3] for entry in self._segments()]
+
+    def _segment_rows(self, entry):
+        return entry[2] if entry[2] is not None else self._read_segment(entry[3], ['Period']).num_rows
+
+    def _read_segment(self, path, columns=None):
+        with pa.memory_map(path, 'r') as source:
+            table = pa.ipc.open_file(source).read_all()
+        return table.select(columns) if columns else table
+
+    def _write_segment(self, table, first, last):
+        path = os.path.join(self.segment_dir, f"{first:08d}-{last:08d}-{table.num_rows}.arrow")
+        tmp_path = path + '.tmp'
+        with pa.OSFile(tmp_path, 'wb') as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(tmp_path, path)
+        return (first, last, table.num_rows, path)
+
+    def _tier(self, first, last):
+        """Tingkat segmen: segmen berisi fanout^k append berada di tingkat k."""
+        span, tier = last - first + 1, 0
+        while span >= self.compact_segments:
+            span //= self.compact_segments
+            tier += 1
+        return tier
+
+    def _remove_segment_files(self):
+        for path in glob.glob(os.path.join(self.segment_dir, '*.arrow')):
+            os.remove(path)
+
+    def _to_table(self, df):
+        df = to_typed_frame(df)
+        return pa.Table.from_pandas(df, schema=self.schema, preserve_index=False)
+
+    def read_table(self, columns=None):
+        tables = []
+        if os.path.exists(self.path):
+            tables.append(self._read_base(columns))
+        tables.extend(self._read_segment(p, columns) for p in self._segment_paths())
+        if not tables:
+            raise FileNotFoundError(self.path)
+        return pa.concat_tables(tables) if len(tables) > 1 else tables[0]
+
+    def read(self, columns=None):
+        return self._table_to_frame(self.read_table(columns))
+
+    def read_batch(self):
+        """Membaca seluruh riwayat langsung dari kolom Arrow ke `ResultBatch` tanpa DataFrame."""
+        table = self.read_table()
+        return ResultBatch(
+            table.column('Period').to_numpy(),
+            table.column('Number').to_numpy(),
+            encode_colors(table.column('Color').to_pandas()),
+            table.column('Premium').fill_null(MISSING_PREMIUM).to_numpy(),
+        )
+
+    def read_tail(self, n):
+        """Membaca n baris terakhir mulai dari segmen terbaru, tanpa memuat seluruh riwayat."""
+        tables = []
+        remaining = n
+        sources = self._segment_paths()[::-1]
+        for path in sources:
+            table = self._read_segment(path)
+            tables.insert(0, table.slice(max(table.num_rows - remaining, 0)))
+            remaining -= table.num_rows
+            if remaining <= 0:
+                break
+        if remaining > 0 and os.path.exists(self.path):
+            base = self._read_base()
+            tables.insert(0, base.slice(max(base.num_rows - remaining, 0)))
+        if not tables:
+            raise FileNotFoundError(self.path)
+        table = pa.concat_tables(tables) if len(tables) > 1 else tables[0]
+        return self._table_to_frame(table)
+
+    def count(self):
+        """Jumlah baris dari metadata file utama dan nama segmen, tanpa membaca kolom."""
+        return self._base_info()[1] + sum(self._segment_rows(entry) for entry in self._segments())
+
+    def append(self, df):
+        os.makedirs(self.segment_dir, exist_ok=True)
+        segments = self._segments(prune=True)
+        next_id = max([self._base_info()[0]] + [entry[1] for entry in segments]) + 1
+        segments.append(self._write_segment(self._to_table(df), next_id, next_id))
+
+        fanout = self.compact_segments
+        while len(segments) >= fanout:
+            merged = segments[-fanout:]
+            if len({self._tier(first, last) for first, last, _, _ in merged}) != 1:
+                break
+            table = pa.concat_tables([self._read_segment(entry[3]) for entry in merged]).combine_chunks()
+            entry = self._write_segment(table, merged[0][0], merged[-1][1])
+            for _, _, _, path in merged:
+                os.remove(path)
+            segments[-fanout:] = [entry]
+        if sum(self._segment_rows(entry) for entry in segments) >= self._base_info()[1]:
+            self.compact()
+
+    def compact(self):
+        """Menggabungkan semua segmen append ke file utama."""
+        segments = self._segments()
+        if not segments:
+            return
+        table = self.read_table()
+        self._write_base(table.combine_chunks(), segments[-1][1])
+        self._remove_segment_files()
+        logging.debug(f"Storage '{self.path}' dipadatkan: {table.num_rows} baris.")
+
+    def write(self, df):
+        segments = self._segments()
+        through = max([self._base_info()[0]] + [entry[1] for entry in segments])
+        self._write_base(self._to_table(df), through)
+        self._remove_segment_files()
+
+    @staticmethod
+    def _table_to_frame(table):
+        df = table.to_pandas()
+        for col in ('Big/Small', 'Color'):
+            if col in df.columns:
+                df[col] = df[col].astype('object')
+        if 'Number' in df.columns:
+            df['Number'] = df['Number'].astype('int64')
+        return df
+
+
+class ParquetStorage(ArrowStorage):
+    """Backend Parquet: file utama disimpan sebagai Parquet, segmen append tetap Arrow IPC."""
+    format_name = 'parquet'
+
+    def _read_base(self, columns=None):
+        return pq.read_table(self.path, columns=columns, memory_map=True)
+
+    def _read_base_meta(self):
+        metadata = pq.ParquetFile(self.path).metadata
+        return metadata.schema.to_arrow_schema().metadata, metadata.num_rows
+
+    def _write_base_file(self, table):
+        tmp_path = self.path + '.tmp'
+        pq.write_table(table, tmp_path, compression='zstd')
+        os.replace(tmp_path, self.path)
+
+
+STORAGE_CLASSES = {
+    'csv': CsvStorage,
+    'arrow': ArrowStorage,
+    'parquet': ParquetStorage,
+}
+
+
+def open_storage(path, data_format=None, **kwargs):
+    """
+    Membuat backend penyimpanan untuk path tertentu.
+
+    Args:
+        path (str): Path file data.
+        data_format (str, optional): 'csv', 'arrow', atau 'parquet'. Jika None,
+                                     format ditentukan dari ekstensi file.
+
+    Returns:
+        Backend penyimpanan (CsvStorage, ArrowStorage, atau ParquetStorage).
+    """
+    if not data_format:
+        extension = os.path.splitext(path)[1].lower()
+        data_format = FORMAT_BY_EXTENSION.get(extension, 'csv')
+    try:
+        storage_class = STORAGE_CLASSES[data_format.lower()]
+    except KeyError:
+        raise ValueError(f"Format data tidak dikenal: '{data_format}'. Pilihan: {', '.join(STORAGE_CLASSES)}")
+    if storage_class is CsvStorage:
+        return storage_class(path)
+    return storage_class(path, **kwargs)
+
+
+def storage_from_config(config):
+    """Membuat backend penyimpanan dari blok `project_setup` di config.yaml."""
+    project_setup = config.get('project_setup', {})
+    return open_storage(
+        project_setup.get('data_path', 'data/databaru_from_api.csv'),
+        data_format=project_setup.get('data_format'),
+        compact_segments=project_setup.get('compact_segments', 8),
+    )
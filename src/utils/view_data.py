@@ -1,21 +1,35 @@
 import sys
 import os
-import pandas as pd
+import yaml
+
+# Path setup
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.utils.storage import storage_from_config
 
 def main():
     """
     Displays the current scraping data.
     """
-    output_csv_path = 'data/databaru_from_api.csv'
+    with open(os.path.join(project_root, 'config.yaml'), 'r', encoding='utf-8') as f:
+        config = yaml.safe_load(f)
+    storage = storage_from_config(config)
+    output_csv_path = storage.path
     print("[+] Latest scraping results:")
     try:
-        df = pd.read_csv(output_csv_path)
-        print(f'Total records: {len(df)}')
+        total = storage.count()
+        latest_df = storage.read_tail(5)
+        first_df = storage.read(columns=['Period']) if total > 0 else None
+        print(f'Total records: {total}')
         print('Latest 5 records:')
         print('-' * 30)
-        print(df.tail().to_string(index=False))
+        print(latest_df.to_string(index=False))
         print('-' * 30)
-        print(f'Date range: {df.iloc[0,0] if len(df) > 0 else 'N/A'} to {df.iloc[-1,0] if len(df) > 0 else 'N/A'}')
+        first_period = first_df['Period'].iloc[0] if total > 0 else 'N/A'
+        last_period = latest_df['Period'].iloc[-1] if total > 0 else 'N/A'
+        print(f'Date range: {first_period} to {last_period}')
     except FileNotFoundError:
         print(f"[X] No scraping data found at {output_csv_path}.")
         print("Run scraping operations first to generate data.")
@@ -0,0 +1,7 @@
+import os
+import sys
+
+# Modul diimpor sebagai `src.rl_agent...` dari root proyek.
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
@@ -0,0 +1,109 @@
+import json
+
+import numpy as np
+
+from src.rl_agent.bulk_progress import BulkScrapeProgress
+from src.rl_agent.data_store import HistoryStore
+from src.rl_agent.records import synthetic_history
+from src.utils.storage import open_storage
+
+PAGE_SIZE = 10
+
+
+def page_records(history, page_no):
+    """Halaman API `page_no` (terbaru lebih dulu), seperti GetNoaverageEmerdList."""
+    end = len(history) - (page_no - 1) * PAGE_SIZE
+    page = history[max(end - PAGE_SIZE, 0):end]
+    return [{'issueNumber': str(period), 'number': str(number), 'colour': color, 'premium': str(premium)}
+            for period, number, color, premium in zip(page.period.tolist()[::-1], page.number.tolist()[::-1],
+                                                      page.color_labels.tolist()[::-1], page.premium.tolist()[::-1])]
+
+
+def make_store(tmp_path, rows):
+    store = HistoryStore(open_storage(str(tmp_path / 'history.csv')))
+    store.load()
+    if len(rows):
+        store.ingest(rows)
+    return store
+
+
+def test_stops_at_watermark(tmp_path):
+    history = synthetic_history(200)
+    store = make_store(tmp_path, history[:150])
+    progress = BulkScrapeProgress(store, str(tmp_path / 'checkpoint.json'), checkpoint_every=3)
+    assert progress.begin(last_page=20) == 2
+    assert progress.watermark == int(history.period[149])
+    progress.accept(1, page_records(history, 1))
+    page_no = 2
+    while progress.accept(page_no, page_records(history, page_no)):
+        page_no += 1
+    progress.complete()
+    assert progress.reached_watermark
+    assert page_no == 6  # Halaman 6 seluruhnya <= watermark
+    np.testing.assert_array_equal(store.index.periods, history.period)
+    assert not (tmp_path / 'checkpoint.json').exists()
+
+
+def test_abort_and_resume_from_checkpoint(tmp_path):
+    history = synthetic_history(100)
+    checkpoint = tmp_path / 'checkpoint.json'
+    store = make_store(tmp_path, history[:0])
+    progress = BulkScrapeProgress(store, str(checkpoint), checkpoint_every=2, stop_at_watermark=False)
+    assert progress.begin(last_page=10) == 2
+    progress.accept(1, page_records(history, 1))
+    for page_no in range(2, 5):
+        progress.accept(page_no, page_records(history, page_no))
+    progress.abort(next_page=5)
+
+    state = json.loads(checkpoint.read_text())
+    assert state['next_page'] == 5 and state['last_page'] == 10
+    # Baris disimpan di file pending; store baru diubah saat run selesai.
+    assert state['pending_rows'] == 40
+    assert len(store.index) == 0
+
+    resumed = BulkScrapeProgress(make_store(tmp_path, history[:0]), str(checkpoint), checkpoint_every=2,
+                                 stop_at_watermark=False)
+    assert resumed.begin(last_page=10) == 5
+    assert resumed.watermark == state['watermark']
+    for page_no in range(5, 11):
+        resumed.accept(page_no, page_records(history, page_no))
+    resumed.complete()
+    np.testing.assert_array_equal(resumed.history_store.index.periods, history.period)
+    assert not checkpoint.exists()
+    assert not (tmp_path / 'checkpoint.rows').exists()
+
+
+def test_older_pages_merge_with_a_single_rewrite(tmp_path):
+    history = synthetic_history(200)
+    store = make_store(tmp_path, history[150:])
+    progress = BulkScrapeProgress(store, str(tmp_path / 'checkpoint.json'), checkpoint_every=2,
+                                  stop_at_watermark=False)
+    progress.begin(last_page=20)
+    for page_no in range(1, 21):
+        progress.accept(page_no, page_records(history, page_no))
+    assert store.rewrites == 0
+    progress.complete()
+    assert store.rewrites == 1
+    assert progress.rows_changed == 150
+    np.testing.assert_array_equal(store.index.periods, history.period)
+
+
+def test_missing_pending_file_starts_over(tmp_path):
+    history = synthetic_history(100)
+    checkpoint = tmp_path / 'checkpoint.json'
+    progress = BulkScrapeProgress(make_store(tmp_path, history[:0]), str(checkpoint), checkpoint_every=2)
+    progress.begin(last_page=10)
+    for page_no in range(1, 4):
+        progress.accept(page_no, page_records(history, page_no))
+    progress.abort(next_page=4)
+    (tmp_path / 'checkpoint.rows').unlink()
+
+    resumed = BulkScrapeProgress(make_store(tmp_path, history[:0]), str(checkpoint))
+    assert resumed.begin(last_page=10) == 2
+
+
+def test_unreadable_checkpoint_starts_over(tmp_path):
+    checkpoint = tmp_path / 'checkpoint.json'
+    checkpoint.write_text('{not json')
+    progress = BulkScrapeProgress(make_store(tmp_path, synthetic_history(0)), str(checkpoint))
+    assert progress.begin(last_page=3) == 2
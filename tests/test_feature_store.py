@@ -0,0 +1,138 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.rl_agent.data_store import HistoryStore
+from src.rl_agent.feature_store import FeatureStore, compute_features, latest_features
+from src.rl_agent.records import COLOR_RED, synthetic_history
+from src.utils.storage import open_storage
+
+WINDOW = 5
+
+
+def reference_features(batch, window_size):
+    """Referensi pandas untuk lag, streak, dan frekuensi bergulir."""
+    numbers = pd.Series(batch.number.astype(np.int64))
+    reference = {f'lag_{k}': numbers.shift(k) for k in range(window_size)}
+    big = numbers >= 5
+    reference['streak_len'] = big.groupby((big != big.shift()).cumsum()).cumcount() + 1
+    for digit in range(10):
+        reference[f'freq_{digit}'] = (numbers == digit).rolling(window_size, min_periods=1).mean()
+    reference['big_ratio'] = big.rolling(window_size, min_periods=1).mean()
+    reference['red_ratio'] = pd.Series((batch.color & COLOR_RED) > 0).rolling(window_size, min_periods=1).mean()
+    return pd.DataFrame(reference)
+
+
+def assert_store_matches(store, batch):
+    np.testing.assert_array_equal(store.periods, batch.period)
+    np.testing.assert_allclose(store.features, compute_features(batch.number, batch.color, WINDOW), equal_nan=True)
+
+
+def make_history_store(tmp_path, batch):
+    store = HistoryStore(open_storage(str(tmp_path / 'history.csv')))
+    store.load()
+    store.ingest(batch)
+    return store
+
+
+def test_compute_features_matches_pandas_reference():
+    history = synthetic_history(300)
+    features = compute_features(history.number, history.color, WINDOW)
+    frame = pd.DataFrame(features, columns=FeatureStore(WINDOW).names)
+    reference = reference_features(history, WINDOW)
+    pd.testing.assert_frame_equal(frame[reference.columns], reference, check_dtype=False, atol=1e-6)
+
+
+def test_latest_features_matches_last_row():
+    history = synthetic_history(40)
+    for n in (1, 3, WINDOW, 40):
+        expected = compute_features(history.number[:n], history.color[:n], WINDOW)[-1]
+        np.testing.assert_allclose(latest_features(history.number[:n], history.color[:n], WINDOW), expected,
+                                   equal_nan=True)
+
+
+def test_incremental_sync_matches_backfill(tmp_path):
+    history = synthetic_history(200)
+    history_store = make_history_store(tmp_path, history[:120])
+    store = FeatureStore(WINDOW).sync(history_store)
+    assert_store_matches(store, history[:120])
+    for start in range(120, 200, 7):
+        history_store.ingest(history[start:start + 7])
+        store.sync(history_store)
+        assert_store_matches(store, history[:start + 7])
+
+
+def test_sync_rebuilds_after_correction(tmp_path):
+    history = synthetic_history(80)
+    history_store = make_history_store(tmp_path, history)
+    store = FeatureStore(WINDOW).sync(history_store)
+    corrected = history[[30]]
+    corrected.number[0] = (corrected.number[0] + 1) % 10
+    history_store.ingest(corrected)
+    store.sync(history_store)
+    assert_store_matches(store, history_store.index.batch())
+    assert store.rows_for([history.period[30]])[0, 0] == corrected.number[0]
+
+
+def test_save_load_resumes_incremental_state(tmp_path):
+    history = synthetic_history(100)
+    history_store = make_history_store(tmp_path, history[:60])
+    path = str(tmp_path / 'features')
+    FeatureStore(WINDOW, path=path).sync(history_store).save()
+
+    history_store.ingest(history[60:])
+    reloaded = FeatureStore(WINDOW, path=path)
+    reloaded.load()
+    assert len(reloaded) == 60
+    reloaded.sync(history_store)
+    assert_store_matches(reloaded, history)
+
+
+def test_save_appends_and_rewrites_only_after_rebuild(tmp_path):
+    history = synthetic_history(120)
+    history_store = make_history_store(tmp_path, history[:60])
+    path = str(tmp_path / 'features')
+    store = FeatureStore(WINDOW, path=path, save_every=None).sync(history_store)
+    store.save()
+    assert store.rewrites == 1
+    features_file = tmp_path / 'features' / FeatureStore.FEATURES_FILE
+    saved_prefix = features_file.read_bytes()
+
+    for start in range(60, 100, 10):
+        history_store.ingest(history[start:start + 10])
+        store.sync(history_store).save()
+    assert store.rewrites == 1
+    assert features_file.read_bytes()[:len(saved_prefix)] == saved_prefix
+
+    corrected = history[[30]]
+    corrected.number[0] = (corrected.number[0] + 1) % 10
+    history_store.ingest(corrected)
+    store.sync(history_store).save()
+    assert store.rewrites == 2
+
+    reloaded = FeatureStore(WINDOW, path=path)
+    assert reloaded.load()
+    assert_store_matches(reloaded, history_store.index.batch())
+
+
+def test_load_ignores_unsaved_trailing_bytes(tmp_path):
+    history = synthetic_history(50)
+    history_store = make_history_store(tmp_path, history)
+    path = str(tmp_path / 'features')
+    FeatureStore(WINDOW, path=path).sync(history_store).save()
+    # Penulisan append yang terputus sebelum meta.json diperbarui.
+    with open(tmp_path / 'features' / FeatureStore.PERIODS_FILE, 'ab') as f:
+        f.write(b'\x00' * 12)
+
+    reloaded = FeatureStore(WINDOW, path=path)
+    assert reloaded.load()
+    assert_store_matches(reloaded, history)
+    assert not FeatureStore(WINDOW + 1, path=path).load()
+
+
+def test_rows_for_missing_period_raises():
+    history = synthetic_history(10)
+    store = FeatureStore(WINDOW)
+    store.rebuild(history)
+    with pytest.raises(KeyError):
+        store.rows_for([history.period[-1] + 1])
@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+pytest.importorskip('lightgbm')
+
+from src.rl_agent import forecaster
+from src.rl_agent.data_store import HistoryStore
+from src.rl_agent.feature_store import FeatureStore
+from src.rl_agent.forecaster import LightGBMPredictor, build_training_set, train_forecaster
+from src.rl_agent.records import synthetic_history
+from src.utils.storage import open_storage
+
+WINDOW = 5
+
+
+@pytest.fixture
+def config(tmp_path):
+    return {
+        'project_setup': {'model_dir': str(tmp_path)},
+        'environment': {'window_size': WINDOW},
+        'forecaster_model': {'load_pretrained': False,
+                             'lgbm_params': {'n_estimators': 20, 'num_leaves': 7, 'verbose': -1,
+                                             'early_stopping_rounds': 5}},
+    }
+
+
+@pytest.fixture
+def stores(tmp_path):
+    history_store = HistoryStore(open_storage(str(tmp_path / 'history.csv')))
+    history_store.load()
+    history_store.ingest(synthetic_history(600))
+    return history_store, FeatureStore(WINDOW).open(history_store)
+
+
+def test_training_set_from_store_matches_backfill(stores):
+    history_store, feature_store = stores
+    batch = history_store.index.batch()
+    X_store, y_store = build_training_set(batch, WINDOW, feature_store.features)
+    X, y = build_training_set(batch, WINDOW)
+    np.testing.assert_allclose(X_store, X, equal_nan=True)
+    np.testing.assert_array_equal(y_store, y)
+    with pytest.raises(ValueError):
+        build_training_set(batch, WINDOW, feature_store.features[:-1])
+
+
+def test_live_scoring_reads_feature_store(config, stores, monkeypatch):
+    history_store, feature_store = stores
+    predictor = LightGBMPredictor(config)
+    model, scaler, _ = train_forecaster(history_store.index.batch(), config, features=feature_store.features)
+    predictor._set_model(model, scaler)
+    window = history_store.tail_batch(predictor.context_rows)
+    expected = predictor.predict_big_probability(window)
+
+    predictor.attach_feature_store(feature_store)
+    monkeypatch.setattr(forecaster, 'latest_features', lambda *args: pytest.fail("fitur dihitung ulang"))
+    assert predictor.predict_big_probability(window) == pytest.approx(expected)
+    assert predictor.store_hits == 1
+
+    # Period yang belum disinkronkan ke store dihitung dari jendela.
+    history_store.ingest(synthetic_history(601)[600:])
+    monkeypatch.undo()
+    newer = history_store.tail_batch(predictor.context_rows)
+    assert predictor.predict_big_probability(newer) is not None
+    assert predictor.store_hits == 1
+
+
+def test_attach_rejects_other_window_size(config):
+    predictor = LightGBMPredictor(config)
+    with pytest.raises(ValueError):
+        predictor.attach_feature_store(FeatureStore(WINDOW + 1))
@@ -0,0 +1,60 @@
+import json
+import re
+
+from src.rl_agent.page_fetch import InPageFetcher
+from src.rl_agent.response_feed import ResponseFeed
+from src.utils.scraping import INPAGE_FETCH_MARKER, CapturePolicy
+
+API_ENDPOINT = 'api.example.com/api/webapi/GetNoaverageEmerdList'
+API_URL = 'https://' + API_ENDPOINT
+BODY = json.dumps({'data': {'list': [{'issueNumber': '20250719100010279', 'number': '3', 'colour': 'green',
+                                      'premium': '1'}]}}).encode('utf-8')
+
+
+class StubResponse:
+    status_code = 200
+    headers = {}
+    body = BODY
+
+
+class StubRequest:
+    method = 'POST'
+
+    def __init__(self, url, body=b'{"pageNo": 3, "pageSize": 10}'):
+        self.url = url
+        self.body = body
+        self.headers = {'Authorization': 'Bearer x', 'Content-Type': 'application/json', 'Cookie': 'a=b'}
+
+
+def test_template_url_carries_inpage_marker():
+    fetcher = InPageFetcher()
+    fetcher.update_template(StubRequest(API_URL))
+    url, method, headers, body = fetcher.template
+    assert url == f'{API_URL}?{INPAGE_FETCH_MARKER}'
+    assert json.loads(body)['pageNo'] == 1
+    assert 'Cookie' not in headers
+
+    fetcher.update_template(StubRequest(url))
+    assert fetcher.template[0].count(INPAGE_FETCH_MARKER) == 1
+    fetcher.update_template(StubRequest(API_URL + '?lang=en'))
+    assert fetcher.template[0] == f'{API_URL}?lang=en&{INPAGE_FETCH_MARKER}'
+
+
+def test_response_feed_ignores_inpage_fetches():
+    feed = ResponseFeed(API_ENDPOINT)
+    fetcher = InPageFetcher()
+    fetcher.update_template(StubRequest(API_URL))
+    feed.intercept(StubRequest(fetcher.template[0]), StubResponse())
+    feed.intercept(StubRequest(API_URL), StubResponse())
+
+    captured = feed.drain(timeout=0)
+    assert [item.request.url for item in captured] == [API_URL]
+    assert feed.stats()['ignored'] == 1
+
+
+def test_capture_scope_excludes_inpage_fetches():
+    policy = CapturePolicy.from_config({'api_endpoint': API_ENDPOINT})
+    matches = lambda url: any(re.search(scope, url) for scope in policy.scopes)
+    assert matches(API_URL)
+    assert matches(API_URL + '?lang=en')
+    assert not matches(f'{API_URL}?{INPAGE_FETCH_MARKER}')
@@ -0,0 +1,100 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.rl_agent.period_index import PeriodIndex
+from src.rl_agent.records import NUMBER_COLORS, ResultBatch, synthetic_history
+
+VALUE_COLUMNS = ['Number', 'Color', 'Premium']
+
+
+def reference_upsert(reference, batch):
+    """Referensi pandas: kemunculan terakhir per Period menang, hasil diurutkan."""
+    merged = pd.concat([reference, batch.to_frame()], ignore_index=True)
+    return merged.drop_duplicates('Period', keep='last').sort_values('Period', kind='stable').reset_index(drop=True)
+
+
+def assert_matches(index, reference):
+    actual = index.to_frame().reset_index(drop=True)
+    pd.testing.assert_frame_equal(actual[['Period'] + VALUE_COLUMNS], reference[['Period'] + VALUE_COLUMNS],
+                                  check_dtype=False)
+
+
+def random_batch(rng, history, size):
+    """Campuran baris baru, baris lama identik, baris lama yang dikoreksi, dan Period ganda dalam batch."""
+    rows = history[np.sort(rng.choice(len(history), size=size, replace=False))]
+    number = rows.number.copy()
+    corrected = rng.random(size) < 0.3
+    number[corrected] = (number[corrected] + rng.integers(1, 10, corrected.sum())) % 10
+    batch = ResultBatch(rows.period, number, NUMBER_COLORS[number], rows.premium)
+    duplicates = batch[rng.choice(size, size=size // 4, replace=False)]
+    return ResultBatch.concat([batch, duplicates])
+
+
+def test_from_batch_sorts_and_keeps_last_duplicate():
+    batch = ResultBatch([30, 10, 20, 10], [3, 1, 2, 9], NUMBER_COLORS[[3, 1, 2, 9]], [-1, -1, -1, -1])
+    index = PeriodIndex.from_batch(batch)
+    assert index.periods.tolist() == [10, 20, 30]
+    assert index.batch().number.tolist() == [9, 2, 3]
+
+
+def test_upsert_append_only():
+    history = synthetic_history(50)
+    index = PeriodIndex.from_batch(history[:40])
+    result = index.upsert(history[40:])
+    assert result.appended == 10
+    assert result.append_only
+    assert_matches(index, history.to_frame())
+
+
+def test_upsert_identical_rows_change_nothing():
+    history = synthetic_history(50)
+    index = PeriodIndex.from_batch(history)
+    result = index.upsert(history[10:20])
+    assert not result.changed
+
+
+def test_upsert_reports_updated_and_inserted_positions():
+    history = synthetic_history(20)
+    index = PeriodIndex.from_batch(history[np.r_[0:5, 6:20]])
+    corrected = history[[2, 5, 12]]
+    corrected.number[0] = (corrected.number[0] + 1) % 10
+    corrected.number[2] = (corrected.number[2] + 1) % 10
+    result = index.upsert(corrected)
+    assert result.appended == 0
+    assert sorted(result.inserted.tolist()) == [5]
+    assert sorted(result.updated.tolist()) == [2, 12]
+    changed = index.rows(list(result.updated) + list(result.inserted))
+    assert changed['Period'].tolist() == history.period[[2, 5, 12]].tolist()
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_random_upserts_match_pandas_reference(seed):
+    rng = np.random.default_rng(seed)
+    history = synthetic_history(400, seed=seed)
+    start = rng.choice(len(history), size=150, replace=False)
+    index = PeriodIndex(capacity=4)
+    index.upsert(history[np.sort(start)])
+    reference = history[np.sort(start)].to_frame()
+    for _ in range(20):
+        batch = random_batch(rng, history, 30)
+        result = index.upsert(batch)
+        before = len(reference)
+        reference = reference_upsert(reference, batch)
+        assert result.appended + len(result.inserted) == len(reference) - before
+        assert_matches(index, reference)
+
+
+def test_contains_matches_isin():
+    history = synthetic_history(100)
+    index = PeriodIndex.from_batch(history[::2])
+    probe = np.concatenate([history.period, [history.period[-1] + 10, history.period[0] - 10]])
+    np.testing.assert_array_equal(index.contains(probe), np.isin(probe, history.period[::2]))
+
+
+def test_tail_batch_and_max_period():
+    history = synthetic_history(30)
+    index = PeriodIndex.from_batch(history)
+    assert index.max_period == int(history.period[-1])
+    np.testing.assert_array_equal(index.tail_batch(5).period, history.period[-5:])
+    assert PeriodIndex().max_period is None
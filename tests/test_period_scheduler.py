@@ -0,0 +1,58 @@
+import pytest
+
+from src.rl_agent.period_scheduler import PeriodScheduler
+
+
+@pytest.fixture
+def scheduler():
+    scheduler = PeriodScheduler(period_seconds=60)
+    scheduler._wall_offset = 0.0  # Waktu monotonic == waktu dinding agar sampel deterministik
+    return scheduler
+
+
+def test_timer_samples_intersect(scheduler):
+    scheduler.observe_timer(30, observed_at=1000.0)
+    assert scheduler._timer_bounds == (1029.0, 1031.0)
+    scheduler.observe_timer(20.5, observed_at=1010.0)
+    assert scheduler._timer_bounds == pytest.approx((1029.5, 1031.0))
+    assert scheduler.uncertainty_seconds == pytest.approx(0.75)
+    assert scheduler.offset_seconds == pytest.approx(10.25)
+    assert scheduler.phase_source == 'timer'
+
+
+def test_timer_sample_from_next_period_is_aligned(scheduler):
+    scheduler.observe_timer(30, observed_at=1000.0)
+    scheduler.observe_timer(50, observed_at=1040.8)  # Batas 1090.8 = 1030.8 satu periode kemudian
+    assert scheduler._timer_bounds == pytest.approx((1029.8, 1031.0))
+
+
+def test_inconsistent_timer_sample_restarts_estimate(scheduler):
+    scheduler.observe_timer(30, observed_at=1000.0)
+    scheduler.observe_timer(15, observed_at=1000.0)
+    assert scheduler._timer_bounds == (1014.0, 1016.0)
+
+
+def test_early_result_tightens_upper_bound(scheduler):
+    scheduler.observe_timer(30, observed_at=1000.0)
+    lag = scheduler.observe_result(1090.4, ingested_at=1090.5)  # Batas berikutnya diperkirakan 1090.0
+    assert lag == pytest.approx(0.4)
+    assert scheduler._timer_bounds == (1029.0, 1031.0)
+    lag = scheduler.observe_result(1149.5, ingested_at=1149.5)
+    assert scheduler._timer_bounds == pytest.approx((1029.0, 1029.5))
+    assert lag == pytest.approx(0.25)
+    assert scheduler.offset_seconds == pytest.approx(9.25)
+
+
+def test_result_before_timer_interval_resets_to_results(scheduler):
+    scheduler.observe_timer(30, observed_at=1000.0)
+    assert scheduler.observe_result(1087.0, ingested_at=1087.0) == 0.0
+    assert scheduler._timer_bounds is None
+    assert scheduler.phase_source == 'results'
+    assert scheduler.offset_seconds == pytest.approx(7.0)
+
+
+def test_next_close_follows_phase(scheduler):
+    assert scheduler.next_close(1000.0) is None
+    scheduler.observe_result(1015.0, ingested_at=1015.0)
+    assert scheduler.next_close(1020.0) == pytest.approx(1075.0)
+    assert scheduler.next_close(1075.0) == pytest.approx(1075.0)
@@ -0,0 +1,101 @@
+import threading
+
+import numpy as np
+import pytest
+
+from src.rl_agent.predictors import (FallbackPredictor, PredictionFailure, Predictor, StatisticalPredictor,
+                                     create_predictor)
+from src.rl_agent.records import NUMBER_COLORS, ResultBatch
+
+
+class StubPredictor(Predictor):
+    name = 'gemini-stub'
+
+    def __init__(self, error=None, release=None):
+        self.error = error
+        self.release = release
+
+    def predict_next_period(self, window):
+        if self.release is not None:
+            self.release.wait(5)
+        if self.error:
+            raise self.error
+        return "--- PREDICTION ---\nBesar/Kecil: Big"
+
+    def cache_stats(self):
+        return {'hits': 0}
+
+
+def window(n=100):
+    numbers = np.random.default_rng(3).integers(0, 10, n).astype(np.uint8)
+    return ResultBatch(20250719100010000 + np.arange(n), numbers, NUMBER_COLORS[numbers], np.full(n, -1))
+
+
+def test_primary_result_is_returned_within_budget():
+    predictor = FallbackPredictor(StubPredictor(), StatisticalPredictor(), latency_budget=5)
+    assert predictor.predict_next_period(window()).endswith('Big')
+    assert predictor.fallback_stats()['fallbacks'] == {'error': 0, 'timeout': 0, 'busy': 0}
+    assert predictor.cache_stats() == {'hits': 0}
+
+
+def test_error_falls_back_to_statistics():
+    stats = StatisticalPredictor()
+    predictor = FallbackPredictor(StubPredictor(error=RuntimeError('quota')), stats, latency_budget=None)
+    assert predictor.predict_next_period(window()) == stats.predict_next_period(window())
+    assert predictor.fallbacks['error'] == 1
+
+
+def test_slow_call_falls_back_and_blocks_until_finished():
+    release = threading.Event()
+    predictor = FallbackPredictor(StubPredictor(release=release), StatisticalPredictor(), latency_budget=0.05)
+    assert 'Periode:' in predictor.predict_next_period(window())
+    assert 'Periode:' in predictor.predict_next_period(window())
+    assert predictor.fallbacks == {'error': 0, 'timeout': 1, 'busy': 1}
+    release.set()
+    predictor._inflight.wait(5)
+    assert predictor.predict_next_period(window()).endswith('Big')
+
+
+def test_stats_model_is_not_wrapped():
+    assert isinstance(create_predictor('stats', {'predictor': {'runtime_fallback': True}}), StatisticalPredictor)
+
+
+class RaisingModels:
+    def __init__(self, error):
+        self.error = error
+        self.calls = 0
+
+    def generate_content(self, **kwargs):
+        self.calls += 1
+        raise self.error
+
+
+class StubGenaiClient:
+    """Klien google-genai tiruan: setiap panggilan API gagal dengan `error`."""
+    def __init__(self, error):
+        self.models = RaisingModels(error)
+        self.caches = RaisingModels(error)
+        self.caches.create = self.caches.generate_content
+
+
+def test_gemini_errors_fall_back_to_statistics(monkeypatch):
+    gemini_predictor = pytest.importorskip('src.rl_agent.gemini_predictor')
+    if gemini_predictor.PACKAGE_TYPE != 'google-genai':
+        pytest.skip("Stub hanya meniru klien google-genai.")
+    monkeypatch.setenv('GEMINI_API_KEY', 'test')
+    config = {'predictor': {'runtime_fallback': True}, 'gemini': {'response_cache': {'enabled': False}}}
+    predictor = create_predictor('gemini-2.5-flash', config)
+    assert isinstance(predictor, FallbackPredictor)
+    assert isinstance(predictor.primary, gemini_predictor.GeminiPredictor)
+    client = StubGenaiClient(RuntimeError('429 RESOURCE_EXHAUSTED'))
+    predictor.primary.client = client
+
+    failure = predictor.primary.predict_next_period(window())
+    assert isinstance(failure, PredictionFailure) and '429' in failure
+
+    expected = StatisticalPredictor(config).predict_next_period(window())
+    assert predictor.predict_next_period(window()) == expected
+    assert predictor.fallbacks['error'] == 1
+    assert client.models.calls >= 2
+    report = predictor.generate_holistic_report('data')
+    assert report == StatisticalPredictor(config).generate_holistic_report('data')
@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+
+from src.rl_agent.prompt_encoding import CompactPromptEncoder
+from src.rl_agent.records import NUMBER_COLORS, ResultBatch
+
+BASE_PERIOD = 20250719100010000
+
+
+def make_batch(sequences, numbers):
+    numbers = np.asarray(numbers, dtype=np.uint8)
+    return ResultBatch(BASE_PERIOD + np.asarray(sequences, dtype=np.int64), numbers, NUMBER_COLORS[numbers],
+                       np.full(len(numbers), -1, dtype=np.int32))
+
+
+def fresh_render(window, size):
+    return CompactPromptEncoder(window=size).sync(window).render()
+
+
+@pytest.fixture
+def history():
+    rng = np.random.default_rng(7)
+    return make_batch(np.arange(1, 61), rng.integers(0, 10, 60))
+
+
+def test_append_matches_fresh_encode(history):
+    encoder = CompactPromptEncoder(window=20)
+    for end in range(20, len(history) + 1, 3):
+        window = history[end - 20:end]
+        assert encoder.sync(window).render() == fresh_render(window, 20)
+    assert encoder.rebuilds == 1
+    assert encoder.incremental_updates > 0
+
+
+def test_gap_fill_matches_fresh_encode(history):
+    encoder = CompactPromptEncoder(window=20)
+    with_gap = history[np.r_[0:10, 11:25]][-20:]
+    encoder.sync(with_gap)
+    filled = history[5:25]
+    assert encoder.sync(filled).render() == fresh_render(filled, 20)
+
+
+def test_mid_window_correction_matches_fresh_encode(history):
+    encoder = CompactPromptEncoder(window=20)
+    encoder.sync(history[:20])
+    corrected = history[1:21]
+    corrected.number[5] = (corrected.number[5] + 5) % 10
+    corrected.color[5] = NUMBER_COLORS[corrected.number[5]]
+    assert encoder.sync(corrected).render() == fresh_render(corrected, 20)
+
+
+def test_color_only_correction_matches_fresh_encode(history):
+    encoder = CompactPromptEncoder(window=20)
+    encoder.sync(history[:20])
+    corrected = history[:21]
+    corrected.color[3] = NUMBER_COLORS[(int(corrected.number[3]) + 1) % 10]
+    assert encoder.sync(corrected).render() == fresh_render(corrected, 20)
+
+
+def test_sliding_with_gaps_and_nonstandard_colors_matches_fresh_encode():
+    rng = np.random.default_rng(11)
+    sequences = np.cumsum(rng.choice([1, 1, 1, 2, 5], size=300))
+    history = make_batch(sequences, rng.integers(0, 10, 300))
+    history.color[rng.choice(300, size=15, replace=False)] = 0
+    encoder = CompactPromptEncoder(window=40)
+    for end in range(40, 301, 2):
+        window = history[end - 40:end]
+        assert encoder.sync(window).render() == fresh_render(window, 40)
+    assert encoder.rebuilds == 1
+
+
+def test_correction_outside_tail_forces_rebuild(history):
+    encoder = CompactPromptEncoder(window=20)
+    encoder.sync(history[:20])
+    corrected = history[1:21]
+    # Dua koreksi yang saling meniadakan pada jumlah angka tetap harus terdeteksi.
+    other = 3 + int(np.flatnonzero(corrected.number[3:18] != corrected.number[3])[0])
+    corrected.number[[3, other]] = corrected.number[[other, 3]]
+    corrected.color[:] = NUMBER_COLORS[corrected.number]
+    assert encoder.sync(corrected).render() == fresh_render(corrected, 20)
+    assert encoder.rebuilds == 2
@@ -0,0 +1,27 @@
+from src.rl_agent.data_store import records_to_batch
+from src.rl_agent.records import COLOR_GREEN, COLOR_RED, COLOR_VIOLET, MISSING_PREMIUM, records_to_columns
+
+
+def test_records_to_columns_handles_api_value_forms():
+    records = [
+        {'issueNumber': '20250719100010279', 'number': '0', 'colour': 'red,violet', 'premium': '12345'},
+        {'issueNumber': 20250719100010280, 'number': 7, 'colour': 'green', 'premium': ''},
+        {'issueNumber': '20250719100010281', 'number': '4', 'premium': None},
+    ]
+    columns = records_to_columns(records)
+    # Period 17 digit tidak boleh kehilangan presisi (tidak melalui float64).
+    assert columns['period'].tolist() == [20250719100010279, 20250719100010280, 20250719100010281]
+    assert columns['number'].tolist() == [0, 7, 4]
+    assert columns['colour'].tolist() == [COLOR_RED | COLOR_VIOLET, COLOR_GREEN, 0]
+    assert columns['premium'].tolist() == [12345, MISSING_PREMIUM, MISSING_PREMIUM]
+
+
+def test_records_to_batch_keeps_only_win_go_1min():
+    records = [
+        {'issueNumber': '20250719100010279', 'number': '3', 'colour': 'green', 'premium': '1'},
+        {'issueNumber': '20250719100020279', 'number': '5', 'colour': 'green,violet', 'premium': '2'},
+    ]
+    batch = records_to_batch(records)
+    assert batch.period.tolist() == [20250719100010279]
+    assert batch.premium.tolist() == [1]
+    assert len(records_to_batch([])) == 0
@@ -0,0 +1,57 @@
+import time
+
+from src.rl_agent.response_cache import ResponseCache, content_key
+
+
+def test_content_key_separates_parts():
+    assert content_key('ab', 'c') != content_key('a', 'bc')
+    assert content_key('model', 'prompt') == content_key('model', 'prompt')
+
+
+def test_lru_eviction_order():
+    cache = ResponseCache(max_entries=2, ttl_seconds=0)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == 1  # 'a' menjadi yang terbaru dipakai
+    cache.put('c', 3)
+    assert cache.get('b') is None
+    assert cache.get('a') == 1 and cache.get('c') == 3
+    assert cache.stats()['evictions'] == 1
+
+
+def test_ttl_expiry(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(time, 'time', lambda: now[0])
+    cache = ResponseCache(max_entries=10, ttl_seconds=60)
+    cache.put('k', 'v')
+    now[0] += 59
+    assert cache.get('k') == 'v'
+    now[0] += 2
+    assert cache.get('k') is None
+    assert len(cache) == 0
+    assert cache.stats()['hits'] == 1 and cache.stats()['misses'] == 1
+
+
+def test_persists_and_drops_expired_on_load(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(time, 'time', lambda: now[0])
+    path = str(tmp_path / 'cache.json')
+    cache = ResponseCache(max_entries=10, ttl_seconds=100, path=path, save_every=2)
+    cache.put('old', 1)
+    now[0] += 50
+    cache.put('new', 2)  # save_every=2: ditulis ke file
+    now[0] += 60
+    reloaded = ResponseCache(max_entries=10, ttl_seconds=100, path=path)
+    assert reloaded.get('old') is None
+    assert reloaded.get('new') == 2
+
+
+def test_load_keeps_most_recent_entries(tmp_path):
+    path = str(tmp_path / 'cache.json')
+    cache = ResponseCache(max_entries=5, ttl_seconds=0, path=path, save_every=100)
+    for i in range(5):
+        cache.put(str(i), i)
+    cache.flush()
+    smaller = ResponseCache(max_entries=2, ttl_seconds=0, path=path)
+    assert len(smaller) == 2
+    assert smaller.get('4') == 4 and smaller.get('0') is None
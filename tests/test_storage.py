@@ -0,0 +1,169 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.rl_agent.data_store import HistoryStore
+from src.rl_agent.records import synthetic_history
+from src.utils.storage import open_storage
+
+FORMATS = ['csv', 'arrow', 'parquet']
+COMPARED = ['Period', 'Number', 'Big/Small', 'Color', 'Premium']
+
+
+@pytest.fixture(params=FORMATS)
+def storage(request, tmp_path):
+    if request.param != 'csv':
+        pytest.importorskip('pyarrow')
+    return open_storage(str(tmp_path / f'history.{request.param}'), compact_segments=3)
+
+
+def frame(batch):
+    return batch.to_frame().reset_index(drop=True)
+
+
+def assert_frames_equal(actual, expected):
+    columns = [column for column in COMPARED if column in expected.columns]
+    pd.testing.assert_frame_equal(actual[columns].reset_index(drop=True), expected[columns].reset_index(drop=True),
+                                  check_dtype=False)
+
+
+def test_missing_file_raises(storage):
+    assert not storage.exists()
+    with pytest.raises(FileNotFoundError):
+        storage.read()
+
+
+def test_write_read_round_trip(storage):
+    history = synthetic_history(500)
+    expected = frame(history)
+    expected.loc[::7, 'Premium'] = pd.NA
+    storage.write(expected)
+    assert_frames_equal(storage.read(), expected)
+    batch = storage.read_batch()
+    np.testing.assert_array_equal(batch.period, history.period)
+    np.testing.assert_array_equal(batch.number, history.number)
+    np.testing.assert_array_equal(batch.color, history.color)
+    assert (batch.premium[::7] == -1).all()
+    assert storage.count() == 500
+
+
+def test_append_across_segments_and_compaction(storage):
+    history = synthetic_history(120)
+    storage.write(frame(history[:50]))
+    for start in range(50, 120, 10):
+        storage.append(frame(history[start:start + 10]))
+        assert_frames_equal(storage.read(), frame(history[:start + 10]))
+    assert storage.count() == 120
+
+
+def test_append_creates_file(storage):
+    history = synthetic_history(15)
+    storage.append(frame(history[:5]))
+    storage.append(frame(history[5:]))
+    assert_frames_equal(storage.read(), frame(history))
+
+
+@pytest.mark.parametrize('n', [0, 1, 7, 25, 200])
+def test_read_tail_matches_pandas_tail(storage, n):
+    history = synthetic_history(100)
+    storage.write(frame(history[:60]))
+    storage.append(frame(history[60:80]))
+    storage.append(frame(history[80:]))
+    expected = frame(history).tail(n) if n else frame(history).iloc[:0]
+    assert_frames_equal(storage.read_tail(n), expected)
+
+
+def test_write_replaces_segments(storage):
+    history = synthetic_history(40)
+    storage.write(frame(history[:20]))
+    storage.append(frame(history[20:30]))
+    storage.write(frame(history[:10]))
+    assert_frames_equal(storage.read(), frame(history[:10]))
+
+
+def test_history_store_append_and_correction(storage):
+    history = synthetic_history(60)
+    storage.write(frame(history[np.r_[0:20, 21:40]]))
+    store = HistoryStore(storage)
+    store.load()
+    assert store.high_water_mark == int(history.period[39])
+
+    new_rows = store.ingest(history[35:50])
+    assert new_rows['Period'].tolist() == history.period[40:50].tolist()
+    assert store.rewrites == 0
+
+    assert store.ingest(history[40:50]).empty
+
+    corrected = history[[20, 30]]
+    corrected.number[1] = (corrected.number[1] + 1) % 10
+    changed = store.ingest(corrected)
+    assert sorted(changed['Period'].tolist()) == history.period[[20, 30]].tolist()
+    assert store.rewrites == 1
+
+    expected = frame(history[:50])
+    expected.loc[30, 'Number'] = int(corrected.number[1])
+    expected.loc[30, 'Big/Small'] = 'Big' if corrected.number[1] >= 5 else 'Small'
+    reloaded = HistoryStore(storage)
+    reloaded.load()
+    assert_frames_equal(reloaded.frame(), expected)
+    assert_frames_equal(storage.read(), expected)
+
+
+@pytest.fixture(params=['arrow', 'parquet'])
+def columnar(request, tmp_path):
+    pytest.importorskip('pyarrow')
+    return open_storage(str(tmp_path / f'history.{request.param}'), compact_segments=4)
+
+
+def test_tiered_compaction_bounds_segments_and_base_rewrites(columnar, monkeypatch):
+    history = synthetic_history(1300)
+    columnar.write(frame(history[:1000]))
+    base_writes = []
+    write_base_file = columnar._write_base_file
+    monkeypatch.setattr(columnar, '_write_base_file', lambda table: (base_writes.append(table.num_rows),
+                                                                     write_base_file(table)))
+    for i in range(1000, 1300):
+        columnar.append(frame(history[i:i + 1]))
+        # Paling banyak fanout-1 segmen per tingkat.
+        assert len(columnar._segments()) <= 3 * 5
+    assert base_writes == []
+    assert columnar.count() == 1300
+    assert_frames_equal(columnar.read(), frame(history))
+    assert_frames_equal(columnar.read_tail(37), frame(history).tail(37))
+
+    columnar.compact()
+    assert base_writes == [1300]
+    assert columnar._segments() == []
+    assert_frames_equal(columnar.read(), frame(history))
+
+
+def test_base_is_rewritten_when_segments_reach_its_size(columnar):
+    history = synthetic_history(40)
+    columnar.write(frame(history[:10]))
+    for i in range(10, 40):
+        columnar.append(frame(history[i:i + 1]))
+    reopened = open_storage(columnar.path, compact_segments=4)
+    assert reopened._base_info()[1] >= 20
+    assert reopened.count() == 40
+    assert_frames_equal(reopened.read(), frame(history))
+
+
+def test_leftover_segments_from_interrupted_compaction_are_ignored(columnar):
+    history = synthetic_history(30)
+    columnar.write(frame(history[:20]))
+    for i in range(20, 24):
+        columnar.append(frame(history[i:i + 1]))  # 4 segmen digabung menjadi satu segmen tingkat 1
+    merged = columnar._segments()
+    assert [(first, last) for first, last, _, _ in merged] == [(0, 3)]
+    # Segmen sumber yang belum sempat dihapus dan segmen yang sudah masuk file utama.
+    columnar._write_segment(columnar._to_table(frame(history[20:21])), 0, 0)
+    reopened = open_storage(columnar.path, compact_segments=4)
+    assert reopened.count() == 24
+    assert_frames_equal(reopened.read(), frame(history[:24]))
+    reopened.append(frame(history[24:25]))
+    assert_frames_equal(reopened.read(), frame(history[:25]))
+
+    reopened.compact()
+    reopened._write_segment(reopened._to_table(frame(history[24:25])), 4, 4)  # Sudah termuat di file utama
+    assert open_storage(columnar.path).count() == 25
+    assert_frames_equal(open_storage(columnar.path).read(), frame(history[:25]))
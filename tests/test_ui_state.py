@@ -0,0 +1,19 @@
+import pytest
+
+from src.rl_agent.ui_state import parse_balance, parse_timer
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('00:42', 42), ('01:05', 65), ('0:00', 0), ('10:59', 659),
+    ('', None), (None, None), ('42', None), ('00:4', None), ('0 0:42', None), ('00:42s', None),
+])
+def test_parse_timer(text, expected):
+    assert parse_timer(text) == expected
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('Rp1,234.50', 1234.5), ('Rp 0.00', 0.0), ('1,000,000', 1000000.0), (' Rp12 ', 12.0),
+    ('', None), (None, None), ('Rp--', None), ('saldo', None),
+])
+def test_parse_balance(text, expected):
+    assert parse_balance(text) == expected